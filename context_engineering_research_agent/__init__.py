@@ -84,21 +84,50 @@ result = agent.invoke({
 __version__ = "0.1.0"
 __author__ = "Context Engineering Research Team"
 
-from context_engineering_research_agent.agent import (
-    create_context_aware_agent,
-    get_agent,
-)
-from context_engineering_research_agent.context_strategies import (
-    ContextCachingStrategy,
-    ContextIsolationStrategy,
-    ContextOffloadingStrategy,
-    ContextReductionStrategy,
-    ContextRetrievalStrategy,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from context_engineering_research_agent.agent import (
+        create_context_aware_agent,
+        get_agent,
+        preload_dependencies,
+    )
+    from context_engineering_research_agent.context_strategies import (
+        ContextCachingStrategy,
+        ContextIsolationStrategy,
+        ContextOffloadingStrategy,
+        ContextReductionStrategy,
+        ContextRetrievalStrategy,
+    )
+
+# 공개 심볼은 처음 접근할 때 import합니다. backends 등 하위 패키지만 사용할 때
+# 에이전트 팩토리와 LLM 클라이언트(langchain_openai 등)를 함께 로드하지 않도록 합니다.
+_LAZY_EXPORTS = {
+    "get_agent": "context_engineering_research_agent.agent",
+    "create_context_aware_agent": "context_engineering_research_agent.agent",
+    "preload_dependencies": "context_engineering_research_agent.agent",
+    "ContextOffloadingStrategy": "context_engineering_research_agent.context_strategies",
+    "ContextReductionStrategy": "context_engineering_research_agent.context_strategies",
+    "ContextRetrievalStrategy": "context_engineering_research_agent.context_strategies",
+    "ContextIsolationStrategy": "context_engineering_research_agent.context_strategies",
+    "ContextCachingStrategy": "context_engineering_research_agent.context_strategies",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "get_agent",
     "create_context_aware_agent",
+    "preload_dependencies",
     "ContextOffloadingStrategy",
     "ContextReductionStrategy",
     "ContextRetrievalStrategy",
@@ -3,16 +3,15 @@
 5가지 Context Engineering 전략을 명시적으로 통합한 에이전트입니다.
 """
 
-from datetime import datetime
-from pathlib import Path
-from typing import Any
+from __future__ import annotations
 
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend
-from langchain.agents.middleware.types import AgentMiddleware
-from langchain.tools import ToolRuntime
-from langchain_core.language_models import BaseChatModel
-from langchain_openai import ChatOpenAI
+import functools
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
 from context_engineering_research_agent.context_strategies import (
     ContextCachingStrategy,
@@ -20,10 +19,25 @@ from context_engineering_research_agent.context_strategies import (
     ContextReductionStrategy,
     PromptCachingTelemetryMiddleware,
     ProviderType,
+    compute_prefix_cache_key,
     detect_provider,
 )
+from context_engineering_research_agent.context_strategies.caching import (
+    _get_base_url,
+)
+
+if TYPE_CHECKING:
+    import httpx
+    from deepagents.backends import CompositeBackend, FilesystemBackend
+    from langchain.agents.middleware.types import AgentMiddleware
+    from langchain.tools import ToolRuntime
+    from langchain_core.language_models import BaseChatModel
 
-CONTEXT_ENGINEERING_SYSTEM_PROMPT = """# Context Engineering 연구 에이전트
+# deepagents/langchain_openai는 import 비용이 크므로 에이전트를 실제로 만들 때
+# 함수 안에서 import합니다.
+
+# 정적 영역: 요청/세션과 무관하게 고정된 전략 설명. 캐시 breakpoint가 이 영역 끝에 놓입니다.
+_SYSTEM_PROMPT_STATIC = """# Context Engineering 연구 에이전트
 
 당신은 Context Engineering 전략을 연구하고 실험하는 에이전트입니다.
 
@@ -65,7 +79,10 @@ SubAgent를 통해 독립된 컨텍스트에서 작업합니다.
 3. 중간 결과를 파일시스템에 저장
 4. 최종 보고서 작성 (/final_report.md)
 
-## 중요 원칙
+"""
+
+# 동적 꼬리: 운영 원칙 등 바뀔 수 있는 지침. 변경되어도 정적 영역 캐시는 유지됩니다.
+_SYSTEM_PROMPT_DYNAMIC_TAIL = """## 중요 원칙
 
 - 대용량 결과는 파일로 저장하고 참조
 - 복잡한 작업은 SubAgent에게 위임
@@ -73,13 +90,38 @@ SubAgent를 통해 독립된 컨텍스트에서 작업합니다.
 - 인용 형식: [1], [2], [3]
 """
 
-current_date = datetime.now().strftime("%Y-%m-%d")
+CONTEXT_ENGINEERING_SYSTEM_PROMPT = _SYSTEM_PROMPT_STATIC + _SYSTEM_PROMPT_DYNAMIC_TAIL
+
+# 시스템 프롬프트 prefix의 안정적인 캐시 키 (요청/세션 간 동일).
+# 프롬프트가 바이트 단위로 고정되어야 캐시가 적중하므로, 날짜 등 요청마다
+# 달라지는 값은 시스템 프롬프트에 보간하지 말고 사용자 메시지로 전달합니다.
+SYSTEM_PROMPT_CACHE_KEY = compute_prefix_cache_key(_SYSTEM_PROMPT_STATIC)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 RESEARCH_WORKSPACE_DIR = BASE_DIR / "research_workspace"
 
 _cached_agent = None
 _cached_model = None
+_agent_lock = threading.Lock()
+_model_lock = threading.Lock()
+
+
+def _reset_caches_after_fork() -> None:
+    """fork된 자식 프로세스에서 캐시와 락을 초기화합니다.
+
+    부모가 락을 잡은 채 fork되면 자식에서 영원히 풀리지 않으므로 락도 새로 만듭니다.
+    """
+    global _cached_agent, _cached_model, _agent_lock, _model_lock
+    _cached_agent = None
+    _cached_model = None
+    _agent_lock = threading.Lock()
+    _model_lock = threading.Lock()
+    # 연결 풀은 부모와 공유하면 안 되므로 자식에서 새로 만듭니다.
+    _shared_http_client.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_caches_after_fork)
 
 
 def _infer_openrouter_model_name(model: BaseChatModel) -> str | None:
@@ -93,6 +135,10 @@ def _infer_openrouter_model_name(model: BaseChatModel) -> str | None:
     Returns:
         OpenRouter 모델명 (예: "anthropic/claude-sonnet-4-5") 또는 None
     """
+    # OpenRouter는 OpenAI 호환 클라이언트의 base_url로만 감지되므로,
+    # URL에 "openrouter"가 없으면 Provider 감지 없이 바로 반환합니다.
+    if "openrouter" not in _get_base_url(model):
+        return None
     if detect_provider(model) != ProviderType.OPENROUTER:
         return None
     for attr in ("model_name", "model", "model_id"):
@@ -102,15 +148,69 @@ def _infer_openrouter_model_name(model: BaseChatModel) -> str | None:
     return None
 
 
-def _get_fs_backend() -> FilesystemBackend:
+@functools.lru_cache(maxsize=8)
+def _fs_backend_for(root_dir: Path, max_file_size_mb: int) -> FilesystemBackend:
+    """워크스페이스별 FilesystemBackend를 재사용합니다.
+
+    같은 워크스페이스를 쓰는 에이전트들은 하나의 백엔드 인스턴스를 공유합니다.
+    """
+    from deepagents.backends import FilesystemBackend
+
     return FilesystemBackend(
-        root_dir=RESEARCH_WORKSPACE_DIR,
+        root_dir=root_dir,
         virtual_mode=True,
-        max_file_size_mb=20,
+        max_file_size_mb=max_file_size_mb,
+    )
+
+
+# 여러 에이전트/SubAgent가 같은 Provider 호스트에 동시에 요청하므로 keep-alive
+# 연결을 넉넉히 유지하여 요청마다 TCP/TLS 핸드셰이크를 다시 하지 않게 합니다.
+_HTTP_KEEPALIVE_CONNECTIONS = 16
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """모델 클라이언트들이 함께 쓰는 httpx 동기 클라이언트를 반환합니다.
+
+    h2 패키지가 설치되어 있으면 HTTP/2로 한 연결에 요청을 다중화합니다.
+    base_url과 타임아웃은 OpenAI SDK가 요청마다 지정하므로 클라이언트 하나를
+    모든 엔드포인트에서 공유할 수 있습니다.
+
+    비동기 클라이언트는 공유하지 않습니다. httpx.AsyncClient의 연결 풀은 처음
+    사용한 이벤트 루프에 묶이므로 asyncio.run()을 다시 호출하면 깨집니다.
+    비동기 쪽은 langchain_openai가 기본 클라이언트를 직접 관리합니다.
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    limits = httpx.Limits(max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS)
+    return httpx.Client(http2=http2, limits=limits)
+
+
+def _chat_openai(model: str, base_url: str | None = None) -> BaseChatModel:
+    """공유 HTTP 연결 풀을 사용하는 ChatOpenAI를 만듭니다."""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model,
+        temperature=0.0,
+        base_url=base_url,
+        http_client=_shared_http_client(),
     )
 
 
+def _get_fs_backend() -> FilesystemBackend:
+    return _fs_backend_for(RESEARCH_WORKSPACE_DIR, 20)
+
+
 def _get_backend_factory():
+    from deepagents.backends import CompositeBackend, StateBackend
+
     fs_backend = _get_fs_backend()
 
     def backend_factory(rt: ToolRuntime) -> CompositeBackend:
@@ -122,42 +222,130 @@ def _get_backend_factory():
     return backend_factory
 
 
+def preload_dependencies() -> None:
+    """에이전트 생성에 필요한 무거운 모듈을 미리 import합니다.
+
+    pre-fork 서버(gunicorn --preload 등)의 부모 프로세스에서 호출하면 워커들이
+    import된 모듈을 copy-on-write로 공유하므로, 워커의 첫 get_agent() 비용은
+    그래프 구성(수백 ms 미만)만 남습니다. 에이전트 자체는 HTTP 클라이언트 등
+    fork-safe하지 않은 상태를 가지므로 fork 후 워커에서 새로 만듭니다.
+    """
+    import deepagents  # noqa: F401
+    import langchain_openai  # noqa: F401
+
+
 def get_model():
     global _cached_model
     if _cached_model is None:
-        _cached_model = ChatOpenAI(model="gpt-4.1", temperature=0.0)
+        with _model_lock:
+            if _cached_model is None:
+                _cached_model = _chat_openai("gpt-4.1")
     return _cached_model
 
 
 def get_agent():
     global _cached_agent
     if _cached_agent is None:
-        model = get_model()
-        backend_factory = _get_backend_factory()
-
-        offloading_strategy = ContextOffloadingStrategy(backend_factory=backend_factory)
-        reduction_strategy = ContextReductionStrategy(summarization_model=model)
-        openrouter_model_name = _infer_openrouter_model_name(model)
-        caching_strategy = ContextCachingStrategy(
-            model=model,
-            openrouter_model_name=openrouter_model_name,
-        )
-        telemetry_middleware = PromptCachingTelemetryMiddleware()
-
-        _cached_agent = create_deep_agent(
-            model=model,
-            system_prompt=CONTEXT_ENGINEERING_SYSTEM_PROMPT,
-            backend=backend_factory,
-            middleware=[
-                offloading_strategy,
-                reduction_strategy,
-                caching_strategy,
-                telemetry_middleware,
-            ],
-        )
+        with _agent_lock:
+            if _cached_agent is None:
+                _cached_agent = _build_agent()
     return _cached_agent
 
 
+def _build_agent() -> Any:
+    from deepagents import create_deep_agent
+
+    model = get_model()
+    backend_factory = _get_backend_factory()
+
+    offloading_strategy = ContextOffloadingStrategy(backend_factory=backend_factory)
+    reduction_strategy = ContextReductionStrategy(summarization_model=model)
+    openrouter_model_name = _infer_openrouter_model_name(model)
+    caching_strategy = ContextCachingStrategy(
+        model=model,
+        openrouter_model_name=openrouter_model_name,
+        prefix_cache_key=SYSTEM_PROMPT_CACHE_KEY,
+        static_prefix=_SYSTEM_PROMPT_STATIC,
+    )
+    telemetry_middleware = PromptCachingTelemetryMiddleware()
+
+    return create_deep_agent(
+        model=model,
+        system_prompt=CONTEXT_ENGINEERING_SYSTEM_PROMPT,
+        backend=backend_factory,
+        middleware=[
+            offloading_strategy,
+            reduction_strategy,
+            caching_strategy,
+            telemetry_middleware,
+        ],
+    )
+
+
+@dataclass
+class _MiddlewareContext:
+    """create_context_aware_agent의 미들웨어 빌더들이 공유하는 입력값."""
+
+    llm: BaseChatModel
+    backend_factory: Callable[[ToolRuntime], CompositeBackend]
+    offloading_token_limit: int
+    reduction_threshold: float
+    openrouter_model_name: str | None
+
+
+def _build_offloading(context: _MiddlewareContext) -> AgentMiddleware:
+    from context_engineering_research_agent.context_strategies.offloading import (
+        OffloadingConfig,
+    )
+
+    return ContextOffloadingStrategy(
+        config=OffloadingConfig(
+            token_limit_before_evict=context.offloading_token_limit
+        ),
+        backend_factory=context.backend_factory,
+    )
+
+
+def _build_reduction(context: _MiddlewareContext) -> AgentMiddleware:
+    from context_engineering_research_agent.context_strategies.reduction import (
+        ReductionConfig,
+    )
+
+    return ContextReductionStrategy(
+        config=ReductionConfig(context_threshold=context.reduction_threshold),
+        summarization_model=context.llm,
+    )
+
+
+def _build_caching(context: _MiddlewareContext) -> AgentMiddleware:
+    openrouter_model_name = (
+        context.openrouter_model_name
+        if context.openrouter_model_name is not None
+        else _infer_openrouter_model_name(context.llm)
+    )
+    return ContextCachingStrategy(
+        model=context.llm,
+        openrouter_model_name=openrouter_model_name,
+        prefix_cache_key=SYSTEM_PROMPT_CACHE_KEY,
+        static_prefix=_SYSTEM_PROMPT_STATIC,
+    )
+
+
+def _build_cache_telemetry(context: _MiddlewareContext) -> AgentMiddleware:
+    return PromptCachingTelemetryMiddleware()
+
+
+# 미들웨어 적용 순서대로 정렬된 (활성화 플래그 이름, 빌더) 목록.
+_MIDDLEWARE_BUILDERS: tuple[
+    tuple[str, Callable[[_MiddlewareContext], AgentMiddleware]], ...
+] = (
+    ("offloading", _build_offloading),
+    ("reduction", _build_reduction),
+    ("caching", _build_caching),
+    ("cache_telemetry", _build_cache_telemetry),
+)
+
+
 def create_context_aware_agent(
     model: BaseChatModel | str = "gpt-4.1",
     workspace_dir: Path | str | None = None,
@@ -168,12 +356,19 @@ def create_context_aware_agent(
     offloading_token_limit: int = 20000,
     reduction_threshold: float = 0.85,
     openrouter_model_name: str | None = None,
+    caching_backend: Literal["provider", "lmcache"] = "provider",
+    base_url: str | None = None,
 ) -> Any:
     """Context Engineering 전략이 적용된 에이전트를 생성합니다.
 
     Multi-Provider 지원: Anthropic, OpenAI, Gemini, OpenRouter 모델 사용 가능.
     Provider는 자동 감지되며, Anthropic만 cache_control 마커가 적용됩니다.
 
+    caching_backend="lmcache"는 LMCache가 붙은 자체 호스팅 vLLM(OpenAI 호환)
+    엔드포인트를 사용합니다. LMCache는 토큰 prefix 단위로 KV 캐시를 워커 간에
+    공유하므로 Provider용 캐시 마커/키를 붙이지 않고, 바이트 단위로 고정된
+    시스템 프롬프트만으로 캐시에 적중합니다.
+
     Args:
         model: LLM 모델 객체 또는 모델명 (기본: gpt-4.1)
         workspace_dir: 작업 디렉토리
@@ -184,30 +379,32 @@ def create_context_aware_agent(
         offloading_token_limit: Offloading 토큰 임계값
         reduction_threshold: Reduction 트리거 임계값
         openrouter_model_name: OpenRouter 모델명 강제 지정
+        caching_backend: 프롬프트 캐싱 방식 ("provider" 또는 "lmcache")
+        base_url: 모델명으로 생성하는 OpenAI 호환 클라이언트의 엔드포인트.
+            "lmcache"에서 생략하면 LMCACHE_BASE_URL 환경 변수를 사용합니다.
 
     Returns:
         구성된 DeepAgent
     """
-    from context_engineering_research_agent.context_strategies.offloading import (
-        OffloadingConfig,
-    )
-    from context_engineering_research_agent.context_strategies.reduction import (
-        ReductionConfig,
-    )
+    from deepagents import create_deep_agent
+    from deepagents.backends import CompositeBackend, StateBackend
+
+    if caching_backend == "lmcache" and base_url is None:
+        base_url = os.environ.get("LMCACHE_BASE_URL")
+        if isinstance(model, str) and not base_url:
+            raise ValueError(
+                "lmcache 캐싱 백엔드는 base_url 또는 LMCACHE_BASE_URL 환경 변수가 필요합니다"
+            )
 
     if isinstance(model, str):
-        llm: BaseChatModel = ChatOpenAI(model=model, temperature=0.0)
+        llm: BaseChatModel = _chat_openai(model, base_url)
     else:
         llm = model
 
     workspace = Path(workspace_dir) if workspace_dir else RESEARCH_WORKSPACE_DIR
     workspace.mkdir(parents=True, exist_ok=True)
 
-    local_fs_backend = FilesystemBackend(
-        root_dir=workspace,
-        virtual_mode=True,
-        max_file_size_mb=20,
-    )
+    local_fs_backend = _fs_backend_for(workspace.resolve(), 20)
 
     def local_backend_factory(rt: ToolRuntime) -> CompositeBackend:
         return CompositeBackend(
@@ -215,39 +412,22 @@ def create_context_aware_agent(
             routes={"/": local_fs_backend},
         )
 
-    middlewares: list[AgentMiddleware] = []
-
-    if enable_offloading:
-        offload_config = OffloadingConfig(
-            token_limit_before_evict=offloading_token_limit
-        )
-        middlewares.append(
-            ContextOffloadingStrategy(
-                config=offload_config, backend_factory=local_backend_factory
-            )
-        )
-
-    if enable_reduction:
-        reduce_config = ReductionConfig(context_threshold=reduction_threshold)
-        middlewares.append(
-            ContextReductionStrategy(config=reduce_config, summarization_model=llm)
-        )
-
-    if enable_caching:
-        inferred_openrouter_model_name = (
-            openrouter_model_name
-            if openrouter_model_name is not None
-            else _infer_openrouter_model_name(llm)
-        )
-        middlewares.append(
-            ContextCachingStrategy(
-                model=llm,
-                openrouter_model_name=inferred_openrouter_model_name,
-            )
-        )
-
-    if enable_cache_telemetry:
-        middlewares.append(PromptCachingTelemetryMiddleware())
+    context = _MiddlewareContext(
+        llm=llm,
+        backend_factory=local_backend_factory,
+        offloading_token_limit=offloading_token_limit,
+        reduction_threshold=reduction_threshold,
+        openrouter_model_name=openrouter_model_name,
+    )
+    enabled = {
+        "offloading": enable_offloading,
+        "reduction": enable_reduction,
+        "caching": enable_caching and caching_backend == "provider",
+        "cache_telemetry": enable_cache_telemetry,
+    }
+    middlewares = [
+        build(context) for name, build in _MIDDLEWARE_BUILDERS if enabled[name]
+    ]
 
     return create_deep_agent(
         model=llm,
@@ -3,22 +3,51 @@
 안전한 코드 실행을 위한 백엔드 구현체들입니다.
 """
 
-from context_engineering_research_agent.backends.docker_sandbox import (
-    DockerSandboxBackend,
-)
-from context_engineering_research_agent.backends.docker_session import (
-    DockerSandboxSession,
-)
-from context_engineering_research_agent.backends.docker_shared import (
-    SharedDockerBackend,
-)
-from context_engineering_research_agent.backends.pyodide_sandbox import (
-    PyodideSandboxBackend,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from context_engineering_research_agent.backends.docker_pool import (
+        DockerContainerPool,
+    )
+    from context_engineering_research_agent.backends.docker_sandbox import (
+        DockerSandboxBackend,
+    )
+    from context_engineering_research_agent.backends.docker_session import (
+        DockerSandboxSession,
+    )
+    from context_engineering_research_agent.backends.docker_shared import (
+        SharedDockerBackend,
+    )
+    from context_engineering_research_agent.backends.pyodide_sandbox import (
+        PyodideSandboxBackend,
+    )
+
+# 백엔드별 의존성(docker, deepagents 등)은 해당 백엔드를 처음 사용할 때 로드합니다.
+_LAZY_EXPORTS = {
+    "DockerContainerPool": "context_engineering_research_agent.backends.docker_pool",
+    "DockerSandboxBackend": "context_engineering_research_agent.backends.docker_sandbox",
+    "DockerSandboxSession": "context_engineering_research_agent.backends.docker_session",
+    "SharedDockerBackend": "context_engineering_research_agent.backends.docker_shared",
+    "PyodideSandboxBackend": (
+        "context_engineering_research_agent.backends.pyodide_sandbox"
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "PyodideSandboxBackend",
     "SharedDockerBackend",
     "DockerSandboxBackend",
     "DockerSandboxSession",
+    "DockerContainerPool",
 ]
@@ -0,0 +1,165 @@
+"""Docker archive API(put_archive/get_archive)용 tar 유틸리티.
+
+deepagents에 의존하지 않으므로 DockerSandboxBackend와 SharedDockerBackend가 함께 사용합니다.
+"""
+
+from __future__ import annotations
+
+import io
+import tarfile
+from collections.abc import Buffer, Iterable
+from typing import Any, BinaryIO, cast
+
+# Docker archive API의 stat.mode는 Go os.FileMode이며 최상위 비트가 디렉토리 플래그입니다.
+_GO_MODE_DIR = 1 << 31
+
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_TAR_BLOCK_SIZE = 512
+_USTAR_NAME_SIZE = 100
+_USTAR_MAX_SIZE = 8**11  # size 필드: 11자리 8진수
+
+
+def is_directory_stat(stat: Any) -> bool:
+    """get_archive가 돌려준 stat(Go FileMode)이 디렉토리를 가리키는지 확인합니다."""
+    if not isinstance(stat, dict):
+        return False
+    mode = stat.get("mode")
+    return isinstance(mode, int) and bool(mode & _GO_MODE_DIR)
+
+
+def _ustar_header(
+    name: bytes, size: int, mtime: int, mode: int, typeflag: bytes
+) -> bytes:
+    header = bytearray(_TAR_BLOCK_SIZE)
+    header[: len(name)] = name
+    header[100:108] = b"%07o\0" % mode
+    header[108:116] = b"0000000\0"  # uid
+    header[116:124] = b"0000000\0"  # gid
+    header[124:136] = b"%011o\0" % size
+    header[136:148] = b"%011o\0" % mtime
+    header[148:156] = b" " * 8  # 체크섬 계산 시 공백으로 채웁니다.
+    header[156:157] = typeflag
+    header[257:265] = b"ustar\x0000"
+    header[148:156] = b"%06o\0 " % sum(header)
+    return bytes(header)
+
+
+def make_ustar_archive(files: Iterable[tuple[str, bytes]], mtime: int) -> bytes | None:
+    """POSIX ustar 아카이브를 tarfile 없이 직접 만듭니다.
+
+    헤더를 파이썬 레벨에서 조립하는 tarfile보다 가볍습니다. 이름이 ASCII 100바이트를
+    넘거나 크기가 헤더 필드를 넘는 등 단순 ustar로 표현할 수 없으면 None을 반환하여
+    tarfile 경로로 폴백하게 합니다.
+    """
+    parts: list[bytes] = []
+    for file_name, content in files:
+        encoded = file_name.encode()
+        if (
+            not file_name.isascii()
+            or len(encoded) > _USTAR_NAME_SIZE
+            or not isinstance(content, (bytes, bytearray))
+            or len(content) >= _USTAR_MAX_SIZE
+        ):
+            return None
+        size = len(content)
+        parts.append(_ustar_header(encoded, size, mtime, 0o644, tarfile.REGTYPE))
+        parts.append(content)
+        padding = -size % _TAR_BLOCK_SIZE
+        if padding:
+            parts.append(bytes(padding))
+    parts.append(bytes(_TAR_BLOCK_SIZE * 2))
+    return b"".join(parts)
+
+
+class IterStream(io.RawIOBase):
+    """청크 이터레이터를 읽기 전용 raw 스트림으로 감싸는 어댑터.
+
+    Docker get_archive가 반환하는 청크를 도착하는 대로 읽어, 아카이브 전체를
+    메모리에 한 번에 모으지 않고 tar를 해제할 수 있게 합니다. 버퍼링은
+    io.BufferedReader에 맡깁니다.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        while not self._pending:
+            next_chunk = next(self._chunks, None)
+            if next_chunk is None:
+                return 0
+            self._pending = memoryview(next_chunk)
+        with memoryview(buffer) as view, view.cast("B") as target:
+            size = min(len(target), len(self._pending))
+            target[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def read_member(file_obj: io.BufferedIOBase, size: int) -> bytes:
+    """Tar 멤버를 고정 크기 청크로 미리 할당한 버퍼에 읽어 들입니다.
+
+    read() 한 번으로 읽으면 내부 청크 목록과 join 결과가 동시에 메모리에 올라오므로,
+    파일 크기만큼의 bytearray에 직접 채워 최대 메모리 사용량을 줄입니다.
+    """
+    buffer = bytearray(size)
+    offset = 0
+    with memoryview(buffer) as view:
+        while offset < size:
+            read = file_obj.readinto(view[offset : offset + _DOWNLOAD_CHUNK_SIZE])
+            if not read:
+                break
+            offset += read
+    if offset < size:
+        del buffer[offset:]
+    return bytes(buffer)
+
+
+def extract_first_file(chunks: Iterable[bytes]) -> bytes | None:
+    """get_archive 스트림에서 첫 번째 일반 파일의 내용을 꺼냅니다. 없으면 None."""
+    stream: BinaryIO = io.BufferedReader(IterStream(chunks), _DOWNLOAD_CHUNK_SIZE)
+    with tarfile.open(fileobj=stream, mode="r|") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            file_obj = tar.extractfile(member)
+            if file_obj is None:
+                return None
+            # extractfile()은 실제로 io.BufferedReader 하위 클래스(ExFileObject)를 반환합니다.
+            return read_member(cast("io.BufferedIOBase", file_obj), member.size)
+    return None
+
+
+def close_stream(stream: Any) -> None:
+    """읽지 않을 get_archive 스트림을 닫아 연결을 반환합니다."""
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
+
+
+def build_tar_archive(files: Iterable[tuple[str, bytes]], mtime: float) -> bytes:
+    """파일 엔트리만 담은 tar 아카이브를 만듭니다.
+
+    디렉토리 엔트리는 넣지 않습니다. 없는 부모 디렉토리는 put_archive가 만들고,
+    이미 있는 디렉토리의 권한과 소유자는 그대로 둡니다.
+
+    가능하면 make_ustar_archive를 쓰고, 긴 경로 등 ustar로 표현할 수 없으면
+    tarfile로 폴백합니다.
+    """
+    files = list(files)
+    archive = make_ustar_archive(files, int(mtime))
+    if archive is not None:
+        return archive
+    tar_stream = io.BytesIO()
+    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        for file_name, content in files:
+            info = tarfile.TarInfo(name=file_name)
+            info.size = len(content)
+            info.mtime = mtime
+            tar.addfile(info, io.BytesIO(content))
+    return tar_stream.getvalue()
@@ -0,0 +1,223 @@
+"""미리 띄워 둔 Docker 컨테이너 풀.
+
+컨테이너 생성은 1~3초가 걸리므로, SubAgent마다 첫 도구 호출에서 컨테이너를 만드는 대신
+유휴 컨테이너를 미리 만들어 두고 acquire()/release()로 빌려줍니다.
+
+- 최소 min_size개의 유휴 컨테이너를 백그라운드 스레드에서 유지합니다.
+- 반환된 컨테이너는 작업공간을 비운 뒤 다시 풀에 들어갑니다.
+- idle_ttl_seconds 이상 쓰이지 않은 여분의 컨테이너는 리퍼가 정지합니다.
+- 공유 풀은 프로세스 종료 시 atexit으로 닫혀 유휴 컨테이너가 남지 않습니다.
+"""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import logging
+import queue
+import shlex
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from context_engineering_research_agent.backends.docker_shell import (
+    shared_docker_client,
+)
+
+if TYPE_CHECKING:
+    from context_engineering_research_agent.backends.docker_shared import (
+        DockerConfig,
+    )
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MIN_SIZE = 2
+_DEFAULT_IDLE_TTL_SECONDS = 30 * 60
+_REAP_INTERVAL_SECONDS = 60.0
+
+
+def _stop_quietly(container: Any) -> None:
+    try:
+        container.stop()
+    except Exception:
+        pass
+
+
+class DockerContainerPool:
+    """같은 DockerConfig로 만든 유휴 컨테이너를 재사용하는 풀.
+
+    Args:
+        config: 컨테이너 생성 설정
+        min_size: 항상 유지할 유휴 컨테이너 수
+        idle_ttl_seconds: min_size를 넘는 유휴 컨테이너를 정지하기까지의 시간
+        client: Docker 클라이언트 (None이면 프로세스 공유 클라이언트)
+    """
+
+    def __init__(
+        self,
+        config: DockerConfig,
+        min_size: int = _DEFAULT_MIN_SIZE,
+        idle_ttl_seconds: float = _DEFAULT_IDLE_TTL_SECONDS,
+        client: Any = None,
+    ) -> None:
+        self.config = config
+        self.min_size = min_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._client = client
+        # (컨테이너, 풀에 들어온 시각)
+        self._idle: queue.Queue[tuple[Any, float]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._warming = False
+        self._closed = threading.Event()
+        self._reaper: threading.Thread | None = None
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            self._client = shared_docker_client()
+        return self._client
+
+    def _create(self) -> Any:
+        return self._get_client().containers.run(
+            self.config.image,
+            command="tail -f /dev/null",
+            detach=True,
+            mem_limit=self.config.memory_limit,
+            nano_cpus=int(self.config.cpu_limit * 1e9),
+            network_mode=self.config.network_mode,
+            auto_remove=self.config.auto_remove,
+            working_dir=self.config.workspace_path,
+        )
+
+    def warm(self) -> None:
+        """유휴 컨테이너가 min_size개가 되도록 백그라운드에서 채웁니다."""
+        with self._lock:
+            if self._closed.is_set():
+                return
+            if self._reaper is None:
+                self._reaper = threading.Thread(
+                    target=self._reap_loop, name="docker-pool-reaper", daemon=True
+                )
+                self._reaper.start()
+            if self._warming or self._idle.qsize() >= self.min_size:
+                return
+            self._warming = True
+        threading.Thread(
+            target=self._fill, name="docker-pool-warm", daemon=True
+        ).start()
+
+    def _fill(self) -> None:
+        try:
+            while not self._closed.is_set() and self._idle.qsize() < self.min_size:
+                try:
+                    container = self._create()
+                except Exception:
+                    # 채우기는 멈추고, acquire()의 동기 생성 경로에서 다시 시도합니다.
+                    logger.warning("컨테이너 풀 예열 실패", exc_info=True)
+                    return
+                self._idle.put((container, time.monotonic()))
+        finally:
+            with self._lock:
+                self._warming = False
+            if self._closed.is_set():
+                self._drain()
+
+    def acquire(self) -> Any:
+        """유휴 컨테이너를 꺼내 반환합니다. 풀이 비었으면 새로 만듭니다."""
+        try:
+            while True:
+                container, _ = self._idle.get_nowait()
+                if self._is_running(container):
+                    return container
+                _stop_quietly(container)
+        except queue.Empty:
+            return self._create()
+        finally:
+            self.warm()
+
+    def release(self, container: Any) -> None:
+        """작업공간을 비우고 컨테이너를 풀에 돌려놓습니다. 실패하면 정지합니다."""
+        if self._closed.is_set():
+            _stop_quietly(container)
+            return
+        workspace = shlex.quote(self.config.workspace_path.rstrip("/") or "/")
+        try:
+            result = container.exec_run(
+                [
+                    "sh",
+                    "-c",
+                    f"rm -rf {workspace}/* {workspace}/.[!.]* {workspace}/..?*",
+                ]
+            )
+            if result.exit_code not in (0, None):
+                raise RuntimeError("작업공간 초기화 실패")
+        except Exception:
+            _stop_quietly(container)
+            return
+        self._idle.put((container, time.monotonic()))
+
+    def _is_running(self, container: Any) -> bool:
+        try:
+            container.reload()
+        except Exception:
+            return False
+        return getattr(container, "status", "running") == "running"
+
+    def reap(self) -> None:
+        """min_size를 넘는 유휴 컨테이너 중 TTL이 지난 것을 정지합니다."""
+        now = time.monotonic()
+        kept: list[tuple[Any, float]] = []
+        expired: list[Any] = []
+        while True:
+            try:
+                kept.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        kept.sort(key=lambda item: item[1], reverse=True)
+        for position, (container, idle_since) in enumerate(kept):
+            if position >= self.min_size and now - idle_since > self.idle_ttl_seconds:
+                expired.append(container)
+            else:
+                self._idle.put((container, idle_since))
+        for container in expired:
+            _stop_quietly(container)
+
+    def _reap_loop(self) -> None:
+        while not self._closed.wait(_REAP_INTERVAL_SECONDS):
+            self.reap()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                container, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _stop_quietly(container)
+
+    def close(self) -> None:
+        """풀을 닫고 유휴 컨테이너를 모두 정지합니다."""
+        self._closed.set()
+        self._drain()
+
+
+_pools: dict[tuple[Any, ...], DockerContainerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_container_pool(config: DockerConfig) -> DockerContainerPool:
+    """설정별로 프로세스 전역에서 공유하는 컨테이너 풀을 반환합니다."""
+    key = dataclasses.astuple(config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = DockerContainerPool(config)
+        return pool
+
+
+@atexit.register
+def close_all_pools() -> None:
+    """공유 풀을 모두 닫고 유휴 컨테이너를 정지합니다 (프로세스 종료 시 자동 호출)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
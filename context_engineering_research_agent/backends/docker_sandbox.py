@@ -8,9 +8,11 @@ from __future__ import annotations
 import asyncio
 import io
 import posixpath
+import shlex
 import tarfile
 import time
-from typing import Any
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
 
 from deepagents.backends.protocol import (
     ExecuteResponse,
@@ -20,10 +22,33 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.sandbox import BaseSandbox
 
+from context_engineering_research_agent.backends.docker_archive import (
+    close_stream,
+    extract_first_file,
+    is_directory_stat,
+    make_ustar_archive,
+)
+from context_engineering_research_agent.backends.docker_shell import (
+    PersistentShell,
+    ShellSession,
+    is_missing_path_error,
+    is_stale_container_error,
+    shared_docker_client,
+)
 from context_engineering_research_agent.backends.workspace_protocol import (
     WORKSPACE_ROOT,
 )
 
+_T = TypeVar("_T")
+
+_MAX_OUTPUT_CHARS = 100000
+# UTF-8 한 글자는 최대 4바이트이므로, (_MAX_OUTPUT_CHARS + 1)글자 분량만 디코드해도
+# 앞 _MAX_OUTPUT_CHARS 글자와 잘림 여부가 전체를 디코드한 결과와 같습니다.
+_MAX_OUTPUT_DECODE_BYTES = (_MAX_OUTPUT_CHARS + 1) * 4
+
+# (put_archive 대상 디렉토리, [(원래 인덱스, tar 멤버 이름, 내용)])
+_UploadGroup = tuple[str, list[tuple[int, str, bytes]]]
+
 
 class DockerSandboxBackend(BaseSandbox):
     """Docker 컨테이너 기반 샌드박스 백엔드.
@@ -42,6 +67,12 @@ class DockerSandboxBackend(BaseSandbox):
         self._container_id = container_id
         self._workspace_root = workspace_root
         self._docker_client = docker_client
+        self._container_obj: Any | None = None
+        self._shell = ShellSession(
+            lambda: PersistentShell(
+                self._get_docker_client(), self._container_id, self._workspace_root
+            )
+        )
 
     @property
     def id(self) -> str:
@@ -50,67 +81,124 @@ class DockerSandboxBackend(BaseSandbox):
 
     def _get_docker_client(self) -> Any:
         if self._docker_client is None:
-            try:
-                import docker
-            except ImportError as exc:
-                raise RuntimeError(
-                    "docker 패키지가 설치되지 않았습니다: pip install docker"
-                ) from exc
-            try:
-                self._docker_client = docker.from_env()
-            except Exception as exc:
-                docker_exception = getattr(
-                    getattr(docker, "errors", None), "DockerException", None
-                )
-                if docker_exception and isinstance(exc, docker_exception):
-                    raise RuntimeError(f"Docker 클라이언트 초기화 실패: {exc}") from exc
-                raise RuntimeError(f"Docker 클라이언트 초기화 실패: {exc}") from exc
+            self._docker_client = shared_docker_client()
         return self._docker_client
 
     def _get_container(self) -> Any:
+        if self._container_obj is not None:
+            return self._container_obj
         client = self._get_docker_client()
         try:
-            return client.containers.get(self._container_id)
+            self._container_obj = client.containers.get(self._container_id)
         except Exception as exc:
             raise RuntimeError(f"컨테이너 조회 실패: {exc}") from exc
+        return self._container_obj
+
+    def _call_container(self, operation: Callable[[Any], _T]) -> _T:
+        """캐시된 컨테이너 핸들로 작업을 수행합니다.
+
+        컨테이너를 찾을 수 없다는 Docker API 오류가 나면 캐시를 비우고 다시 조회해
+        한 번만 재시도합니다.
+        """
+        try:
+            return operation(self._get_container())
+        except Exception as exc:
+            if self._container_obj is None or not is_stale_container_error(exc):
+                raise
+            self._container_obj = None
+        return operation(self._get_container())
 
     def _resolve_path(self, path: str) -> str:
         if path.startswith("/"):
             return path
         return posixpath.join(self._workspace_root, path)
 
-    def _ensure_parent_dir(self, parent_dir: str) -> None:
-        if not parent_dir:
+    def _relative_to_workspace(self, directory: str) -> str | None:
+        """워크스페이스 기준 상대 경로를 반환합니다. 워크스페이스 밖이면 None."""
+        root = posixpath.normpath(self._workspace_root)
+        normalized = posixpath.normpath(directory)
+        if normalized == root:
+            return ""
+        prefix = root.rstrip("/") + "/"
+        if normalized.startswith(prefix):
+            return normalized[len(prefix) :]
+        return None
+
+    def _ensure_parent_dirs(self, parent_dirs: Iterable[str]) -> None:
+        dirs = [shlex.quote(parent_dir) for parent_dir in parent_dirs if parent_dir]
+        if not dirs:
             return
-        result = self.execute(f"mkdir -p {parent_dir}")
+        result = self.execute(f"mkdir -p {' '.join(dirs)}")
         if result.exit_code not in (0, None):
             raise RuntimeError(result.output or "워크스페이스 디렉토리 생성 실패")
 
+    def _put_archive(self, target_dir: str, archive: bytes) -> None:
+        """put_archive를 호출하고, 대상 디렉토리가 없으면 만든 뒤 한 번 재시도합니다.
+
+        외부 컨테이너에 연결한 경우 워크스페이스 루트가 없을 수 있습니다.
+        """
+        try:
+            self._call_container(
+                lambda container: container.put_archive(target_dir, archive)
+            )
+            return
+        except Exception as exc:
+            if not is_missing_path_error(exc):
+                raise
+        # 셸 세션은 워크스페이스로 cd하므로, 워크스페이스가 없을 때는 workdir 없이 만듭니다.
+        result = self._call_container(
+            lambda container: container.exec_run(["mkdir", "-p", target_dir])
+        )
+        if result.exit_code not in (0, None):
+            output, _ = self._decode_output(result.output)
+            raise RuntimeError(output or "워크스페이스 디렉토리 생성 실패")
+        self._call_container(
+            lambda container: container.put_archive(target_dir, archive)
+        )
+
     def _truncate_output(self, output: str) -> tuple[str, bool]:
-        if len(output) <= 100000:
+        if len(output) <= _MAX_OUTPUT_CHARS:
             return output, False
-        return output[:100000] + "\n[출력이 잘렸습니다...]", True
+        return output[:_MAX_OUTPUT_CHARS] + "\n[출력이 잘렸습니다...]", True
+
+    def _decode_output(self, raw_output: Any) -> tuple[str, bool]:
+        """명령 출력을 디코드하고 최대 길이로 자릅니다.
+
+        bytes 출력은 잘릴 부분까지 디코드하지 않도록 앞쪽 일부만 디코드합니다.
+        """
+        if isinstance(raw_output, (bytes, bytearray)):
+            with memoryview(raw_output) as view:
+                output = str(view[:_MAX_OUTPUT_DECODE_BYTES], "utf-8", errors="replace")
+        else:
+            output = str(raw_output)
+        return self._truncate_output(output)
+
+    def close(self) -> None:
+        """영구 셸 세션을 닫습니다."""
+        self._shell.close()
 
     def execute(self, command: str) -> ExecuteResponse:
         """컨테이너 내부에서 명령을 실행합니다.
 
         shell을 통해 실행하므로 리다이렉션(>), 파이프(|), &&, || 등을 사용할 수 있습니다.
+        컨테이너에 열어 둔 영구 sh 세션을 재사용하며, 사용할 수 없으면 exec_run으로
+        명령마다 새 셸을 띄웁니다.
         """
         try:
-            container = self._get_container()
-            exec_result = container.exec_run(
-                ["sh", "-c", command],
-                workdir=self._workspace_root,
-            )
-            raw_output = exec_result.output
-            if isinstance(raw_output, bytes):
-                output = raw_output.decode("utf-8", errors="replace")
-            else:
-                output = str(raw_output)
-            output, truncated = self._truncate_output(output)
+            shell_result = self._shell.run(command, _MAX_OUTPUT_DECODE_BYTES)
+            if shell_result is None:
+                exec_result = self._call_container(
+                    lambda container: container.exec_run(
+                        ["sh", "-c", command],
+                        workdir=self._workspace_root,
+                    )
+                )
+                shell_result = (exec_result.output, exec_result.exit_code)
+            raw_output, exit_code = shell_result
+            output, truncated = self._decode_output(raw_output)
             return ExecuteResponse(
                 output=output,
-                exit_code=exec_result.exit_code,
+                exit_code=exit_code,
                 truncated=truncated,
             )
         except Exception as exc:
@@ -120,77 +208,165 @@ class DockerSandboxBackend(BaseSandbox):
         """비동기 실행 래퍼."""
         return await asyncio.to_thread(self.execute, command)
 
-    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-        """파일을 컨테이너로 업로드합니다."""
-        responses: list[FileUploadResponse] = []
-        for path, content in files:
+    def _plan_upload(
+        self, files: list[tuple[str, bytes]]
+    ) -> tuple[list[FileUploadResponse | None], list[_UploadGroup]]:
+        """업로드 파일을 put_archive 단위 그룹으로 나눕니다.
+
+        워크스페이스 하위 파일들은 하나의 그룹으로 묶어 워크스페이스 기준 상대 경로로
+        넣습니다. 없는 중간 디렉토리는 put_archive가 만들므로 디렉토리 엔트리는 넣지
+        않습니다 (이미 있는 디렉토리의 권한과 소유자를 바꾸지 않기 위해서입니다).
+        워크스페이스 밖의 경로는 부모 디렉토리별 그룹으로 묶고 필요한 디렉토리는
+        단일 mkdir 호출로 생성합니다. 경로 오류는 responses에 미리 기록됩니다.
+        """
+        responses: list[FileUploadResponse | None] = [None] * len(files)
+        groups: dict[str, list[tuple[int, str, bytes]]] = {}
+        external_dirs: list[str] = []
+        for index, (path, content) in enumerate(files):
             try:
                 full_path = self._resolve_path(path)
-                parent_dir = posixpath.dirname(full_path)
                 file_name = posixpath.basename(full_path)
                 if not file_name:
                     raise ValueError("업로드 경로에 파일명이 필요합니다")
-                self._ensure_parent_dir(parent_dir)
+            except Exception as exc:
+                responses[index] = FileUploadResponse(
+                    path=path, error=self._map_upload_error(exc)
+                )
+                continue
+            parent_dir = posixpath.dirname(full_path)
+            relative_dir = self._relative_to_workspace(parent_dir)
+            if relative_dir is None:
+                archive_root, member_name = parent_dir, file_name
+                if archive_root not in groups:
+                    external_dirs.append(archive_root)
+            else:
+                archive_root = self._workspace_root
+                member_name = posixpath.join(relative_dir, file_name)
+            groups.setdefault(archive_root, []).append((index, member_name, content))
+
+        if external_dirs:
+            try:
+                self._ensure_parent_dirs(external_dirs)
+            except Exception as exc:
+                error = self._map_upload_error(exc)
+                for parent_dir in external_dirs:
+                    for index, _, _ in groups.pop(parent_dir):
+                        responses[index] = FileUploadResponse(
+                            path=files[index][0], error=error
+                        )
+
+        return responses, list(groups.items())
+
+    def _upload_group(
+        self,
+        files: list[tuple[str, bytes]],
+        group: _UploadGroup,
+        responses: list[FileUploadResponse | None],
+    ) -> None:
+        """한 그룹을 tar로 묶어 put_archive 한 번으로 업로드하고 결과를 기록합니다."""
+        archive_root, entries = group
+        mtime = time.time()
+        archive = make_ustar_archive(
+            [(file_name, content) for _, file_name, content in entries], int(mtime)
+        )
+        if archive is not None:
+            added = [index for index, _, _ in entries]
+        else:
+            archive, added = self._make_tarfile_archive(
+                files, entries, mtime, responses
+            )
+        if not added:
+            return
+
+        try:
+            self._put_archive(archive_root or "/", archive)
+        except Exception as exc:
+            error = self._map_upload_error(exc)
+            for index in added:
+                responses[index] = FileUploadResponse(path=files[index][0], error=error)
+            return
+        for index in added:
+            responses[index] = FileUploadResponse(path=files[index][0])
+
+    def _make_tarfile_archive(
+        self,
+        files: list[tuple[str, bytes]],
+        entries: list[tuple[int, str, bytes]],
+        mtime: float,
+        responses: list[FileUploadResponse | None],
+    ) -> tuple[bytes, list[int]]:
+        """tarfile로 아카이브를 만듭니다. 긴 경로 등 ustar 헤더로 표현할 수 없는 경우용.
 
-                tar_stream = io.BytesIO()
-                with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        추가에 실패한 항목은 responses에 오류로 기록하고, 추가된 인덱스 목록을 함께
+        반환합니다.
+        """
+        tar_stream = io.BytesIO()
+        added: list[int] = []
+        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+            for index, file_name, content in entries:
+                try:
                     info = tarfile.TarInfo(name=file_name)
                     info.size = len(content)
-                    info.mtime = time.time()
+                    info.mtime = mtime
                     tar.addfile(info, io.BytesIO(content))
-                tar_stream.seek(0)
+                    added.append(index)
+                except Exception as exc:
+                    responses[index] = FileUploadResponse(
+                        path=files[index][0], error=self._map_upload_error(exc)
+                    )
+        return tar_stream.getvalue(), added
 
-                container = self._get_container()
-                container.put_archive(parent_dir or "/", tar_stream.getvalue())
-                responses.append(FileUploadResponse(path=path))
-            except Exception as exc:
-                responses.append(
-                    FileUploadResponse(path=path, error=self._map_upload_error(exc))
-                )
-        return responses
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """파일을 컨테이너로 업로드합니다.
+
+        같은 tar 그룹에 속한 파일들은 put_archive 한 번으로 업로드됩니다.
+        """
+        responses, groups = self._plan_upload(files)
+        for group in groups:
+            self._upload_group(files, group, responses)
+        return [response for response in responses if response is not None]
 
     async def aupload_files(
         self, files: list[tuple[str, bytes]]
     ) -> list[FileUploadResponse]:
-        """비동기 업로드 래퍼."""
-        return await asyncio.to_thread(self.upload_files, files)
+        """비동기 업로드. tar 그룹별 put_archive를 동시에 실행합니다."""
+        responses, groups = await asyncio.to_thread(self._plan_upload, files)
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(self._upload_group, files, group, responses)
+                for group in groups
+            )
+        )
+        return [response for response in responses if response is not None]
+
+    def _download_file(self, path: str) -> FileDownloadResponse:
+        try:
+            full_path = self._resolve_path(path)
+            stream, stat = self._call_container(
+                lambda container: container.get_archive(full_path)
+            )
+            if is_directory_stat(stat):
+                # 디렉토리 전체 아카이브를 받아 버리지 않도록 스트림을 읽지 않습니다.
+                close_stream(stream)
+                return FileDownloadResponse(path=path, error="is_directory")
+            content = extract_first_file(stream)
+            if content is None:
+                return FileDownloadResponse(path=path, error="is_directory")
+            return FileDownloadResponse(path=path, content=content)
+        except Exception as exc:
+            return FileDownloadResponse(path=path, error=self._map_download_error(exc))
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """컨테이너에서 파일을 다운로드합니다."""
-        responses: list[FileDownloadResponse] = []
-        for path in paths:
-            try:
-                full_path = self._resolve_path(path)
-                container = self._get_container()
-                stream, _ = container.get_archive(full_path)
-                raw = b"".join(chunk for chunk in stream)
-                content = self._extract_tar_content(raw)
-                if content is None:
-                    responses.append(
-                        FileDownloadResponse(path=path, error="is_directory")
-                    )
-                    continue
-                responses.append(FileDownloadResponse(path=path, content=content))
-            except Exception as exc:
-                responses.append(
-                    FileDownloadResponse(path=path, error=self._map_download_error(exc))
-                )
-        return responses
+        return [self._download_file(path) for path in paths]
 
     async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-        """비동기 다운로드 래퍼."""
-        return await asyncio.to_thread(self.download_files, paths)
-
-    def _extract_tar_content(self, raw: bytes) -> bytes | None:
-        with tarfile.open(fileobj=io.BytesIO(raw)) as tar:
-            members = [member for member in tar.getmembers() if member.isfile()]
-            if not members:
-                return None
-            target = members[0]
-            file_obj = tar.extractfile(target)
-            if file_obj is None:
-                return None
-            return file_obj.read()
+        """비동기 다운로드. 경로별 get_archive를 동시에 실행합니다."""
+        return list(
+            await asyncio.gather(
+                *(asyncio.to_thread(self._download_file, path) for path in paths)
+            )
+        )
 
     def _map_upload_error(self, exc: Exception) -> FileOperationError:
         message = str(exc).lower()
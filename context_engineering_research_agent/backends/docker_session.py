@@ -11,6 +11,9 @@ from typing import Any
 from context_engineering_research_agent.backends.docker_sandbox import (
     DockerSandboxBackend,
 )
+from context_engineering_research_agent.backends.docker_shell import (
+    shared_docker_client,
+)
 from context_engineering_research_agent.backends.workspace_protocol import (
     META_DIR,
     SHARED_DIR,
@@ -37,21 +40,7 @@ class DockerSandboxSession:
 
     def _get_docker_client(self) -> Any:
         if self._docker_client is None:
-            try:
-                import docker
-            except ImportError as exc:
-                raise RuntimeError(
-                    "docker 패키지가 설치되지 않았습니다: pip install docker"
-                ) from exc
-            try:
-                self._docker_client = docker.from_env()
-            except Exception as exc:
-                docker_exception = getattr(
-                    getattr(docker, "errors", None), "DockerException", None
-                )
-                if docker_exception and isinstance(exc, docker_exception):
-                    raise RuntimeError(f"Docker 클라이언트 초기화 실패: {exc}") from exc
-                raise RuntimeError(f"Docker 클라이언트 초기화 실패: {exc}") from exc
+            self._docker_client = shared_docker_client()
         return self._docker_client
 
     async def start(self) -> None:
@@ -87,6 +76,8 @@ class DockerSandboxSession:
         """컨테이너를 중지하고 제거합니다."""
         container = self._container
         self._container = None
+        if self._backend is not None:
+            self._backend.close()
         self._backend = None
         if container is None:
             return
@@ -47,11 +47,44 @@ DeepAgents의 기본 구조에서 SubAgent들은 독립된 컨텍스트를 가
 4. **리소스 제한**: CPU/메모리 제한 설정
 """
 
+import asyncio
+import posixpath
+import shlex
+import threading
+import time
+import uuid
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any
-
-
-@dataclass
+from typing import Any, TypeVar
+
+from context_engineering_research_agent.backends.docker_archive import (
+    build_tar_archive,
+    close_stream,
+    extract_first_file,
+    is_directory_stat,
+)
+from context_engineering_research_agent.backends.docker_pool import (
+    DockerContainerPool,
+    get_container_pool,
+)
+from context_engineering_research_agent.backends.docker_shell import (
+    PersistentShell,
+    ShellSession,
+    exec_capped,
+    is_missing_path_error,
+    is_stale_container_error,
+    shared_docker_client,
+)
+
+_T = TypeVar("_T")
+
+_MAX_OUTPUT_CHARS = 100000
+# 출력은 이 바이트 수까지만 읽습니다. UTF-8 한 글자는 최대 4바이트이므로
+# 잘림 여부와 앞 _MAX_OUTPUT_CHARS 글자는 전체 출력을 읽었을 때와 같습니다.
+_MAX_OUTPUT_DECODE_BYTES = (_MAX_OUTPUT_CHARS + 1) * 4
+
+
+@dataclass(slots=True, frozen=True)
 class DockerConfig:
     image: str = "python:3.11-slim"
     workspace_path: str = "/workspace"
@@ -62,7 +95,7 @@ class DockerConfig:
     timeout_seconds: int = 300
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecuteResponse:
     output: str
     exit_code: int | None = None
@@ -70,14 +103,14 @@ class ExecuteResponse:
     error: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WriteResult:
     path: str
     error: str | None = None
     files_update: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EditResult:
     path: str
     occurrences: int = 0
@@ -91,32 +124,53 @@ class SharedDockerBackend:
     Args:
         config: Docker 설정
         container_id: 기존 컨테이너 ID (재사용 시)
+        use_pool: 컨테이너를 새로 만드는 대신 설정별 공유 풀에서 빌려올지 여부.
+            공유 풀은 유휴 컨테이너를 계속 띄워 두므로 기본값은 False입니다.
+        pool: 사용할 컨테이너 풀 (지정하면 use_pool과 관계없이 사용)
     """
 
     def __init__(
         self,
         config: DockerConfig | None = None,
         container_id: str | None = None,
+        use_pool: bool = False,
+        pool: DockerContainerPool | None = None,
     ) -> None:
         self.config = config or DockerConfig()
         self._container_id = container_id
+        # 직접 만든(또는 풀에서 빌린) 컨테이너만 죽었을 때 새로 만들 수 있습니다.
+        self._owns_container = container_id is None
         self._docker_client: Any = None
+        self._container: Any = None
+        self._shell = ShellSession(self._open_shell)
+        # 여러 SubAgent가 동시에 첫 호출을 해도 컨테이너는 하나만 준비되도록 합니다.
+        self._container_lock = threading.Lock()
+        self._pool: DockerContainerPool | None = None
+        self._pooled = False
+        if container_id is None and (use_pool or pool is not None):
+            self._pool = pool or get_container_pool(self.config)
+            self._pool.warm()
 
     def _get_docker_client(self) -> Any:
         if self._docker_client is None:
-            try:
-                import docker
-
-                self._docker_client = docker.from_env()
-            except ImportError:
-                raise RuntimeError(
-                    "docker 패키지가 설치되지 않았습니다: pip install docker"
-                )
+            self._docker_client = shared_docker_client()
         return self._docker_client
 
     def _ensure_container(self) -> str:
         if self._container_id:
             return self._container_id
+        with self._container_lock:
+            if self._container_id:
+                return self._container_id
+            return self._start_container()
+
+    def _start_container(self) -> str:
+        if self._pool is not None:
+            container = self._pool.acquire()
+            self._pooled = True
+            self._container = container
+            self._container_id = container.id
+            return container.id
 
         client = self._get_docker_client()
         container = client.containers.run(
@@ -127,31 +181,98 @@ class SharedDockerBackend:
             nano_cpus=int(self.config.cpu_limit * 1e9),
             network_mode=self.config.network_mode,
             auto_remove=self.config.auto_remove,
+            working_dir=self.config.workspace_path,
         )
+        self._container = container
         self._container_id = container.id
         return container.id
 
-    def execute(self, command: str) -> ExecuteResponse:
-        try:
+    def _get_container(self) -> Any:
+        if self._container is None:
             container_id = self._ensure_container()
-            client = self._get_docker_client()
-            container = client.containers.get(container_id)
+            # 새로 만들었거나 풀에서 빌린 경우 _ensure_container가 핸들을 이미 채웁니다.
+            if self._container is None:
+                self._container = self._get_docker_client().containers.get(container_id)
+        return self._container
+
+    def _call_container(self, operation: Callable[[Any], _T]) -> _T:
+        """캐시된 컨테이너 핸들로 작업을 수행합니다.
 
-            exec_result = container.exec_run(
+        컨테이너가 사라졌다는 오류가 나면 핸들을 버리고(직접 만든 컨테이너라면
+        새로 만들어) 한 번만 재시도합니다.
+        """
+        try:
+            return operation(self._get_container())
+        except Exception as exc:
+            if not is_stale_container_error(exc):
+                raise
+            self._discard_container()
+        return operation(self._get_container())
+
+    def _discard_container(self) -> None:
+        self._shell.close()
+        self._container = None
+        if self._owns_container:
+            self._container_id = None
+            self._pooled = False
+
+    def _relative_path(self, path: str) -> str:
+        """작업공간 기준 상대 경로를 반환합니다. 작업공간 밖을 가리키면 ValueError."""
+        workspace = self.config.workspace_path.rstrip("/")
+        full_path = posixpath.normpath(f"{workspace}/{path.lstrip('/')}")
+        relative = posixpath.relpath(full_path, workspace or "/")
+        if relative == "." or relative.startswith("../") or relative == "..":
+            raise ValueError(f"작업공간 밖의 경로입니다: {path}")
+        return relative
+
+    def _open_shell(self) -> PersistentShell:
+        return PersistentShell(
+            self._get_docker_client(),
+            self._ensure_container(),
+            self.config.workspace_path,
+        )
+
+    def _run(self, command: str, max_output_bytes: int) -> tuple[Any, int | None]:
+        """영구 셸로 명령을 실행하고, 쓸 수 없으면 일회성 exec로 폴백합니다."""
+        shell_result = self._shell.run(command, max_output_bytes)
+        if shell_result is not None:
+            return shell_result
+        client = self._get_docker_client()
+        return self._call_container(
+            lambda container: exec_capped(
+                client,
+                container.id,
                 command,
-                workdir=self.config.workspace_path,
+                self.config.workspace_path,
+                max_output_bytes,
             )
+        )
 
-            output = exec_result.output.decode("utf-8", errors="replace")
-            truncated = len(output) > 100000
-            if truncated:
-                output = output[:100000] + "\n[출력이 잘렸습니다...]"
-
-            return ExecuteResponse(
-                output=output,
-                exit_code=exec_result.exit_code,
-                truncated=truncated,
+    def _to_response(self, raw_output: Any, exit_code: int | None) -> ExecuteResponse:
+        if isinstance(raw_output, (bytes, bytearray)):
+            output = bytes(raw_output[:_MAX_OUTPUT_DECODE_BYTES]).decode(
+                "utf-8", errors="replace"
             )
+        else:
+            output = str(raw_output)
+        truncated = len(output) > _MAX_OUTPUT_CHARS
+        if truncated:
+            output = output[:_MAX_OUTPUT_CHARS] + "\n[출력이 잘렸습니다...]"
+
+        return ExecuteResponse(
+            output=output,
+            exit_code=exit_code,
+            truncated=truncated,
+        )
+
+    def execute(self, command: str) -> ExecuteResponse:
+        """컨테이너의 영구 sh 세션에서 명령을 실행합니다.
+
+        세션을 사용할 수 없으면 exec_run으로 명령마다 새 셸을 띄웁니다.
+        """
+        try:
+            raw_output, exit_code = self._run(command, _MAX_OUTPUT_DECODE_BYTES)
+            return self._to_response(raw_output, exit_code)
         except Exception as e:
             return ExecuteResponse(
                 output="",
@@ -159,63 +280,173 @@ class SharedDockerBackend:
                 error=str(e),
             )
 
+    def execute_batch(self, commands: list[str]) -> list[ExecuteResponse]:
+        """여러 명령을 스크립트 하나로 묶어 한 번의 왕복으로 실행합니다.
+
+        각 명령은 독립된 `sh -c`로 차례대로 실행되며(앞 명령이 실패해도 계속),
+        명령별 출력과 종료 코드를 구분 마커로 나눠 돌려줍니다. 전체 출력은
+        명령 수 x 명령당 상한까지만 읽으므로, 앞 명령의 출력이 너무 크면 뒤 명령의
+        결과는 error로 보고될 수 있습니다.
+        """
+        if not commands:
+            return []
+        token = f"__batch_{uuid.uuid4().hex}__"
+        script = "\n".join(
+            f"printf '%s\\n' '{token}S{index}'; "
+            f"sh -c {shlex.quote(command)} </dev/null 2>&1; "
+            f"printf '\\n{token}E{index}:%d\\n' $?"
+            for index, command in enumerate(commands)
+        )
+        try:
+            raw_output, _ = self._run(script, _MAX_OUTPUT_DECODE_BYTES * len(commands))
+        except Exception as e:
+            return [
+                ExecuteResponse(output="", exit_code=1, error=str(e)) for _ in commands
+            ]
+        if not isinstance(raw_output, (bytes, bytearray)):
+            raw_output = str(raw_output).encode("utf-8")
+        return [
+            self._split_batch_output(raw_output, token, index)
+            for index in range(len(commands))
+        ]
+
+    def _split_batch_output(
+        self, raw_output: bytes, token: str, index: int
+    ) -> ExecuteResponse:
+        start_marker = f"{token}S{index}\n".encode()
+        end_marker = f"\n{token}E{index}:".encode()
+        start = raw_output.find(start_marker)
+        end = raw_output.find(end_marker, start + 1) if start != -1 else -1
+        if end == -1:
+            return ExecuteResponse(
+                output="",
+                exit_code=None,
+                error="배치 출력에서 명령 결과를 찾지 못했습니다",
+            )
+        code_start = end + len(end_marker)
+        code_end = raw_output.find(b"\n", code_start)
+        if code_end == -1:
+            code_end = len(raw_output)
+        try:
+            exit_code: int | None = int(raw_output[code_start:code_end])
+        except ValueError:
+            exit_code = None
+        return self._to_response(raw_output[start + len(start_marker) : end], exit_code)
+
     async def aexecute(self, command: str) -> ExecuteResponse:
-        return self.execute(command)
+        """비동기 실행. 이벤트 루프를 막지 않도록 워커 스레드에서 실행합니다.
 
-    def read(self, path: str, offset: int = 0, limit: int = 500) -> str:
-        full_path = f"{self.config.workspace_path}{path}"
-        result = self.execute(f"sed -n '{offset + 1},{offset + limit}p' {full_path}")
+        영구 셸이 다른 호출에 사용 중이면 exec_run으로 폴백하므로, 여러 SubAgent의
+        명령이 같은 컨테이너에서 동시에 실행됩니다.
+        """
+        return await asyncio.to_thread(self.execute, command)
 
-        if result.error:
-            return f"파일 읽기 오류: {result.error}"
+    def read(self, path: str, offset: int = 0, limit: int = 500) -> str:
+        """get_archive로 파일을 받아 offset부터 limit줄을 반환합니다."""
+        try:
+            full_path = posixpath.join(
+                self.config.workspace_path, self._relative_path(path)
+            )
+            stream, stat = self._call_container(
+                lambda container: container.get_archive(full_path)
+            )
+            if is_directory_stat(stat):
+                close_stream(stream)
+                return f"파일 읽기 오류: 디렉토리입니다: {path}"
+            content = extract_first_file(stream)
+        except Exception as e:
+            return f"파일 읽기 오류: {e}"
+        if content is None:
+            return f"파일 읽기 오류: 일반 파일이 아닙니다: {path}"
 
-        return result.output
+        lines = content.decode("utf-8", errors="replace").splitlines(keepends=True)
+        return "".join(lines[offset : offset + limit])
 
     async def aread(self, path: str, offset: int = 0, limit: int = 500) -> str:
-        return self.read(path, offset, limit)
+        return await asyncio.to_thread(self.read, path, offset, limit)
 
     def write(self, path: str, content: str) -> WriteResult:
-        full_path = f"{self.config.workspace_path}{path}"
+        """put_archive 한 번으로 파일을 씁니다.
 
-        dir_path = "/".join(full_path.split("/")[:-1])
-        self.execute(f"mkdir -p {dir_path}")
+        없는 부모 디렉토리는 put_archive가 만들어 주므로 mkdir 실행이 필요 없습니다.
+        tar에 디렉토리 엔트리는 넣지 않아 기존 디렉토리의 권한과 소유자는 바뀌지 않습니다.
+        작업공간 루트 자체가 없으면(외부 컨테이너 등) 만든 뒤 한 번 재시도합니다.
+        """
+        try:
+            relative = self._relative_path(path)
+            archive = build_tar_archive(
+                [(relative, content.encode("utf-8"))], time.time()
+            )
+            try:
+                self._put_workspace_archive(archive)
+            except Exception as exc:
+                if not is_missing_path_error(exc):
+                    raise
+                self._ensure_workspace()
+                self._put_workspace_archive(archive)
+        except Exception as e:
+            return WriteResult(path=path, error=str(e))
 
-        escaped_content = content.replace("'", "'\\''")
-        result = self.execute(f"echo '{escaped_content}' > {full_path}")
+        return WriteResult(path=path)
 
-        if result.exit_code != 0:
-            return WriteResult(path=path, error=result.output or result.error)
+    def _put_workspace_archive(self, archive: bytes) -> None:
+        self._call_container(
+            lambda container: container.put_archive(self.config.workspace_path, archive)
+        )
 
-        return WriteResult(path=path)
+    def _ensure_workspace(self) -> None:
+        # 셸 세션은 작업공간으로 cd하므로, 작업공간이 없을 때는 workdir 없이 실행합니다.
+        result = self._call_container(
+            lambda container: container.exec_run(
+                ["mkdir", "-p", self.config.workspace_path]
+            )
+        )
+        if result.exit_code not in (0, None):
+            raise RuntimeError(
+                self._to_response(result.output, result.exit_code).output
+                or "작업공간 디렉토리 생성 실패"
+            )
 
     async def awrite(self, path: str, content: str) -> WriteResult:
-        return self.write(path, content)
+        return await asyncio.to_thread(self.write, path, content)
 
     def ls_info(self, path: str) -> list[dict[str, Any]]:
+        """디렉토리 바로 아래 항목을 find -printf 한 번으로 나열합니다.
+
+        항목은 NUL로 구분하므로 공백이나 줄바꿈이 들어간 파일명도 그대로 처리됩니다.
+        """
         full_path = f"{self.config.workspace_path}{path}"
-        result = self.execute(f"ls -la {full_path}")
+        result = self.execute(
+            f"find {shlex.quote(full_path)} -mindepth 1 -maxdepth 1 "
+            "-printf '%y\\t%P\\0'"
+        )
 
-        if result.error:
+        if result.error or result.exit_code != 0:
             return []
 
-        files = []
-        for line in result.output.strip().split("\n")[1:]:
-            parts = line.split()
-            if len(parts) >= 9:
-                name = " ".join(parts[8:])
-                files.append(
-                    {
-                        "path": f"{path}/{name}".replace("//", "/"),
-                        "is_dir": line.startswith("d"),
-                    }
-                )
+        base = path.rstrip("/")
+        return [
+            {"path": f"{base}/{name}", "is_dir": file_type == "d"}
+            for entry in result.output.split("\0")
+            if "\t" in entry
+            for file_type, name in [entry.split("\t", 1)]
+        ]
 
-        return files
+    async def aexecute_batch(self, commands: list[str]) -> list[ExecuteResponse]:
+        return await asyncio.to_thread(self.execute_batch, commands)
 
     async def als_info(self, path: str) -> list[dict[str, Any]]:
-        return self.ls_info(path)
+        return await asyncio.to_thread(self.ls_info, path)
 
     def cleanup(self) -> None:
+        """셸을 닫고 컨테이너를 정리합니다. 풀에서 빌린 컨테이너는 풀에 돌려줍니다."""
+        self._shell.close()
+        if self._pooled and self._pool is not None and self._container is not None:
+            self._pool.release(self._container)
+            self._pooled = False
+            self._container_id = None
+            self._container = None
+            return
         if self._container_id and self._docker_client:
             try:
                 container = self._docker_client.containers.get(self._container_id)
@@ -223,6 +454,7 @@ class SharedDockerBackend:
             except Exception:
                 pass
             self._container_id = None
+            self._container = None
 
     def __enter__(self) -> "SharedDockerBackend":
         return self
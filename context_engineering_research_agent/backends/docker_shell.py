@@ -0,0 +1,221 @@
+"""Docker 컨테이너 내부의 영구 sh 세션.
+
+명령마다 exec 인스턴스를 만드는 대신 하나의 sh 프로세스를 열어 두고 재사용합니다.
+DockerSandboxBackend와 SharedDockerBackend가 함께 사용합니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import shlex
+import threading
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+# 여러 백엔드/서브에이전트가 같은 클라이언트로 동시에 요청하므로 기본값(10)보다
+# 넉넉하게 잡아 커넥션 풀 고갈로 매 요청 새 소켓을 여는 일을 막습니다.
+_DOCKER_MAX_POOL_SIZE = 16
+
+
+@functools.lru_cache(maxsize=1)
+def shared_docker_client() -> Any:
+    """프로세스 전역에서 공유하는 Docker 클라이언트를 반환합니다.
+
+    docker.from_env()는 데몬 연결 설정 비용이 있고 클라이언트마다 커넥션 풀을 따로
+    가지므로, 백엔드/세션/컨테이너 풀이 한 클라이언트(하나의 keep-alive 풀)를 함께
+    사용합니다. 실패한 경우는 캐시되지 않습니다.
+    """
+    try:
+        import docker
+    except ImportError as exc:
+        raise RuntimeError(
+            "docker 패키지가 설치되지 않았습니다: pip install docker"
+        ) from exc
+    try:
+        return docker.from_env(max_pool_size=_DOCKER_MAX_POOL_SIZE)
+    except Exception as exc:
+        raise RuntimeError(f"Docker 클라이언트 초기화 실패: {exc}") from exc
+
+
+class PersistentShell:
+    """컨테이너 내부의 장기 실행 sh 프로세스와 stdin/stdout으로 통신하는 세션.
+
+    명령마다 exec 인스턴스를 만드는 대신, 하나의 sh에 명령을 쓰고 종료 코드가
+    포함된 센티널 줄까지 출력을 읽습니다. 각 명령은 `sh -c`로 감싸 실행하므로
+    cwd/환경 변수/구문 오류가 세션에 누적되지 않습니다.
+    """
+
+    def __init__(self, client: Any, container_id: str, workdir: str) -> None:
+        from docker.utils import socket as docker_socket
+
+        self._docker_socket = docker_socket
+        self._workdir = shlex.quote(workdir)
+        self._token = f"__{uuid.uuid4().hex}__:"
+        self._marker = f"\n{self._token}".encode()
+        exec_id = client.api.exec_create(
+            container_id, ["sh"], stdin=True, stdout=True, stderr=True, tty=False
+        )["Id"]
+        self._sock = client.api.exec_start(exec_id, socket=True)
+        self._buffer = bytearray()
+
+    def send(self, command: str) -> None:
+        """명령을 셸 stdin에 씁니다. 실패 시 명령은 실행되지 않은 상태입니다."""
+        script = (
+            f"cd {self._workdir} && sh -c {shlex.quote(command)} </dev/null 2>&1; "
+            f"printf '\\n{self._token}%d\\n' $?\n"
+        )
+        raw_sock = getattr(self._sock, "_sock", self._sock)
+        raw_sock.sendall(script.encode("utf-8"))
+
+    def receive(self, max_output_bytes: int | None = None) -> tuple[bytes, int]:
+        """센티널 줄까지 출력을 읽어 (출력, 종료 코드)를 반환합니다.
+
+        max_output_bytes가 주어지면 그 이상의 출력은 센티널을 찾는 데 필요한 꼬리만
+        남기고 버리므로, 출력이 큰 명령에서도 메모리 사용량이 제한됩니다.
+        """
+        output = bytearray()
+        search_from = 0
+        while True:
+            index = self._buffer.find(self._marker, search_from)
+            if index != -1:
+                code_start = index + len(self._marker)
+                code_end = self._buffer.find(b"\n", code_start)
+                if code_end != -1:
+                    self._keep_output(output, index, max_output_bytes)
+                    exit_code = int(self._buffer[code_start:code_end])
+                    del self._buffer[: code_end + 1]
+                    return bytes(output), exit_code
+                search_from = index
+            else:
+                search_from = max(0, len(self._buffer) - len(self._marker) + 1)
+                if max_output_bytes is not None and search_from:
+                    self._keep_output(output, search_from, max_output_bytes)
+                    del self._buffer[:search_from]
+                    search_from = 0
+            _, size = self._docker_socket.next_frame_header(self._sock)
+            if size < 0:
+                raise ConnectionError("셸 세션이 종료되었습니다")
+            if size:
+                self._buffer += self._docker_socket.read_exactly(self._sock, size)
+
+    def _keep_output(
+        self, output: bytearray, end: int, max_output_bytes: int | None
+    ) -> None:
+        """버퍼 앞쪽 end 바이트를 출력에 옮기되 max_output_bytes를 넘기지 않습니다."""
+        if max_output_bytes is not None:
+            end = min(end, max_output_bytes - len(output))
+        if end > 0:
+            output += self._buffer[:end]
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+
+
+class ShellSession:
+    """PersistentShell을 필요할 때 열고, 스레드 간에 안전하게 재사용하는 래퍼.
+
+    셸을 열 수 없거나 다른 스레드가 사용 중이면 run()이 None을 반환하므로,
+    호출자는 일회성 exec_run으로 폴백합니다.
+    """
+
+    def __init__(self, open_shell: Callable[[], PersistentShell]) -> None:
+        self._open_shell = open_shell
+        self._shell: PersistentShell | None = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _get_shell(self) -> PersistentShell | None:
+        if self._shell is None and not self._disabled:
+            try:
+                self._shell = self._open_shell()
+            except Exception:
+                self._disabled = True
+        return self._shell
+
+    def _close_shell(self) -> None:
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+
+    def run(
+        self, command: str, max_output_bytes: int | None = None
+    ) -> tuple[Any, int | None] | None:
+        """영구 셸 세션에서 명령을 실행하고 (출력, 종료 코드)를 반환합니다."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            shell = self._get_shell()
+            if shell is None:
+                return None
+            try:
+                shell.send(command)
+            except Exception:
+                self._close_shell()
+                return None
+            try:
+                return shell.receive(max_output_bytes)
+            except Exception as exc:
+                # 명령이 이미 전달되었으므로 재실행하지 않고 오류로 보고합니다.
+                self._close_shell()
+                return f"셸 세션이 비정상 종료되었습니다: {exc}", 1
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """열려 있는 셸을 닫습니다. 다음 run()에서 새로 엽니다."""
+        with self._lock:
+            self._close_shell()
+
+
+def exec_capped(
+    client: Any, container_id: str, command: str, workdir: str, max_output_bytes: int
+) -> tuple[bytes, int | None]:
+    """일회성 exec로 명령을 실행하고 출력을 스트리밍으로 읽되 상한에서 멈춥니다.
+
+    exec_run처럼 전체 출력을 모았다가 자르지 않고, 상한에 도달하면 스트림을 닫습니다.
+    이 경우 명령이 아직 끝나지 않았을 수 있어 종료 코드는 None일 수 있습니다.
+    """
+    exec_id = client.api.exec_create(
+        container_id, ["sh", "-c", command], workdir=workdir
+    )["Id"]
+    stream = client.api.exec_start(exec_id, stream=True)
+    output = bytearray()
+    try:
+        for chunk in stream:
+            output += chunk[: max_output_bytes - len(output)]
+            if len(output) >= max_output_bytes:
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return bytes(output), client.api.exec_inspect(exec_id).get("ExitCode")
+
+
+def is_stale_container_error(exc: Exception) -> bool:
+    """캐시된 컨테이너 핸들이 더 이상 유효하지 않음을 나타내는 오류인지 판별합니다.
+
+    get_archive의 "파일 없음"처럼 같은 NotFound라도 경로 문제는 재시도 대상이 아닙니다.
+    """
+    try:
+        from docker.errors import APIError
+    except ImportError:
+        return False
+    return isinstance(exc, APIError) and "no such container" in str(exc).lower()
+
+
+def is_missing_path_error(exc: Exception) -> bool:
+    """put_archive 대상 디렉토리가 컨테이너에 없음을 나타내는 오류인지 판별합니다.
+
+    Docker는 tar 안의 중간 디렉토리는 만들어 주지만 대상 디렉토리 자체가 없으면 404를
+    돌려줍니다.
+    """
+    try:
+        from docker.errors import NotFound
+    except ImportError:
+        return False
+    return isinstance(exc, NotFound) and not is_stale_container_error(exc)
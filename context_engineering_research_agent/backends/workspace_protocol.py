@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import posixpath
 
 WORKSPACE_ROOT = "/workspace"
@@ -9,16 +10,19 @@ META_DIR = "_meta"
 SHARED_DIR = "shared"
 
 
+@functools.lru_cache(maxsize=256)
 def _sanitize_segment(segment: str) -> str:
     return segment.strip().strip("/")
 
 
+@functools.lru_cache(maxsize=256)
 def get_subagent_dir(subagent_type: str) -> str:
     """SubAgent별 전용 작업 디렉토리를 반환합니다."""
     safe_segment = _sanitize_segment(subagent_type)
     return posixpath.join(WORKSPACE_ROOT, safe_segment)
 
 
+@functools.lru_cache(maxsize=256)
 def get_result_path(subagent_type: str) -> str:
     """SubAgent 결과 파일 경로를 반환합니다."""
     safe_segment = _sanitize_segment(subagent_type)
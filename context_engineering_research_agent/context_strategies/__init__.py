@@ -10,6 +10,7 @@ from context_engineering_research_agent.context_strategies.caching import (
     ContextCachingStrategy,
     OpenRouterSubProvider,
     ProviderType,
+    compute_prefix_cache_key,
     detect_openrouter_sub_provider,
     detect_provider,
     requires_cache_control_marker,
@@ -23,9 +24,11 @@ from context_engineering_research_agent.context_strategies.isolation import (
 )
 from context_engineering_research_agent.context_strategies.offloading import (
     ContextOffloadingStrategy,
+    compress_tool_output,
 )
 from context_engineering_research_agent.context_strategies.reduction import (
     ContextReductionStrategy,
+    tiktoken_token_counter,
 )
 from context_engineering_research_agent.context_strategies.retrieval import (
     ContextRetrievalStrategy,
@@ -42,6 +45,9 @@ __all__ = [
     "detect_provider",
     "detect_openrouter_sub_provider",
     "requires_cache_control_marker",
+    "compute_prefix_cache_key",
+    "compress_tool_output",
+    "tiktoken_token_counter",
     "CacheTelemetry",
     "PromptCachingTelemetryMiddleware",
 ]
@@ -21,10 +21,14 @@ OpenRouter는 기반 모델에 따라 다른 caching 방식 적용:
 DeepAgents의 AnthropicPromptCachingMiddleware와 함께 사용 권장.
 """
 
-from collections.abc import Awaitable, Callable
+import functools
+import hashlib
+import re
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
+from urllib.parse import urlsplit
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -63,66 +67,108 @@ class OpenRouterSubProvider(Enum):
     UNKNOWN = "unknown"
 
 
-PROVIDERS_REQUIRING_CACHE_CONTROL = {
-    ProviderType.ANTHROPIC,
-    OpenRouterSubProvider.ANTHROPIC,
-}
+PROVIDERS_REQUIRING_CACHE_CONTROL: frozenset[ProviderType | OpenRouterSubProvider] = (
+    frozenset({ProviderType.ANTHROPIC, OpenRouterSubProvider.ANTHROPIC})
+)
+
+PROVIDERS_WITH_AUTOMATIC_CACHING: frozenset[ProviderType | OpenRouterSubProvider] = (
+    frozenset(
+        {
+            ProviderType.OPENAI,
+            ProviderType.GEMINI,
+            ProviderType.GEMINI_3,
+            ProviderType.DEEPSEEK,
+            ProviderType.GROQ,
+            ProviderType.GROK,
+            OpenRouterSubProvider.OPENAI,
+            OpenRouterSubProvider.DEEPSEEK,
+            OpenRouterSubProvider.GROQ,
+            OpenRouterSubProvider.GROK,
+        }
+    )
+)
 
-PROVIDERS_WITH_AUTOMATIC_CACHING = {
-    ProviderType.OPENAI,
-    ProviderType.GEMINI,
-    ProviderType.GEMINI_3,
-    ProviderType.DEEPSEEK,
-    ProviderType.GROQ,
-    ProviderType.GROK,
-    OpenRouterSubProvider.OPENAI,
-    OpenRouterSubProvider.DEEPSEEK,
-    OpenRouterSubProvider.GROQ,
-    OpenRouterSubProvider.GROK,
+
+# 그룹 순서가 우선순위입니다. 전방탐색으로 겹치는 위치까지 모두 찾은 뒤
+# 그룹 번호가 가장 작은 매치를 고르므로 기존 if-체인과 같은 결과를 냅니다.
+_PROVIDER_FAMILY_PATTERN = re.compile(
+    r"(?=(?P<anthropic>anthropic)|(?P<openai>openai)|(?P<google>google)"
+    r"|(?P<gemini>gemini)|(?P<deepseek>deepseek)|(?P<groq>groq))"
+)
+_PROVIDER_FAMILY_GROUPS = {
+    "anthropic": ProviderType.ANTHROPIC,
+    "openai": ProviderType.OPENAI,
+    "google": ProviderType.GEMINI,
+    "gemini": ProviderType.GEMINI,
+    "deepseek": ProviderType.DEEPSEEK,
+    "groq": ProviderType.GROQ,
 }
 
 
+def _best_match(matches: Iterable[re.Match[str]]) -> re.Match[str] | None:
+    """한 번의 스캔에서 나온 매치 중 우선순위(그룹 번호)가 가장 높은 것을 고릅니다."""
+    return min(matches, key=lambda match: match.lastindex or 0, default=None)
+
+
+@functools.lru_cache(maxsize=64)
+def _provider_family(class_name: str, module_name: str) -> ProviderType:
+    """모델 클래스 이름/모듈만으로 판별되는 Provider 계열을 반환합니다.
+
+    OpenAI 계열은 base_url로 OpenRouter 여부를, Gemini 계열은 모델명으로 세대를
+    추가 판별해야 하므로 각각 OPENAI/GEMINI로 반환합니다.
+    """
+    text = f"{class_name}\n{module_name}".lower()
+    class_end = len(class_name)
+    match = _best_match(
+        match
+        for match in _PROVIDER_FAMILY_PATTERN.finditer(text)
+        # "gemini"는 클래스 이름에서만 인정합니다.
+        if match.lastgroup != "gemini" or match.start() < class_end
+    )
+    if match is None:
+        return ProviderType.UNKNOWN
+    return _PROVIDER_FAMILY_GROUPS[match.lastgroup or ""]
+
+
 def detect_provider(model: BaseChatModel | None) -> ProviderType:
     """모델 객체에서 Provider 유형을 감지합니다."""
     if model is None:
         return ProviderType.UNKNOWN
 
-    class_name = model.__class__.__name__.lower()
-    module_name = model.__class__.__module__.lower()
-
-    if "anthropic" in class_name or "anthropic" in module_name:
-        return ProviderType.ANTHROPIC
+    family = _provider_family(model.__class__.__name__, model.__class__.__module__)
 
-    if "openai" in class_name or "openai" in module_name:
-        base_url = _get_base_url(model)
-        if "openrouter" in base_url:
+    if family == ProviderType.OPENAI:
+        if "openrouter" in _get_base_url(model):
             return ProviderType.OPENROUTER
         return ProviderType.OPENAI
 
-    if "google" in class_name or "gemini" in class_name or "google" in module_name:
+    if family == ProviderType.GEMINI:
         model_name = _get_model_name(model)
         if "gemini-3" in model_name or "gemini/3" in model_name:
             return ProviderType.GEMINI_3
         return ProviderType.GEMINI
 
-    if "deepseek" in class_name or "deepseek" in module_name:
-        return ProviderType.DEEPSEEK
-
-    if "groq" in class_name or "groq" in module_name:
-        return ProviderType.GROQ
-
-    return ProviderType.UNKNOWN
+    return family
 
 
 def _get_base_url(model: BaseChatModel) -> str:
     for attr in ("openai_api_base", "base_url", "api_base"):
         if hasattr(model, attr):
             url = getattr(model, attr, "") or ""
-            if url:
+            if isinstance(url, str) and url:
                 return url.lower()
     return ""
 
 
+def _uses_openai_api(model: BaseChatModel | None) -> bool:
+    """OpenAI 공식 API로 요청하는지 확인합니다 (base_url이 없거나 api.openai.com).
+
+    OpenAI 호환 자체 호스팅 서버는 prompt_cache_key 같은 OpenAI 전용 필드를 모릅니다.
+    """
+    base_url = _get_base_url(model) if model is not None else ""
+    return not base_url or urlsplit(base_url).hostname == "api.openai.com"
+
+
 def _get_model_name(model: BaseChatModel) -> str:
     for attr in ("model_name", "model", "model_id"):
         if hasattr(model, attr):
@@ -132,31 +178,43 @@ def _get_model_name(model: BaseChatModel) -> str:
     return ""
 
 
+# 위와 같이 전방탐색으로 겹치는 키워드(예: "llamanthropic")도 모두 찾습니다.
+_OPENROUTER_SUB_PROVIDER_PATTERN = re.compile(
+    r"(?=(?P<anthropic>anthropic|claude)|(?P<openai>openai|gpt|^o1)"
+    r"|(?P<gemini>google|gemini)|(?P<deepseek>deepseek)|(?P<groq>groq|kimi)"
+    r"|(?P<grok>grok|xai)|(?P<meta_llama>meta|llama)|(?P<mistral>mistral))"
+)
+_OPENROUTER_SUB_PROVIDER_GROUPS = {
+    "anthropic": OpenRouterSubProvider.ANTHROPIC,
+    "openai": OpenRouterSubProvider.OPENAI,
+    "gemini": OpenRouterSubProvider.GEMINI,
+    "deepseek": OpenRouterSubProvider.DEEPSEEK,
+    "groq": OpenRouterSubProvider.GROQ,
+    "grok": OpenRouterSubProvider.GROK,
+    "meta_llama": OpenRouterSubProvider.META_LLAMA,
+    "mistral": OpenRouterSubProvider.MISTRAL,
+}
+
+
+@functools.lru_cache(maxsize=128)
 def detect_openrouter_sub_provider(model_name: str) -> OpenRouterSubProvider:
     """OpenRouter 모델명에서 기반 Provider를 감지합니다.
 
     OpenRouter 모델명 패턴: "provider/model-name" (예: "anthropic/claude-3-sonnet")
     """
-    name_lower = model_name.lower()
-
-    if "anthropic" in name_lower or "claude" in name_lower:
-        return OpenRouterSubProvider.ANTHROPIC
-    if "openai" in name_lower or "gpt" in name_lower or name_lower.startswith("o1"):
-        return OpenRouterSubProvider.OPENAI
-    if "google" in name_lower or "gemini" in name_lower:
-        return OpenRouterSubProvider.GEMINI
-    if "deepseek" in name_lower:
-        return OpenRouterSubProvider.DEEPSEEK
-    if "groq" in name_lower or "kimi" in name_lower:
-        return OpenRouterSubProvider.GROQ
-    if "grok" in name_lower or "xai" in name_lower:
-        return OpenRouterSubProvider.GROK
-    if "meta" in name_lower or "llama" in name_lower:
-        return OpenRouterSubProvider.META_LLAMA
-    if "mistral" in name_lower:
-        return OpenRouterSubProvider.MISTRAL
-
-    return OpenRouterSubProvider.UNKNOWN
+    match = _best_match(_OPENROUTER_SUB_PROVIDER_PATTERN.finditer(model_name.lower()))
+    if match is None:
+        return OpenRouterSubProvider.UNKNOWN
+    return _OPENROUTER_SUB_PROVIDER_GROUPS[match.lastgroup or ""]
+
+
+def compute_prefix_cache_key(prompt: str) -> str:
+    """프롬프트 prefix의 안정적인 캐시 키(SHA-256)를 계산합니다.
+
+    동일한 바이트열의 프롬프트는 프로세스/세션과 무관하게 같은 키를 가지므로
+    Provider 측 prefix 캐시 라우팅(OpenAI prompt_cache_key 등)에 사용할 수 있습니다.
+    """
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
 
 
 def requires_cache_control_marker(
@@ -166,15 +224,11 @@ def requires_cache_control_marker(
     """해당 Provider가 cache_control 마커를 필요로 하는지 확인합니다.
 
     Anthropic (직접 또는 OpenRouter 경유) 만 True 반환.
+    OpenRouter는 기반 모델(sub_provider) 기준으로 판단합니다.
     """
-    if provider == ProviderType.ANTHROPIC:
-        return True
-    if (
-        provider == ProviderType.OPENROUTER
-        and sub_provider == OpenRouterSubProvider.ANTHROPIC
-    ):
-        return True
-    return False
+    if provider is ProviderType.OPENROUTER:
+        return sub_provider in PROVIDERS_REQUIRING_CACHE_CONTROL
+    return provider in PROVIDERS_REQUIRING_CACHE_CONTROL
 
 
 @dataclass
@@ -194,9 +248,9 @@ class CachingConfig:
     enable_for_tools: bool = True
 
 
-@dataclass
+@dataclass(frozen=True)
 class CachingResult:
-    """Context Caching 결과.
+    """Context Caching 결과. 요청 간에 공유될 수 있으므로 불변입니다.
 
     Attributes:
         was_cached: 캐싱이 적용되었는지 여부
@@ -209,11 +263,23 @@ class CachingResult:
     estimated_tokens_cached: int = 0
 
 
+_PREFIX_CACHE_MAX_ENTRIES = 32
+
+_NOT_CACHED = CachingResult(was_cached=False)
+
+
 class ContextCachingStrategy(AgentMiddleware):
     """Multi-Provider Prompt Caching 전략.
 
     Anthropic (직접 또는 OpenRouter 경유)만 cache_control 마커를 적용하고,
     OpenAI/Gemini/DeepSeek/Groq/Grok은 자동 캐싱이므로 pass-through합니다.
+
+    cache_control이 적용된 시스템 메시지는 (모델명, 프롬프트) 키로 보관되어
+    요청 간에 동일한 바이트열로 재사용됩니다. OpenAI 공식 API에는 prefix_cache_key를
+    prompt_cache_key로 전달하여 동일 prefix가 같은 캐시로 라우팅되도록 합니다.
+
+    static_prefix가 주어지면 시스템 프롬프트를 정적 영역과 동적 꼬리로 나누고
+    정적 영역 끝에도 breakpoint를 두어, 꼬리가 바뀌어도 정적 영역은 캐시에 적중합니다.
     """
 
     def __init__(
@@ -221,12 +287,25 @@ class ContextCachingStrategy(AgentMiddleware):
         config: CachingConfig | None = None,
         model: BaseChatModel | None = None,
         openrouter_model_name: str | None = None,
+        prefix_cache_key: str | None = None,
+        static_prefix: str | None = None,
     ) -> None:
         self.config = config or CachingConfig()
         self._model = model
         self._provider: ProviderType | None = None
         self._sub_provider: OpenRouterSubProvider | None = None
         self._openrouter_model_name = openrouter_model_name
+        self._prefix_cache_key = prefix_cache_key
+        self._static_prefix = static_prefix
+        self._prefix_cache: dict[tuple[str, str], SystemMessage] = {}
+        # 자동 캐싱 Provider용 pass-through 결과. Provider가 바뀔 때만 다시 만듭니다.
+        self._noop_result: CachingResult | None = None
+        # Provider별로 고정되는 처리 경로. 첫 호출 때 정하고 set_model()에서 초기화합니다.
+        self._apply_messages: (
+            Callable[[list[BaseMessage]], tuple[list[BaseMessage], CachingResult]]
+            | None
+        ) = None
+        self._prepare_request: Callable[[ModelRequest], ModelRequest] | None = None
 
     def set_model(
         self,
@@ -237,6 +316,9 @@ class ContextCachingStrategy(AgentMiddleware):
         self._model = model
         self._provider = None
         self._sub_provider = None
+        self._noop_result = None
+        self._apply_messages = None
+        self._prepare_request = None
         if openrouter_model_name:
             self._openrouter_model_name = openrouter_model_name
 
@@ -273,19 +355,50 @@ class ContextCachingStrategy(AgentMiddleware):
                 "cache_control": {"type": self.config.cache_control_type},
             }
         elif isinstance(content, list):
-            if not content:
+            if not content or not isinstance(content[-1], dict):
                 return content
-            result = list(content)
-            last_item = result[-1]
-            if isinstance(last_item, dict):
-                result[-1] = {
-                    **last_item,
+            return [
+                *content[:-1],
+                {
+                    **content[-1],
                     "cache_control": {"type": self.config.cache_control_type},
-                }
-            return result
+                },
+            ]
         return content
 
+    def _split_static_prefix(self, content: Any) -> list[dict[str, Any]] | None:
+        """시스템 프롬프트를 정적 영역/동적 꼬리 두 블록으로 나눕니다.
+
+        정적 영역이 캐싱 최소 토큰 수에 못 미치거나 프롬프트가 정적 영역으로
+        시작하지 않으면 None을 반환합니다.
+        """
+        prefix = self._static_prefix
+        if (
+            not prefix
+            or not isinstance(content, str)
+            or len(content) <= len(prefix)
+            or not content.startswith(prefix)
+            or not self._should_cache(prefix)
+        ):
+            return None
+        cache_control = {"type": self.config.cache_control_type}
+        return [
+            {"type": "text", "text": prefix, "cache_control": cache_control},
+            {
+                "type": "text",
+                "text": content[len(prefix) :],
+                "cache_control": cache_control,
+            },
+        ]
+
     def _process_system_message(self, message: SystemMessage) -> SystemMessage:
+        if isinstance(message.content, list):
+            # 이미 블록 목록인 일반적인 경우: 문자열 분할/변환 단계를 건너뜁니다.
+            cached_blocks = self._add_cache_control(message.content)
+            return SystemMessage(content=cached_blocks)  # type: ignore[arg-type]
+        zoned_content = self._split_static_prefix(message.content)
+        if zoned_content is not None:
+            return SystemMessage(content=zoned_content)  # type: ignore[arg-type]
         cached_content = self._add_cache_control(message.content)
         # Ensure cached_content is a list of dicts for SystemMessage compatibility
         if isinstance(cached_content, str):
@@ -296,13 +409,25 @@ class ContextCachingStrategy(AgentMiddleware):
         return SystemMessage(content=cached_content)  # type: ignore[arg-type]
 
     def _estimate_tokens(self, content: Any) -> int:
+        """텍스트 길이 합계로 토큰 수를 추정합니다 (약 4자 = 1토큰).
+
+        중첩된 블록을 재귀 대신 스택으로 순회하고 나눗셈은 마지막에 한 번만 합니다.
+        """
         if isinstance(content, str):
             return len(content) // 4
-        elif isinstance(content, list):
-            return sum(self._estimate_tokens(item) for item in content)
-        elif isinstance(content, dict):
-            return self._estimate_tokens(content.get("text", ""))
-        return 0
+        total = 0
+        stack = [content]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                total += len(item)
+            elif isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                text = item.get("text")
+                if text:
+                    stack.append(text)
+        return total // 4
 
     def _should_cache(self, content: Any) -> bool:
         estimated_tokens = self._estimate_tokens(content)
@@ -327,49 +452,130 @@ class ContextCachingStrategy(AgentMiddleware):
         Returns:
             캐싱이 적용된 메시지 리스트와 캐싱 결과 튜플
         """
-        if model is not None:
+        if model is not None and (
+            model is not self._model
+            or (
+                openrouter_model_name
+                and openrouter_model_name != self._openrouter_model_name
+            )
+        ):
             self.set_model(model, openrouter_model_name)
 
         if not messages:
-            return messages, CachingResult(was_cached=False)
+            return messages, _NOT_CACHED
+        apply_messages = self._apply_messages or self._specialize()[0]
+        return apply_messages(messages)
 
-        if not self.should_apply_cache_markers:
+    def _specialize(
+        self,
+    ) -> tuple[
+        Callable[[list[BaseMessage]], tuple[list[BaseMessage], CachingResult]],
+        Callable[[ModelRequest], ModelRequest],
+    ]:
+        """현재 Provider에 맞는 메시지/요청 처리 경로를 한 번 골라 둡니다.
+
+        Provider는 set_model() 전까지 바뀌지 않으므로, 매 호출마다 Provider 판별과
+        분기를 반복하지 않고 고정된 메서드를 바로 호출합니다.
+        """
+        if self.should_apply_cache_markers:
+            self._apply_messages = self._apply_cache_markers
+            self._prepare_request = self._prepare_marked_request
+        else:
+            self._apply_messages = self._apply_passthrough
+            if (
+                self._prefix_cache_key
+                and self.provider == ProviderType.OPENAI
+                and _uses_openai_api(self._model)
+            ):
+                self._prepare_request = self._prepare_openai_request
+            else:
+                self._prepare_request = self._passthrough_request
+        return self._apply_messages, self._prepare_request
+
+    def _apply_passthrough(
+        self, messages: list[BaseMessage]
+    ) -> tuple[list[BaseMessage], CachingResult]:
+        return messages, self._get_noop_result()
+
+    def _apply_cache_markers(
+        self, messages: list[BaseMessage]
+    ) -> tuple[list[BaseMessage], CachingResult]:
+        if not self.config.enable_for_system_prompt:
+            return messages, _NOT_CACHED
+        for i, msg in enumerate(messages):
+            if isinstance(msg, SystemMessage):
+                estimated_tokens = self._estimate_tokens(msg.content)
+                if estimated_tokens >= self.config.min_cacheable_tokens:
+                    result_messages = list(messages)
+                    result_messages[i] = self._process_system_message(msg)
+                    return result_messages, CachingResult(
+                        was_cached=True,
+                        cached_content_type="system_prompt",
+                        estimated_tokens_cached=estimated_tokens,
+                    )
+        return list(messages), _NOT_CACHED
+
+    def _get_noop_result(self) -> CachingResult:
+        if self._noop_result is None:
             provider_info = self.provider.value
             if self.provider == ProviderType.OPENROUTER and self.sub_provider:
                 provider_info = f"openrouter/{self.sub_provider.value}"
-            return messages, CachingResult(
+            self._noop_result = CachingResult(
                 was_cached=False,
                 cached_content_type=f"auto_cached_by_{provider_info}",
             )
+        return self._noop_result
 
-        result_messages = list(messages)
-        cached = False
-        cached_type = None
-        tokens_cached = 0
+    def _get_cached_system_message(self, message: SystemMessage) -> SystemMessage:
+        """cache_control이 적용된 시스템 메시지를 prefix 캐시에서 조회합니다.
 
-        for i, msg in enumerate(result_messages):
-            if isinstance(msg, SystemMessage):
-                if self.config.enable_for_system_prompt and self._should_cache(
-                    msg.content
-                ):
-                    result_messages[i] = self._process_system_message(msg)
-                    cached = True
-                    cached_type = "system_prompt"
-                    tokens_cached = self._estimate_tokens(msg.content)
-                    break
-
-        return result_messages, CachingResult(
-            was_cached=cached,
-            cached_content_type=cached_type,
-            estimated_tokens_cached=tokens_cached,
+        같은 (모델명, 프롬프트)에 대해서는 항상 동일한 메시지 객체를 반환하여
+        요청마다 cache breakpoint가 같은 바이트열로 재전송되도록 합니다.
+        프롬프트 문자열을 그대로 키로 쓰므로 매 호출 해시를 다시 계산하지 않습니다
+        (str은 해시값을 객체에 캐시합니다).
+        """
+        model_name = _get_model_name(self._model) if self._model is not None else ""
+        key = (model_name, message.text)
+        cached = self._prefix_cache.get(key)
+        if cached is None:
+            if len(self._prefix_cache) >= _PREFIX_CACHE_MAX_ENTRIES:
+                self._prefix_cache.clear()
+            cached = self._process_system_message(message)
+            self._prefix_cache[key] = cached
+        return cached
+
+    def _apply_prefix_cache(self, request: ModelRequest) -> ModelRequest:
+        """요청의 시스템 프롬프트 prefix가 Provider 캐시에 적중하도록 준비합니다."""
+        prepare_request = self._prepare_request or self._specialize()[1]
+        return prepare_request(request)
+
+    def _prepare_marked_request(self, request: ModelRequest) -> ModelRequest:
+        message = request.system_message
+        if (
+            message is None
+            or not self.config.enable_for_system_prompt
+            or not self._should_cache(message.content)
+        ):
+            return request
+        return request.override(system_message=self._get_cached_system_message(message))
+
+    def _prepare_openai_request(self, request: ModelRequest) -> ModelRequest:
+        return request.override(
+            model_settings={
+                **request.model_settings,
+                "prompt_cache_key": self._prefix_cache_key,
+            }
         )
 
+    def _passthrough_request(self, request: ModelRequest) -> ModelRequest:
+        return request
+
     def wrap_model_call(
         self,
         request: ModelRequest,
         handler: Callable[[ModelRequest], ModelResponse],
     ) -> ModelResponse:
-        """동기 모델 호출을 래핑합니다 (기본 동작).
+        """동기 모델 호출을 래핑하여 시스템 프롬프트 prefix 캐싱을 적용합니다.
 
         Args:
             request: 모델 요청
@@ -378,14 +584,14 @@ class ContextCachingStrategy(AgentMiddleware):
         Returns:
             모델 응답
         """
-        return handler(request)
+        return handler(self._apply_prefix_cache(request))
 
     async def awrap_model_call(
         self,
         request: ModelRequest,
         handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
     ) -> ModelResponse:
-        """비동기 모델 호출을 래핑합니다 (기본 동작).
+        """비동기 모델 호출을 래핑하여 시스템 프롬프트 prefix 캐싱을 적용합니다.
 
         Args:
             request: 모델 요청
@@ -394,7 +600,7 @@ class ContextCachingStrategy(AgentMiddleware):
         Returns:
             모델 응답
         """
-        return await handler(request)
+        return await handler(self._apply_prefix_cache(request))
 
 
 CACHING_SYSTEM_PROMPT = """## Context Caching
@@ -11,9 +11,15 @@ Provider별 캐시 메타데이터 위치:
 - OpenRouter: 기반 모델의 메타데이터 형식 따름
 """
 
+import atexit
+import functools
 import logging
+import queue
+import re
+from collections import deque
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
 from langchain.agents.middleware.types import (
@@ -28,128 +34,193 @@ from context_engineering_research_agent.context_strategies.caching import (
 
 logger = logging.getLogger(__name__)
 
+_TELEMETRY_HISTORY_SIZE = 1024
 
-@dataclass
+
+class _DeferredQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 QueueHandler.
+
+    같은 프로세스 안에서만 소비하므로 직렬화 준비가 필요 없고,
+    메시지 포맷팅은 리스너 스레드의 핸들러가 수행합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _ParentForwardingHandler(logging.Handler):
+    """큐에서 꺼낸 레코드를 상위 로거의 핸들러들로 넘깁니다.
+
+    처리 시점에 상위 로거를 조회하므로 나중에 추가된 핸들러도 받습니다.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if logger.parent is not None:
+            logger.parent.handle(record)
+
+
+@functools.lru_cache(maxsize=1)
+def _start_background_logging() -> QueueListener:
+    """모듈 로거의 출력을 백그라운드 스레드로 옮깁니다 (프로세스당 한 번)."""
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, _ParentForwardingHandler())
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    logger.propagate = False
+    listener.start()
+    # 종료 시 큐에 남은 레코드를 모두 처리합니다.
+    atexit.register(listener.stop)
+    return listener
+
+
+@dataclass(slots=True)
 class CacheTelemetry:
-    """Provider별 캐시 사용량 데이터."""
+    """Provider별 캐시 사용량 데이터.
+
+    raw_metadata는 응답 메타데이터 전체를 붙잡아 두므로
+    include_raw_metadata=True로 추출할 때만 채워집니다.
+    """
 
     provider: ProviderType
     cache_read_tokens: int = 0
     cache_write_tokens: int = 0
     total_input_tokens: int = 0
     cache_hit_ratio: float = 0.0
-    raw_metadata: dict[str, Any] = field(default_factory=dict)
+    raw_metadata: dict[str, Any] | None = None
+
+
+def _make_telemetry(
+    provider: ProviderType,
+    cache_read: int,
+    cache_write: int,
+    input_tokens: int,
+    raw_metadata: dict[str, Any] | None,
+) -> CacheTelemetry:
+    """추출한 토큰 수로 CacheTelemetry를 만들고 적중률을 계산합니다."""
+    return CacheTelemetry(
+        provider=provider,
+        cache_read_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        total_input_tokens=input_tokens,
+        cache_hit_ratio=cache_read / input_tokens if input_tokens > 0 else 0.0,
+        raw_metadata=raw_metadata,
+    )
 
 
-def extract_anthropic_cache_metrics(response: ModelResponse) -> CacheTelemetry:
+def extract_anthropic_cache_metrics(
+    response: ModelResponse, *, include_raw_metadata: bool = False
+) -> CacheTelemetry:
     """Anthropic 응답에서 캐시 메트릭을 추출합니다."""
     usage = getattr(response, "usage_metadata", {}) or {}
     response_meta = getattr(response, "response_metadata", {}) or {}
     usage_from_meta = response_meta.get("usage", {})
 
-    cache_read = usage_from_meta.get("cache_read_input_tokens", 0)
-    cache_creation = usage_from_meta.get("cache_creation_input_tokens", 0)
     input_tokens = usage.get("input_tokens", 0) or usage_from_meta.get(
         "input_tokens", 0
     )
-
-    hit_ratio = cache_read / input_tokens if input_tokens > 0 else 0.0
-
-    return CacheTelemetry(
-        provider=ProviderType.ANTHROPIC,
-        cache_read_tokens=cache_read,
-        cache_write_tokens=cache_creation,
-        total_input_tokens=input_tokens,
-        cache_hit_ratio=hit_ratio,
-        raw_metadata={"usage": usage, "response_metadata": response_meta},
+    return _make_telemetry(
+        ProviderType.ANTHROPIC,
+        usage_from_meta.get("cache_read_input_tokens", 0),
+        usage_from_meta.get("cache_creation_input_tokens", 0),
+        input_tokens,
+        {"usage": usage, "response_metadata": response_meta}
+        if include_raw_metadata
+        else None,
     )
 
 
-def extract_openai_cache_metrics(response: ModelResponse) -> CacheTelemetry:
+def extract_openai_cache_metrics(
+    response: ModelResponse, *, include_raw_metadata: bool = False
+) -> CacheTelemetry:
     """OpenAI 응답에서 캐시 메트릭을 추출합니다."""
     usage = getattr(response, "usage_metadata", {}) or {}
     response_meta = getattr(response, "response_metadata", {}) or {}
 
     token_usage = response_meta.get("token_usage", {})
     prompt_details = token_usage.get("prompt_tokens_details", {})
-    cached_tokens = prompt_details.get("cached_tokens", 0)
     input_tokens = usage.get("input_tokens", 0) or token_usage.get("prompt_tokens", 0)
-
-    hit_ratio = cached_tokens / input_tokens if input_tokens > 0 else 0.0
-
-    return CacheTelemetry(
-        provider=ProviderType.OPENAI,
-        cache_read_tokens=cached_tokens,
-        cache_write_tokens=0,
-        total_input_tokens=input_tokens,
-        cache_hit_ratio=hit_ratio,
-        raw_metadata={"usage": usage, "token_usage": token_usage},
+    return _make_telemetry(
+        ProviderType.OPENAI,
+        prompt_details.get("cached_tokens", 0),
+        0,
+        input_tokens,
+        {"usage": usage, "token_usage": token_usage} if include_raw_metadata else None,
     )
 
 
 def extract_gemini_cache_metrics(
-    response: ModelResponse, provider: ProviderType = ProviderType.GEMINI
+    response: ModelResponse,
+    *,
+    provider: ProviderType = ProviderType.GEMINI,
+    include_raw_metadata: bool = False,
 ) -> CacheTelemetry:
     """Gemini 2.5/3 응답에서 캐시 메트릭을 추출합니다."""
     usage = getattr(response, "usage_metadata", {}) or {}
     response_meta = getattr(response, "response_metadata", {}) or {}
 
-    cached_tokens = response_meta.get("cached_content_token_count", 0)
     input_tokens = usage.get("input_tokens", 0) or response_meta.get(
         "prompt_token_count", 0
     )
-
-    hit_ratio = cached_tokens / input_tokens if input_tokens > 0 else 0.0
-
-    return CacheTelemetry(
-        provider=provider,
-        cache_read_tokens=cached_tokens,
-        cache_write_tokens=0,
-        total_input_tokens=input_tokens,
-        cache_hit_ratio=hit_ratio,
-        raw_metadata={"usage": usage, "response_metadata": response_meta},
+    return _make_telemetry(
+        provider,
+        response_meta.get("cached_content_token_count", 0),
+        0,
+        input_tokens,
+        {"usage": usage, "response_metadata": response_meta}
+        if include_raw_metadata
+        else None,
     )
 
 
-def extract_deepseek_cache_metrics(response: ModelResponse) -> CacheTelemetry:
+def extract_deepseek_cache_metrics(
+    response: ModelResponse, *, include_raw_metadata: bool = False
+) -> CacheTelemetry:
     """DeepSeek 응답에서 캐시 메트릭을 추출합니다."""
     usage = getattr(response, "usage_metadata", {}) or {}
     response_meta = getattr(response, "response_metadata", {}) or {}
 
     cache_hit = response_meta.get("cache_hit_tokens", 0)
     cache_miss = response_meta.get("cache_miss_tokens", 0)
-    input_tokens = usage.get("input_tokens", 0) or (cache_hit + cache_miss)
+    return _make_telemetry(
+        ProviderType.DEEPSEEK,
+        cache_hit,
+        cache_miss,
+        usage.get("input_tokens", 0) or (cache_hit + cache_miss),
+        {"usage": usage, "response_metadata": response_meta}
+        if include_raw_metadata
+        else None,
+    )
 
-    hit_ratio = cache_hit / input_tokens if input_tokens > 0 else 0.0
 
-    return CacheTelemetry(
-        provider=ProviderType.DEEPSEEK,
-        cache_read_tokens=cache_hit,
-        cache_write_tokens=cache_miss,
-        total_input_tokens=input_tokens,
-        cache_hit_ratio=hit_ratio,
-        raw_metadata={"usage": usage, "response_metadata": response_meta},
-    )
+extract_gemini3_cache_metrics = functools.partial(
+    extract_gemini_cache_metrics, provider=ProviderType.GEMINI_3
+)
+
+# 응답마다 dict/클로저를 새로 만들지 않도록 모듈 로드 시 한 번만 구성합니다.
+_EXTRACTORS: dict[ProviderType, Callable[..., CacheTelemetry]] = {
+    ProviderType.ANTHROPIC: extract_anthropic_cache_metrics,
+    ProviderType.OPENAI: extract_openai_cache_metrics,
+    ProviderType.GEMINI: extract_gemini_cache_metrics,
+    ProviderType.GEMINI_3: extract_gemini3_cache_metrics,
+    ProviderType.DEEPSEEK: extract_deepseek_cache_metrics,
+}
 
 
 def extract_cache_telemetry(
-    response: ModelResponse, provider: ProviderType
+    response: ModelResponse,
+    provider: ProviderType,
+    *,
+    include_raw_metadata: bool = False,
 ) -> CacheTelemetry:
-    """응답에서 Provider별 캐시 텔레메트리를 추출합니다."""
-    extractors: dict[ProviderType, Callable[[ModelResponse], CacheTelemetry]] = {
-        ProviderType.ANTHROPIC: extract_anthropic_cache_metrics,
-        ProviderType.OPENAI: extract_openai_cache_metrics,
-        ProviderType.GEMINI: extract_gemini_cache_metrics,
-        ProviderType.GEMINI_3: lambda r: extract_gemini_cache_metrics(
-            r, ProviderType.GEMINI_3
-        ),
-        ProviderType.DEEPSEEK: extract_deepseek_cache_metrics,
-    }
-
-    extractor = extractors.get(provider)
+    """응답에서 Provider별 캐시 텔레메트리를 추출합니다.
+
+    include_raw_metadata가 True일 때만 원본 메타데이터를 보관합니다.
+    """
+    extractor = _EXTRACTORS.get(provider)
     if extractor:
-        return extractor(response)
+        return extractor(response, include_raw_metadata=include_raw_metadata)
 
+    if not include_raw_metadata:
+        return CacheTelemetry(provider=provider)
     return CacheTelemetry(
         provider=provider,
         raw_metadata={
@@ -159,74 +230,183 @@ def extract_cache_telemetry(
     )
 
 
+# 그룹 순서가 우선순위입니다. 전방탐색으로 겹치는 위치까지 모두 찾은 뒤
+# 그룹 번호가 가장 작은 매치를 고르므로 기존 if-체인과 같은 결과를 냅니다.
+_MODEL_PROVIDER_PATTERN = re.compile(
+    r"(?=(?P<anthropic>claude|anthropic)|(?P<openai>gpt|o1|o3)"
+    r"|(?P<gemini_3>gemini-3|gemini/3)|(?P<gemini>gemini)|(?P<deepseek>deepseek)"
+    r"|(?P<groq>groq|kimi)|(?P<grok>grok))"
+)
+_MODEL_PROVIDER_GROUPS = {
+    "anthropic": ProviderType.ANTHROPIC,
+    "openai": ProviderType.OPENAI,
+    "gemini_3": ProviderType.GEMINI_3,
+    "gemini": ProviderType.GEMINI,
+    "deepseek": ProviderType.DEEPSEEK,
+    "groq": ProviderType.GROQ,
+    "grok": ProviderType.GROK,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _detect_provider(model_lower: str) -> ProviderType:
+    """소문자 모델명으로 Provider를 판별합니다.
+
+    한 에이전트가 쓰는 모델명은 몇 개뿐이므로 결과를 캐싱합니다.
+    """
+    match = min(
+        _MODEL_PROVIDER_PATTERN.finditer(model_lower),
+        key=lambda match: match.lastindex or 0,
+        default=None,
+    )
+    if match is None:
+        return ProviderType.UNKNOWN
+    return _MODEL_PROVIDER_GROUPS[match.lastgroup or ""]
+
+
 class PromptCachingTelemetryMiddleware(AgentMiddleware):
     """모든 Provider의 캐시 사용량을 모니터링하는 Middleware.
 
     요청을 변형하지 않고, 응답의 cache 관련 메타데이터만 수집/로깅합니다.
+
+    Args:
+        log_level: 캐시 사용량 로그 레벨
+        include_raw_metadata: True면 응답 원본 메타데이터를 텔레메트리에 보관
+        background_logging: True면 로그 핸들러 I/O를 백그라운드 스레드에서 처리
+            (모듈 로거 전체에 적용되며 되돌릴 수 없음)
+        retain_history: False면 히스토리/누적 합계를 남기지 않고 로그만 남김.
+            로그 레벨까지 꺼져 있으면 응답을 전혀 검사하지 않습니다.
     """
 
-    def __init__(self, log_level: int = logging.DEBUG) -> None:
+    def __init__(
+        self,
+        log_level: int = logging.DEBUG,
+        include_raw_metadata: bool = False,
+        background_logging: bool = False,
+        retain_history: bool = True,
+    ) -> None:
         self._log_level = log_level
-        self._telemetry_history: list[CacheTelemetry] = []
+        self._include_raw_metadata = include_raw_metadata
+        self._retain_history = retain_history
+        if background_logging:
+            _start_background_logging()
+        # 최근 텔레메트리만 보관하고, 합계는 누적 카운터로 유지합니다.
+        self._telemetry_history: deque[CacheTelemetry] = deque(
+            maxlen=_TELEMETRY_HISTORY_SIZE
+        )
+        self._totals = {"calls": 0, "read": 0, "write": 0, "input": 0}
 
     @property
-    def telemetry_history(self) -> list[CacheTelemetry]:
+    def telemetry_history(self) -> deque[CacheTelemetry]:
+        """최근 텔레메트리 (최대 _TELEMETRY_HISTORY_SIZE개).
+
+        다른 스레드에서 응답이 기록되는 중에 순회하려면 telemetry_snapshot()을
+        사용하세요. deque는 순회 중 변경되면 RuntimeError를 냅니다.
+        """
         return self._telemetry_history
 
+    def telemetry_snapshot(self) -> tuple[CacheTelemetry, ...]:
+        """현재 보관 중인 텔레메트리의 불변 복사본을 반환합니다."""
+        # deque 복사는 C 레벨에서 한 번에 끝나므로 동시 append와 섞이지 않습니다.
+        return tuple(self._telemetry_history)
+
     def get_aggregate_stats(self) -> dict[str, Any]:
-        if not self._telemetry_history:
+        totals = self._totals
+        if not totals["calls"]:
             return {"total_calls": 0, "total_cache_read_tokens": 0}
 
-        total_read = sum(t.cache_read_tokens for t in self._telemetry_history)
-        total_write = sum(t.cache_write_tokens for t in self._telemetry_history)
-        total_input = sum(t.total_input_tokens for t in self._telemetry_history)
+        return {
+            "total_calls": totals["calls"],
+            "total_cache_read_tokens": totals["read"],
+            "total_cache_write_tokens": totals["write"],
+            "total_input_tokens": totals["input"],
+            "overall_cache_hit_ratio": (
+                totals["read"] / totals["input"] if totals["input"] else 0.0
+            ),
+        }
+
+    def telemetry_columns(self) -> dict[str, list[Any]]:
+        """보관 중인 텔레메트리를 열(column) 단위 dict로 반환합니다.
 
+        pyarrow.Table.from_pydict나 pandas.DataFrame에 그대로 넘길 수 있습니다.
+        """
+        return self._columns(self.telemetry_snapshot())
+
+    @staticmethod
+    def _columns(history: tuple[CacheTelemetry, ...]) -> dict[str, list[Any]]:
         return {
-            "total_calls": len(self._telemetry_history),
-            "total_cache_read_tokens": total_read,
-            "total_cache_write_tokens": total_write,
-            "total_input_tokens": total_input,
-            "overall_cache_hit_ratio": total_read / total_input if total_input else 0.0,
+            "provider": [t.provider.value for t in history],
+            "cache_read_tokens": [t.cache_read_tokens for t in history],
+            "cache_write_tokens": [t.cache_write_tokens for t in history],
+            "total_input_tokens": [t.total_input_tokens for t in history],
+            "cache_hit_ratio": [t.cache_hit_ratio for t in history],
         }
 
+    def flush_to_parquet(self, path: str) -> int:
+        """보관 중인 텔레메트리를 zstd 압축 Parquet 파일로 쓰고 비웁니다.
+
+        누적 합계(get_aggregate_stats)는 유지됩니다.
+
+        Returns:
+            기록한 행 수
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError(
+                "pyarrow 패키지가 설치되지 않았습니다: pip install pyarrow"
+            ) from exc
+
+        # 스냅샷을 쓰고, 성공했을 때만 쓴 항목을 앞에서부터 제거합니다. 쓰는 동안
+        # 기록된 새 항목은 뒤에 붙으므로 그대로 남고, 실패하면 아무것도 지우지
+        # 않습니다. 그 사이 maxlen을 넘겨 이미 밀려난 항목은 건너뜁니다.
+        history = self._telemetry_history
+        snapshot = tuple(history)
+        table = pa.Table.from_pydict(self._columns(snapshot))
+        pq.write_table(table, path, compression="zstd")
+        for telemetry in snapshot:
+            if history and history[0] is telemetry:
+                history.popleft()
+        return len(snapshot)
+
+    def _record(self, telemetry: CacheTelemetry) -> None:
+        totals = self._totals
+        totals["calls"] += 1
+        totals["read"] += telemetry.cache_read_tokens
+        totals["write"] += telemetry.cache_write_tokens
+        totals["input"] += telemetry.total_input_tokens
+        self._telemetry_history.append(telemetry)
+
     def _log_telemetry(self, telemetry: CacheTelemetry) -> None:
+        # 로그가 버려질 때는 포맷팅 비용을 치르지 않도록 레벨부터 확인합니다.
+        if not logger.isEnabledFor(self._log_level):
+            return
         if telemetry.cache_read_tokens > 0 or telemetry.cache_write_tokens > 0:
             logger.log(
                 self._log_level,
-                f"[CacheTelemetry] {telemetry.provider.value}: "
-                f"read={telemetry.cache_read_tokens}, "
-                f"write={telemetry.cache_write_tokens}, "
-                f"hit_ratio={telemetry.cache_hit_ratio:.2%}",
+                "[CacheTelemetry] %s: read=%d, write=%d, hit_ratio=%.2f%%",
+                telemetry.provider.value,
+                telemetry.cache_read_tokens,
+                telemetry.cache_write_tokens,
+                telemetry.cache_hit_ratio * 100,
             )
 
     def _process_response(self, response: ModelResponse) -> ModelResponse:
+        # 남길 곳이 없으면 추출 자체를 건너뜁니다. isEnabledFor는 logging이
+        # 캐싱하므로 저렴하고, 로그 설정이 바뀌면 바로 반영됩니다.
+        if not self._retain_history and not logger.isEnabledFor(self._log_level):
+            return response
         model = getattr(response, "response_metadata", {}).get("model", "")
-        provider = self._detect_provider_from_response(response, model)
-        telemetry = extract_cache_telemetry(response, provider)
-        self._telemetry_history.append(telemetry)
+        provider = _detect_provider(model.lower())
+        telemetry = extract_cache_telemetry(
+            response, provider, include_raw_metadata=self._include_raw_metadata
+        )
+        if self._retain_history:
+            self._record(telemetry)
         self._log_telemetry(telemetry)
         return response
 
-    def _detect_provider_from_response(
-        self, response: ModelResponse, model_name: str
-    ) -> ProviderType:
-        model_lower = model_name.lower()
-        if "claude" in model_lower or "anthropic" in model_lower:
-            return ProviderType.ANTHROPIC
-        if "gpt" in model_lower or "o1" in model_lower or "o3" in model_lower:
-            return ProviderType.OPENAI
-        if "gemini-3" in model_lower or "gemini/3" in model_lower:
-            return ProviderType.GEMINI_3
-        if "gemini" in model_lower:
-            return ProviderType.GEMINI
-        if "deepseek" in model_lower:
-            return ProviderType.DEEPSEEK
-        if "groq" in model_lower or "kimi" in model_lower:
-            return ProviderType.GROQ
-        if "grok" in model_lower:
-            return ProviderType.GROK
-        return ProviderType.UNKNOWN
-
     def wrap_model_call(
         self,
         request: ModelRequest,
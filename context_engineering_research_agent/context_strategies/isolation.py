@@ -38,14 +38,14 @@ class CompiledSubAgentSpec(TypedDict):
     runnable: Runnable
 
 
-@dataclass
+@dataclass(slots=True)
 class IsolationConfig:
     default_model: str | BaseChatModel = "gpt-4.1"
     include_general_purpose_agent: bool = True
     excluded_state_keys: tuple[str, ...] = ("messages", "todos", "structured_response")
 
 
-@dataclass
+@dataclass(slots=True)
 class IsolationResult:
     subagent_name: str
     was_successful: bool
@@ -69,9 +69,12 @@ class ContextIsolationStrategy(AgentMiddleware):
         agent_factory: Callable[..., Runnable] | None = None,
     ) -> None:
         self.config = config or IsolationConfig()
+        # 결과 state 병합 시 키마다 멤버십을 확인하므로 해시 집합으로 둡니다.
+        self._excluded_state_keys = frozenset(self.config.excluded_state_keys)
         self._subagents = subagents or []
         self._agent_factory = agent_factory
         self._compiled_agents: dict[str, Runnable] = {}
+        self._subagent_descriptions = self._get_subagent_descriptions()
         self.tools = [self._create_task_tool()]
 
     def _compile_subagents(self) -> dict[str, Runnable]:
@@ -97,17 +100,17 @@ class ContextIsolationStrategy(AgentMiddleware):
         return agents
 
     def _get_subagent_descriptions(self) -> str:
-        descriptions = []
-        for spec in self._subagents:
-            descriptions.append(f"- {spec['name']}: {spec['description']}")
-        return "\n".join(descriptions)
+        return "\n".join(
+            f"- {spec['name']}: {spec['description']}" for spec in self._subagents
+        )
 
     def _prepare_subagent_state(
         self, state: dict[str, Any], task_description: str
     ) -> dict[str, Any]:
-        filtered = {
-            k: v for k, v in state.items() if k not in self.config.excluded_state_keys
-        }
+        # 제외 키는 몇 개뿐이므로 얕은 복사 후 해당 키만 지웁니다.
+        filtered = dict(state)
+        for key in self._excluded_state_keys:
+            filtered.pop(key, None)
         filtered["messages"] = [HumanMessage(content=task_description)]
         return filtered
 
@@ -119,7 +122,8 @@ class ContextIsolationStrategy(AgentMiddleware):
             subagent_type: str,
             runtime: ToolRuntime,
         ) -> str | Command:
-            agents = strategy._compile_subagents()
+            # 첫 호출 이후에는 메서드 호출 없이 컴파일된 dict를 바로 씁니다.
+            agents = strategy._compiled_agents or strategy._compile_subagents()
 
             if subagent_type not in agents:
                 allowed = ", ".join(f"`{k}`" for k in agents)
@@ -137,7 +141,7 @@ class ContextIsolationStrategy(AgentMiddleware):
             state_update = {
                 k: v
                 for k, v in result.items()
-                if k not in strategy.config.excluded_state_keys
+                if k not in strategy._excluded_state_keys
             }
 
             return Command(
@@ -154,7 +158,7 @@ class ContextIsolationStrategy(AgentMiddleware):
             subagent_type: str,
             runtime: ToolRuntime,
         ) -> str | Command:
-            agents = strategy._compile_subagents()
+            agents = strategy._compiled_agents or strategy._compile_subagents()
 
             if subagent_type not in agents:
                 allowed = ", ".join(f"`{k}`" for k in agents)
@@ -172,7 +176,7 @@ class ContextIsolationStrategy(AgentMiddleware):
             state_update = {
                 k: v
                 for k, v in result.items()
-                if k not in strategy.config.excluded_state_keys
+                if k not in strategy._excluded_state_keys
             }
 
             return Command(
@@ -184,7 +188,7 @@ class ContextIsolationStrategy(AgentMiddleware):
                 }
             )
 
-        subagent_list = self._get_subagent_descriptions()
+        subagent_list = self._subagent_descriptions
 
         return StructuredTool.from_function(
             name="task",
@@ -18,6 +18,10 @@ FilesystemMiddleware의 `_intercept_large_tool_result` 메서드에서 구현:
 - `/large_tool_results/{tool_call_id}` 경로에 저장
 - 처음 10줄 미리보기 제공
 
+이 구현은 기본적으로 원본을 그대로 저장합니다. `compressor`에 규칙 기반 압축
+(`compress_tool_output`) 등을 지정하면 저장 전에 적용하고, 압축된 경우 원본 크기를
+`{path}.meta.json` 사이드카에 기록합니다.
+
 ## 장점
 
 - 컨텍스트 윈도우 절약
@@ -35,9 +39,13 @@ middleware = FilesystemMiddleware(
 ```
 """
 
-from collections.abc import Awaitable, Callable
+import asyncio
+import itertools
+import json
+import re
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, NamedTuple
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -47,8 +55,77 @@ from langchain.tools.tool_node import ToolCallRequest
 from langchain_core.messages import ToolMessage
 from langgraph.types import Command
 
+_ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+
+# str.splitlines()와 같은 줄 경계. 마지막 줄은 종결 문자가 없을 수 있습니다.
+_LINE_PATTERN = re.compile(
+    r"([^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]*)"
+    r"(?:\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029])"
+    r"|([^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]+)"
+)
+
+
+def _iter_lines(content: str) -> Iterator[str]:
+    """content.splitlines()와 같은 줄을 필요한 만큼만 차례로 만듭니다."""
+    for match in _LINE_PATTERN.finditer(content):
+        line = match.group(1)
+        yield match.group(2) if line is None else line
+
+
+def _part_text(part: Any) -> str:
+    """메시지 content 리스트의 한 요소에서 텍스트를 꺼냅니다."""
+    if isinstance(part, dict):
+        text = part.get("text", "")
+        return text if isinstance(text, str) else str(text)
+    return str(part)
+
+
+# ASCII tool_call_id를 C 레벨 str.translate 한 번으로 정리하기 위한 변환표
+_SAFE_FILENAME_TABLE = {
+    i: chr(i) if chr(i).isalnum() or chr(i) in "-_" else "_" for i in range(128)
+}
+
+
+def compress_tool_output(content: str) -> str:
+    """축출할 도구 결과를 학습 없이 규칙 기반으로 압축합니다.
 
-@dataclass
+    - ANSI 이스케이프 시퀀스와 줄 끝 공백 제거
+    - 연속된 빈 줄을 하나로 축소
+    - 연속으로 반복되는 동일한 줄을 한 줄 + 반복 횟수로 축약 (로그 노이즈 필터)
+    - 전체가 JSON이면 공백 없는 형태로 재직렬화
+
+    줄 앞 들여쓰기는 보존하므로 코드/표 형태의 출력도 의미가 유지됩니다.
+    """
+    stripped = content.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            parsed = json.loads(stripped)
+        except ValueError:
+            pass
+        else:
+            return json.dumps(parsed, ensure_ascii=False, separators=(",", ":"))
+
+    text = _ANSI_ESCAPE_PATTERN.sub("", content)
+    compressed: list[str] = []
+    previous: str | None = None
+    repeats = 0
+    for line in text.splitlines():
+        line = line.rstrip()
+        if line == previous:
+            if line:
+                repeats += 1
+            continue
+        if repeats:
+            compressed.append(f"[이전 줄 {repeats}회 반복]")
+            repeats = 0
+        compressed.append(line)
+        previous = line
+    if repeats:
+        compressed.append(f"[이전 줄 {repeats}회 반복]")
+    return "\n".join(compressed)
+
+
+@dataclass(slots=True)
 class OffloadingConfig:
     """Context Offloading 설정."""
 
@@ -64,8 +141,18 @@ class OffloadingConfig:
     chars_per_token: int = 4
     """토큰당 문자 수 근사값 (보수적 추정)."""
 
+    compressor: Callable[[str], str] | None = None
+    """축출 전 콘텐츠 압축 함수. None(기본값)이면 원본 그대로 저장.
+
+    compress_tool_output은 손실 압축이므로 read_file로 원본을 다시 읽을 필요가
+    없을 때만 지정하세요.
+    """
+
+    metadata_suffix: str = ".meta.json"
+    """압축 시 원본 크기 등을 기록하는 사이드카 파일 접미사."""
 
-@dataclass
+
+@dataclass(slots=True)
 class OffloadingResult:
     """Offloading 처리 결과."""
 
@@ -81,6 +168,17 @@ class OffloadingResult:
     preview: str | None = None
     """축출 시 제공되는 미리보기."""
 
+    stored_size: int | None = None
+    """파일에 저장된 (압축 후) 콘텐츠 크기 (문자 수)."""
+
+
+class _OffloadPlan(NamedTuple):
+    """축출 시 백엔드에 쓸 내용."""
+
+    file_path: str
+    stored: str
+    metadata: str | None
+
 
 class ContextOffloadingStrategy(AgentMiddleware):
     """Context Offloading 전략 구현.
@@ -112,6 +210,20 @@ class ContextOffloadingStrategy(AgentMiddleware):
     ) -> None:
         self.config = config or OffloadingConfig()
         self._backend_factory = backend_factory
+        # len(content) // chars_per_token > token_limit 과 같은 문자 수 임계값.
+        # 호출마다 나눗셈 없이 길이 비교 한 번으로 판단합니다.
+        self._char_threshold = (
+            self.config.token_limit_before_evict + 1
+        ) * self.config.chars_per_token - 1
+        # 대체 메시지에서 호출마다 달라지는 부분은 경로와 미리보기뿐입니다.
+        self._offload_template = (
+            "도구 결과가 너무 커서 파일시스템에 저장되었습니다.\n\n"
+            "경로: {path}\n\n"
+            "read_file 도구로 결과를 읽을 수 있습니다.\n"
+            "대용량 결과의 경우 offset과 limit 파라미터로 부분 읽기를 권장합니다.\n\n"
+            f"처음 {self.config.preview_lines}줄 미리보기:\n"
+            "{preview}\n"
+        )
 
     def _estimate_tokens(self, content: str) -> int:
         """콘텐츠의 토큰 수를 추정합니다.
@@ -123,83 +235,102 @@ class ContextOffloadingStrategy(AgentMiddleware):
 
     def _should_offload(self, content: str) -> bool:
         """주어진 콘텐츠가 축출 대상인지 판단합니다."""
-        estimated_tokens = self._estimate_tokens(content)
-        return estimated_tokens > self.config.token_limit_before_evict
+        return len(content) > self._char_threshold
 
     def _create_preview(self, content: str) -> str:
         """축출될 콘텐츠의 미리보기를 생성합니다."""
-        lines = content.splitlines()[: self.config.preview_lines]
-        truncated_lines = [line[:1000] for line in lines]
-        return "\n".join(f"{i + 1:5}\t{line}" for i, line in enumerate(truncated_lines))
+        # 전체 줄 목록을 만들지 않고 앞부분만 읽습니다.
+        lines = itertools.islice(_iter_lines(content), self.config.preview_lines)
+        return "\n".join(
+            f"{number:5d}\t{line[:1000]}" for number, line in enumerate(lines, start=1)
+        )
 
     def _create_offload_message(
         self, tool_call_id: str, file_path: str, preview: str
     ) -> str:
         """축출 후 대체 메시지를 생성합니다."""
-        return f"""도구 결과가 너무 커서 파일시스템에 저장되었습니다.
-
-경로: {file_path}
-
-read_file 도구로 결과를 읽을 수 있습니다.
-대용량 결과의 경우 offset과 limit 파라미터로 부분 읽기를 권장합니다.
-
-처음 {self.config.preview_lines}줄 미리보기:
-{preview}
-"""
-
-    def process_tool_result(
-        self,
-        tool_result: ToolMessage,
-        runtime: ToolRuntime,
-    ) -> tuple[ToolMessage | Command, OffloadingResult]:
-        """도구 결과를 처리하고 필요시 축출합니다.
-
-        Args:
-            tool_result: 원본 도구 실행 결과.
-            runtime: 도구 런타임 컨텍스트.
-
-        Returns:
-            처리된 메시지와 Offloading 결과 튜플.
-        """
-        content = (
-            tool_result.content
-            if isinstance(tool_result.content, str)
-            else str(tool_result.content)
-        )
+        return self._offload_template.format(path=file_path, preview=preview)
+
+    def _prepare_offload(
+        self, tool_result: ToolMessage
+    ) -> tuple[OffloadingResult, _OffloadPlan | None]:
+        """축출 여부를 판단하고, 축출할 경우 저장할 내용을 준비합니다."""
+        raw_content = tool_result.content
+        if isinstance(raw_content, str):
+            content: str | None = raw_content
+            size = len(raw_content)
+        elif isinstance(raw_content, list):
+            # 리스트 content는 repr 대신 텍스트 파트만 "\n"으로 이어 저장합니다.
+            # 축출이 결정되기 전에는 이어 붙이지 않고 길이만 셉니다.
+            content = None
+            size = sum(len(_part_text(part)) for part in raw_content)
+            size += max(len(raw_content) - 1, 0)
+        else:
+            content = str(raw_content)
+            size = len(content)
 
         result = OffloadingResult(
             was_offloaded=False,
-            original_size=len(content),
+            original_size=size,
         )
 
-        if not self._should_offload(content):
-            return tool_result, result
-
-        if self._backend_factory is None:
-            return tool_result, result
+        if size <= self._char_threshold or self._backend_factory is None:
+            return result, None
 
-        backend = self._backend_factory(runtime)
+        if content is None:
+            content = "\n".join(_part_text(part) for part in raw_content)
 
         sanitized_id = self._sanitize_tool_call_id(tool_result.tool_call_id)
         file_path = f"{self.config.eviction_path_prefix}/{sanitized_id}"
-
-        write_result = backend.write(file_path, content)
+        stored = self.config.compressor(content) if self.config.compressor else content
+
+        metadata = None
+        if stored != content:
+            metadata = json.dumps(
+                {
+                    "tool_call_id": tool_result.tool_call_id,
+                    "original_size": len(content),
+                    "stored_size": len(stored),
+                    "compressed": True,
+                },
+                ensure_ascii=False,
+            )
+        return result, _OffloadPlan(file_path, stored, metadata)
+
+    def _finish_offload(
+        self,
+        tool_result: ToolMessage,
+        result: OffloadingResult,
+        plan: _OffloadPlan,
+        write_result: Any,
+        meta_result: Any | None,
+    ) -> tuple[ToolMessage | Command, OffloadingResult]:
+        """저장 결과를 바탕으로 대체 메시지를 만듭니다."""
         if write_result.error:
             return tool_result, result
 
-        preview = self._create_preview(content)
+        files_update = write_result.files_update
+        if (
+            meta_result is not None
+            and not meta_result.error
+            and meta_result.files_update is not None
+        ):
+            files_update = {**(files_update or {}), **meta_result.files_update}
+
+        preview = self._create_preview(plan.stored)
         replacement_text = self._create_offload_message(
-            tool_result.tool_call_id, file_path, preview
+            tool_result.tool_call_id, plan.file_path, preview
         )
 
         result.was_offloaded = True
-        result.file_path = file_path
+        result.file_path = plan.file_path
         result.preview = preview
+        result.stored_size = len(plan.stored)
 
-        if write_result.files_update is not None:
+        if files_update is not None:
             return Command(
                 update={
-                    "files": write_result.files_update,
+                    "files": files_update,
                     "messages": [
                         ToolMessage(
                             content=replacement_text,
@@ -214,8 +345,69 @@ read_file 도구로 결과를 읽을 수 있습니다.
             tool_call_id=tool_result.tool_call_id,
         ), result
 
+    def process_tool_result(
+        self,
+        tool_result: ToolMessage,
+        runtime: ToolRuntime,
+    ) -> tuple[ToolMessage | Command, OffloadingResult]:
+        """도구 결과를 처리하고 필요시 축출합니다.
+
+        Args:
+            tool_result: 원본 도구 실행 결과.
+            runtime: 도구 런타임 컨텍스트.
+
+        Returns:
+            처리된 메시지와 Offloading 결과 튜플.
+        """
+        result, plan = self._prepare_offload(tool_result)
+        if plan is None or self._backend_factory is None:
+            return tool_result, result
+
+        backend = self._backend_factory(runtime)
+        write_result = backend.write(plan.file_path, plan.stored)
+        meta_result = None
+        if not write_result.error and plan.metadata is not None:
+            meta_result = backend.write(
+                f"{plan.file_path}{self.config.metadata_suffix}", plan.metadata
+            )
+        return self._finish_offload(
+            tool_result, result, plan, write_result, meta_result
+        )
+
+    async def aprocess_tool_result(
+        self,
+        tool_result: ToolMessage,
+        runtime: ToolRuntime,
+    ) -> tuple[ToolMessage | Command, OffloadingResult]:
+        """`process_tool_result`의 비동기 버전입니다.
+
+        백엔드의 awrite를 사용해 이벤트 루프를 막지 않으므로 병렬 도구 호출의
+        축출이 서로 직렬화되지 않고, 본문과 메타데이터 사이드카도 동시에 씁니다.
+        """
+        result, plan = self._prepare_offload(tool_result)
+        if plan is None or self._backend_factory is None:
+            return tool_result, result
+
+        backend = self._backend_factory(runtime)
+        if plan.metadata is None:
+            write_result = await backend.awrite(plan.file_path, plan.stored)
+            meta_result = None
+        else:
+            write_result, meta_result = await asyncio.gather(
+                backend.awrite(plan.file_path, plan.stored),
+                backend.awrite(
+                    f"{plan.file_path}{self.config.metadata_suffix}", plan.metadata
+                ),
+            )
+        return self._finish_offload(
+            tool_result, result, plan, write_result, meta_result
+        )
+
     def _sanitize_tool_call_id(self, tool_call_id: str) -> str:
         """파일명에 안전한 tool_call_id로 변환합니다."""
+        if tool_call_id.isascii():
+            return tool_call_id.translate(_SAFE_FILENAME_TABLE)
+        # 유니코드 문자/숫자도 그대로 두는 기존 규칙을 유지합니다.
         return "".join(c if c.isalnum() or c in "-_" else "_" for c in tool_call_id)
 
     def wrap_tool_call(
@@ -241,7 +433,7 @@ read_file 도구로 결과를 읽을 수 있습니다.
         tool_result = await handler(request)
 
         if isinstance(tool_result, ToolMessage):
-            processed, _ = self.process_tool_result(tool_result, request.runtime)
+            processed, _ = await self.aprocess_tool_result(tool_result, request.runtime)
             return processed
 
         return tool_result
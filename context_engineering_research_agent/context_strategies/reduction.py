@@ -36,9 +36,11 @@ middleware = SummarizationMiddleware(
 ```
 """
 
+import asyncio
+import functools
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from typing import cast
+from typing import Any, cast
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -51,9 +53,66 @@ from langchain_core.messages import (
     BaseMessage,
     HumanMessage,
     SystemMessage,
+    ToolMessage,
 )
 from langchain_core.messages.utils import AnyMessage
 
+# 요약 프롬프트에 쓰는 역할 이름 (클래스 이름에서 "Message"를 뺀 값)
+_ROLE_NAMES: dict[type, str] = {
+    HumanMessage: "Human",
+    AIMessage: "AI",
+    SystemMessage: "System",
+    ToolMessage: "Tool",
+}
+
+
+def _role_name(message_type: type) -> str:
+    role = _ROLE_NAMES.get(message_type)
+    if role is None:
+        role = _ROLE_NAMES[message_type] = message_type.__name__.replace("Message", "")
+    return role
+
+
+def _content_size(content: Any, measure: Callable[[str], int]) -> int:
+    """메시지 content의 크기를 잽니다.
+
+    content 블록 리스트(멀티모달)는 리스트 repr이 아니라 텍스트 블록만 잽니다.
+    """
+    if isinstance(content, str):
+        return measure(content)
+    if isinstance(content, list):
+        total = 0
+        for block in content:
+            if isinstance(block, dict):
+                text = block.get("text", "")
+                total += measure(text if isinstance(text, str) else str(text))
+            else:
+                total += measure(str(block))
+        return total
+    return measure(str(content))
+
+
+@functools.lru_cache(maxsize=4)
+def tiktoken_token_counter(
+    encoding_name: str = "cl100k_base",
+) -> Callable[[str], int] | None:
+    """주어진 tiktoken 인코딩으로 토큰 수를 세는 함수를 반환합니다.
+
+    tiktoken이 없거나 인코딩을 불러올 수 없으면 None을 반환하며,
+    이 경우 ContextReductionStrategy는 문자 수 기반 추정을 사용합니다.
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding(encoding_name)
+    except Exception:
+        return None
+
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return count
+
 
 @dataclass
 class ReductionConfig:
@@ -74,6 +133,15 @@ class ReductionConfig:
     chars_per_token: int = 4
     """토큰당 문자 수 근사값."""
 
+    batch_size: int = 50
+    """요약 호출 한 번에 넣을 최대 메시지 수."""
+
+    hierarchical: bool = True
+    """True면 batch_size 단위로 나눠 요약한 뒤 부분 요약을 다시 요약."""
+
+    summary_checkpoint_stride: int = 20
+    """요약 경계를 이 간격의 배수로만 옮겨 요약 프리픽스를 여러 턴 동안 고정."""
+
 
 @dataclass
 class ReductionResult:
@@ -118,30 +186,101 @@ class ContextReductionStrategy(AgentMiddleware):
     Args:
         config: Reduction 설정. None이면 기본값 사용.
         summarization_model: 요약에 사용할 LLM. None이면 요약 비활성화.
+        token_counter: 텍스트의 토큰 수를 세는 함수 (예: tiktoken_token_counter()).
+            None이면 문자 수 / chars_per_token으로 추정.
     """
 
     def __init__(
         self,
         config: ReductionConfig | None = None,
         summarization_model: BaseChatModel | None = None,
+        token_counter: Callable[[str], int] | None = None,
     ) -> None:
         self.config = config or ReductionConfig()
         self._summarization_model = summarization_model
+        self._token_counter = token_counter
+        # id(메시지) -> (메시지, 크기). 크기는 token_counter가 있으면 토큰 수,
+        # 없으면 문자 수입니다. 메시지를 함께 붙잡아 두므로 항목이 남아 있는
+        # 동안 같은 id가 다른 객체에 재사용되지 않습니다.
+        self._message_size_cache: dict[int, tuple[BaseMessage, int]] = {}
+        # 마지막 요약: (요약 프롬프트들, 요약 메시지). 같은 입력이면 LLM 호출 없이
+        # 같은 SystemMessage를 재사용해 프롬프트 프리픽스를 그대로 유지합니다.
+        self._last_summary: tuple[tuple[str, ...], SystemMessage] | None = None
+        # 임계값을 넘는 최소 토큰 수와, 같은 판정을 메시지 크기 합으로 하기 위한
+        # 최소 크기. 크기 합이 _size_threshold 이상이면 토큰 수도 임계값을 넘습니다.
+        self._token_threshold = self._min_exceeding_tokens()
+        self._size_threshold = (
+            self._token_threshold
+            if token_counter
+            else self._token_threshold * self.config.chars_per_token
+        )
+
+    def _min_exceeding_tokens(self) -> int:
+        """토큰 수 / model_context_window > context_threshold를 만족하는 최소 토큰 수."""
+        window = self.config.model_context_window
+        threshold = self.config.context_threshold
+        tokens = max(int(threshold * window) + 1, 0)
+        # 부동소수점 반올림 차이를 원래 비교식으로 보정합니다.
+        while tokens > 0 and (tokens - 1) / window > threshold:
+            tokens -= 1
+        while not tokens / window > threshold:
+            tokens += 1
+        return tokens
+
+    def _message_size(self, msg: BaseMessage) -> int:
+        """메시지 크기(토큰 수 또는 문자 수)를 캐시에서 꺼내거나 계산합니다."""
+        entry = self._message_size_cache.get(id(msg))
+        if entry is None or entry[0] is not msg:
+            size = _content_size(msg.content, self._token_counter or len)
+            entry = self._message_size_cache[id(msg)] = (msg, size)
+        return entry[1]
 
     def _estimate_tokens(self, messages: list[BaseMessage]) -> int:
-        """메시지 목록의 총 토큰 수를 추정합니다."""
-        total_chars = sum(len(str(msg.content)) for msg in messages)
-        return total_chars // self.config.chars_per_token
+        """메시지 목록의 총 토큰 수를 추정합니다.
+
+        메시지별 크기를 캐싱하므로 반복 호출 시 새 메시지만 계산합니다.
+        """
+        return self._size_to_tokens(sum(map(self._message_size, messages)))
+
+    def _size_to_tokens(self, size: int) -> int:
+        """메시지 크기 합을 토큰 수로 환산합니다."""
+        if self._token_counter:
+            return size
+        return size // self.config.chars_per_token
+
+    def _prune_message_size_cache(self, messages: list[BaseMessage]) -> None:
+        """현재 대화 기록에 없는 메시지를 캐시에서 제거합니다.
+
+        compaction/요약이 매번 새로 만드는 메시지가 쌓이지 않도록
+        캐시가 대화 기록보다 충분히 커졌을 때만 정리합니다.
+        """
+        cache = self._message_size_cache
+        if len(cache) <= 2 * len(messages) + 64:
+            return
+        live = {id(msg) for msg in messages}
+        self._message_size_cache = {
+            key: entry for key, entry in cache.items() if key in live
+        }
 
     def _get_context_usage_ratio(self, messages: list[BaseMessage]) -> float:
         """현재 컨텍스트 사용률을 계산합니다."""
         estimated_tokens = self._estimate_tokens(messages)
         return estimated_tokens / self.config.model_context_window
 
+    def _exceeds_threshold(self, estimated_tokens: int) -> bool:
+        return estimated_tokens >= self._token_threshold
+
     def _should_reduce(self, messages: list[BaseMessage]) -> bool:
-        """축소가 필요한지 판단합니다."""
-        usage_ratio = self._get_context_usage_ratio(messages)
-        return usage_ratio > self.config.context_threshold
+        """축소가 필요한지 판단합니다.
+
+        크기 합이 임계값을 넘는 순간 나머지 메시지는 보지 않고 반환합니다.
+        """
+        total = 0
+        for msg in messages:
+            total += self._message_size(msg)
+            if total >= self._size_threshold:
+                return True
+        return False
 
     def apply_compaction(
         self,
@@ -151,108 +290,285 @@ class ContextReductionStrategy(AgentMiddleware):
 
         오래된 메시지에서 도구 호출과 도구 결과를 제거합니다.
         """
-        original_count = len(messages)
-        compacted: list[BaseMessage] = []
+        original_size = sum(map(self._message_size, messages))
+        compacted, result, _ = self._compact(messages, original_size)
+        return compacted, result
 
-        for i, msg in enumerate(messages):
-            age = len(messages) - i
+    def _compact(
+        self,
+        messages: list[BaseMessage],
+        original_size: int,
+    ) -> tuple[list[BaseMessage], ReductionResult, int]:
+        """Compaction을 수행하고 (메시지, 결과, compaction 후 크기 합)을 반환합니다.
 
-            if age <= self.config.compaction_age_threshold:
-                compacted.append(msg)
-                continue
+        바뀌는 것은 오래된 메시지뿐이므로 그 부분의 크기 변화만 계산합니다.
+        """
+        original_count = len(messages)
+        # 최근 compaction_age_threshold개는 그대로 두고 그 앞부분만 검사합니다.
+        cutoff = max(0, original_count - self.config.compaction_age_threshold)
+        if cutoff == 0:
+            result = ReductionResult(
+                was_reduced=False,
+                technique_used="compaction",
+                original_message_count=original_count,
+                reduced_message_count=original_count,
+            )
+            return messages, result, original_size
 
+        compacted: list[BaseMessage] = []
+        removed_size = 0
+        for msg in messages[:cutoff]:
             if isinstance(msg, AIMessage):
                 if msg.tool_calls:
-                    text_content = (
-                        msg.text if hasattr(msg, "text") else str(msg.content)
-                    )
+                    removed_size += self._message_size(msg)
+                    text_content = msg.text
                     if text_content.strip():
-                        compacted.append(AIMessage(content=text_content))
+                        rewritten = AIMessage(content=text_content)
+                        removed_size -= self._message_size(rewritten)
+                        compacted.append(rewritten)
                 else:
                     compacted.append(msg)
             elif isinstance(msg, (HumanMessage, SystemMessage)):
                 compacted.append(msg)
+            else:
+                removed_size += self._message_size(msg)
+
+        compacted.extend(messages[cutoff:])
+        compacted_size = original_size - removed_size
 
         result = ReductionResult(
             was_reduced=len(compacted) < original_count,
             technique_used="compaction",
             original_message_count=original_count,
             reduced_message_count=len(compacted),
-            estimated_tokens_saved=(
-                self._estimate_tokens(messages) - self._estimate_tokens(compacted)
+            estimated_tokens_saved=self._size_to_tokens(original_size)
+            - self._size_to_tokens(compacted_size),
+        )
+
+        return compacted, result, compacted_size
+
+    def _split_for_summarization(
+        self, messages: list[BaseMessage]
+    ) -> tuple[list[BaseMessage], list[BaseMessage], list[BaseMessage]]:
+        """(고정 앞부분, 요약할 부분, 그대로 둘 최근 메시지)로 나눕니다.
+
+        맨 앞(처음 두 메시지 이내)의 SystemMessage는 과제를 규정하는
+        앵커이므로 요약하지 않고 그대로 둡니다.
+        경계는 summary_checkpoint_stride의 배수로 내림하므로 대화가 조금
+        늘어나도 요약 대상이 바뀌지 않고, 최근 메시지는 최소
+        min_messages_to_keep개 이상 유지됩니다. 내림한 경계로는 요약할
+        메시지가 없거나 남는 메시지가 여전히 임계값을 넘으면 내림하지 않고
+        최근 min_messages_to_keep개만 남깁니다.
+        """
+        sink_count = 0
+        while sink_count < min(2, len(messages)) and isinstance(
+            messages[sink_count], SystemMessage
+        ):
+            sink_count += 1
+
+        stride = max(1, self.config.summary_checkpoint_stride)
+        keep_from = sink_count + max(
+            0, len(messages) - sink_count - self.config.min_messages_to_keep
+        )
+        split = keep_from - (keep_from - sink_count) % stride
+        if split < keep_from and (
+            split == sink_count
+            or self._should_reduce([*messages[:sink_count], *messages[split:]])
+        ):
+            split = keep_from
+        return messages[:sink_count], messages[sink_count:split], messages[split:]
+
+    def _summary_batches(self, messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+        """한 번의 요약 호출에 넣을 메시지 묶음으로 나눕니다."""
+        batch_size = self.config.batch_size
+        if not self.config.hierarchical or len(messages) <= batch_size:
+            return [messages]
+        return [
+            messages[start : start + batch_size]
+            for start in range(0, len(messages), batch_size)
+        ]
+
+    def _summary_request(self, prompt: str) -> list[BaseMessage]:
+        return [
+            SystemMessage(
+                content="당신은 대화 요약 전문가입니다. 핵심 정보만 간결하게 요약하세요."
             ),
+            HumanMessage(content=prompt),
+        ]
+
+    def _cached_summary(self, prompts: tuple[str, ...]) -> SystemMessage | None:
+        last = self._last_summary
+        if last is not None and last[0] == prompts:
+            return last[1]
+        return None
+
+    def _remember_summary(
+        self, prompts: tuple[str, ...], summary: str
+    ) -> SystemMessage:
+        summary_message = SystemMessage(content=f"[이전 대화 요약]\n{summary}")
+        self._last_summary = (prompts, summary_message)
+        return summary_message
+
+    def _build_summarized(
+        self,
+        messages: list[BaseMessage],
+        sink_messages: list[BaseMessage],
+        recent_messages: list[BaseMessage],
+        summary_message: SystemMessage,
+        original_tokens: int | None,
+    ) -> tuple[list[BaseMessage], ReductionResult]:
+        if original_tokens is None:
+            original_tokens = self._estimate_tokens(messages)
+
+        summarized = [*sink_messages, summary_message, *recent_messages]
+
+        result = ReductionResult(
+            was_reduced=True,
+            technique_used="summarization",
+            original_message_count=len(messages),
+            reduced_message_count=len(summarized),
+            estimated_tokens_saved=original_tokens - self._estimate_tokens(summarized),
         )
 
-        return compacted, result
+        return summarized, result
 
     def apply_summarization(
         self,
         messages: list[BaseMessage],
+        original_tokens: int | None = None,
     ) -> tuple[list[BaseMessage], ReductionResult]:
         """Summarization을 적용합니다.
 
-        LLM을 사용하여 대화 내용을 요약합니다.
+        LLM을 사용하여 대화 내용을 요약합니다. 요약할 메시지가 batch_size를
+        넘으면 묶음별로 요약한 뒤 부분 요약들을 다시 요약합니다.
+        직전과 같은 범위를 요약하게 되면 LLM을 다시 호출하지 않고 이전 요약
+        메시지를 그대로 재사용하므로 Provider 프롬프트 캐시가 유지됩니다.
+        original_tokens를 넘기면 원본 토큰 수를 다시 세지 않습니다.
         """
-        if self._summarization_model is None:
+        model = self._summarization_model
+        if model is None or len(messages) <= self.config.min_messages_to_keep:
             return messages, ReductionResult(was_reduced=False)
 
-        original_count = len(messages)
+        sink_messages, messages_to_summarize, recent_messages = (
+            self._split_for_summarization(messages)
+        )
+        if not messages_to_summarize:
+            return messages, ReductionResult(was_reduced=False)
 
-        keep_count = self.config.min_messages_to_keep
-        messages_to_summarize = (
-            messages[:-keep_count] if len(messages) > keep_count else []
+        prompts = tuple(
+            self._create_summary_prompt(batch)
+            for batch in self._summary_batches(messages_to_summarize)
         )
-        recent_messages = (
-            messages[-keep_count:] if len(messages) > keep_count else messages
+        summary_message = self._cached_summary(prompts)
+        if summary_message is None:
+            partials = [
+                model.invoke(self._summary_request(prompt)).content
+                for prompt in prompts
+            ]
+            summary = partials[0]
+            if len(partials) > 1:
+                summary = model.invoke(
+                    self._summary_request(self._create_merge_prompt(partials))
+                ).content
+            summary_message = self._remember_summary(prompts, str(summary))
+
+        return self._build_summarized(
+            messages, sink_messages, recent_messages, summary_message, original_tokens
         )
 
-        if not messages_to_summarize:
-            return messages, ReductionResult(was_reduced=False)
+    async def aapply_summarization(
+        self,
+        messages: list[BaseMessage],
+        original_tokens: int | None = None,
+    ) -> tuple[list[BaseMessage], ReductionResult]:
+        """`apply_summarization`의 비동기 버전입니다.
 
-        summary_prompt = self._create_summary_prompt(messages_to_summarize)
+        묶음별 요약 호출을 동시에 실행합니다.
+        """
+        model = self._summarization_model
+        if model is None or len(messages) <= self.config.min_messages_to_keep:
+            return messages, ReductionResult(was_reduced=False)
 
-        summary_response = self._summarization_model.invoke(
-            [
-                SystemMessage(
-                    content="당신은 대화 요약 전문가입니다. 핵심 정보만 간결하게 요약하세요."
-                ),
-                HumanMessage(content=summary_prompt),
-            ]
+        sink_messages, messages_to_summarize, recent_messages = (
+            self._split_for_summarization(messages)
         )
+        if not messages_to_summarize:
+            return messages, ReductionResult(was_reduced=False)
 
-        summary_message = SystemMessage(
-            content=f"[이전 대화 요약]\n{summary_response.content}"
+        prompts = tuple(
+            self._create_summary_prompt(batch)
+            for batch in self._summary_batches(messages_to_summarize)
         )
+        summary_message = self._cached_summary(prompts)
+        if summary_message is None:
+            responses = await asyncio.gather(
+                *(model.ainvoke(self._summary_request(prompt)) for prompt in prompts)
+            )
+            summary = responses[0].content
+            if len(responses) > 1:
+                merged = await model.ainvoke(
+                    self._summary_request(
+                        self._create_merge_prompt(
+                            [response.content for response in responses]
+                        )
+                    )
+                )
+                summary = merged.content
+            summary_message = self._remember_summary(prompts, str(summary))
 
-        summarized = [summary_message] + list(recent_messages)
+        return self._build_summarized(
+            messages, sink_messages, recent_messages, summary_message, original_tokens
+        )
 
-        result = ReductionResult(
-            was_reduced=True,
-            technique_used="summarization",
-            original_message_count=original_count,
-            reduced_message_count=len(summarized),
-            estimated_tokens_saved=(
-                self._estimate_tokens(messages) - self._estimate_tokens(summarized)
-            ),
+    def _create_merge_prompt(self, partial_summaries: list) -> str:
+        """부분 요약들을 하나로 합치기 위한 프롬프트를 생성합니다."""
+        sections = "\n\n".join(
+            f"[부분 {i}]\n{summary}"
+            for i, summary in enumerate(partial_summaries, start=1)
         )
+        return f"""다음은 긴 대화를 순서대로 나누어 요약한 결과입니다. 하나의 요약으로 합쳐주세요.
+핵심 정보, 결정사항, 중요한 컨텍스트만 포함하세요.
 
-        return summarized, result
+부분 요약:
+{sections}
+
+요약 (한국어로, 500자 이내):"""
 
     def _create_summary_prompt(self, messages: list[BaseMessage]) -> str:
         """요약을 위한 프롬프트를 생성합니다."""
-        conversation_text = []
-        for msg in messages:
-            role = msg.__class__.__name__.replace("Message", "")
-            content = str(msg.content)[:500]
-            conversation_text.append(f"[{role}]: {content}")
+        conversation_text = "\n".join(
+            [f"[{_role_name(type(msg))}]: {str(msg.content)[:500]}" for msg in messages]
+        )
 
         return f"""다음 대화를 요약해주세요. 핵심 정보, 결정사항, 중요한 컨텍스트만 포함하세요.
 
 대화 내용:
-{chr(10).join(conversation_text)}
+{conversation_text}
 
 요약 (한국어로, 500자 이내):"""
 
+    def _compact_if_needed(
+        self, messages: list[BaseMessage]
+    ) -> tuple[list[BaseMessage], ReductionResult, int | None]:
+        """임계값 확인과 Compaction을 수행합니다.
+
+        Returns:
+            (메시지, 결과, 요약이 필요하면 compaction 후 토큰 수 / 아니면 None)
+        """
+        original_size = sum(map(self._message_size, messages))
+        self._prune_message_size_cache(messages)
+        if not self._exceeds_threshold(self._size_to_tokens(original_size)):
+            return messages, ReductionResult(was_reduced=False), None
+
+        compacted, compaction_result, compacted_size = self._compact(
+            messages, original_size
+        )
+        compacted_tokens = self._size_to_tokens(compacted_size)
+
+        if not self._exceeds_threshold(compacted_tokens):
+            return compacted, compaction_result, None
+        return compacted, compaction_result, compacted_tokens
+
     def reduce_context(
         self,
         messages: list[BaseMessage],
@@ -262,17 +578,20 @@ class ContextReductionStrategy(AgentMiddleware):
         먼저 Compaction을 시도하고, 여전히 임계값을 초과하면
         Summarization을 적용합니다.
         """
-        if not self._should_reduce(messages):
-            return messages, ReductionResult(was_reduced=False)
-
-        compacted, compaction_result = self.apply_compaction(messages)
+        compacted, result, compacted_tokens = self._compact_if_needed(messages)
+        if compacted_tokens is None:
+            return compacted, result
+        return self.apply_summarization(compacted, compacted_tokens)
 
-        if not self._should_reduce(compacted):
-            return compacted, compaction_result
-
-        summarized, summarization_result = self.apply_summarization(compacted)
-
-        return summarized, summarization_result
+    async def areduce_context(
+        self,
+        messages: list[BaseMessage],
+    ) -> tuple[list[BaseMessage], ReductionResult]:
+        """`reduce_context`의 비동기 버전입니다. 요약 호출이 이벤트 루프를 막지 않습니다."""
+        compacted, result, compacted_tokens = self._compact_if_needed(messages)
+        if compacted_tokens is None:
+            return compacted, result
+        return await self.aapply_summarization(compacted, compacted_tokens)
 
     def wrap_model_call(
         self,
@@ -296,7 +615,7 @@ class ContextReductionStrategy(AgentMiddleware):
     ) -> ModelResponse:
         """비동기 모델 호출을 래핑합니다."""
         messages = cast(list[BaseMessage], request.messages)
-        reduced_messages, result = self.reduce_context(messages)
+        reduced_messages, result = await self.areduce_context(messages)
         if result.was_reduced:
             request = request.override(
                 messages=cast(list[AnyMessage], reduced_messages)
@@ -40,9 +40,12 @@ read_file(path="/data.txt", offset=100, limit=50)
 ```
 """
 
-from collections.abc import Awaitable, Callable
+import functools
+import inspect
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import Any, Literal, cast
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -53,6 +56,27 @@ from langchain.tools import ToolRuntime
 from langchain_core.tools import BaseTool, StructuredTool
 
 
+def _supports_limit(backend: object, method_name: str) -> bool:
+    """백엔드 메서드가 limit 키워드 인자를 받는지 확인합니다.
+
+    limit을 받는 백엔드는 상한에 도달하면 검색을 일찍 멈출 수 있습니다.
+    받지 않는 백엔드에는 기존처럼 limit 없이 호출합니다.
+    """
+    return _method_accepts_limit(cast(Hashable, type(backend)), method_name)
+
+
+@functools.lru_cache(maxsize=64)
+def _method_accepts_limit(backend_type: Hashable, method_name: str) -> bool:
+    """백엔드 클래스별로 시그니처 검사 결과를 캐시합니다."""
+    try:
+        parameters = inspect.signature(getattr(backend_type, method_name)).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return "limit" in parameters or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+    )
+
+
 @dataclass
 class RetrievalConfig:
     """Context Retrieval 설정."""
@@ -124,7 +148,11 @@ class ContextRetrievalStrategy(AgentMiddleware):
     ) -> None:
         self.config = config or RetrievalConfig()
         self._backend_factory = backend_factory
-        self.tools = self._create_tools()
+
+    @functools.cached_property
+    def tools(self) -> list[BaseTool]:  # type: ignore[override]
+        """검색 도구 목록. 처음 접근할 때 생성합니다."""
+        return self._create_tools()
 
     def _create_tools(self) -> list[BaseTool]:
         """검색 도구들을 생성합니다."""
@@ -204,7 +232,14 @@ class ContextRetrievalStrategy(AgentMiddleware):
                 return "백엔드가 설정되지 않았습니다."
 
             backend = backend_factory(runtime)
-            raw_results = backend.grep_raw(pattern, path=path, glob=glob_pattern)
+            limit_kwargs = (
+                {"limit": config.max_grep_results}
+                if _supports_limit(backend, "grep_raw")
+                else {}
+            )
+            raw_results = backend.grep_raw(
+                pattern, path=path, glob=glob_pattern, **limit_kwargs
+            )
 
             if isinstance(raw_results, str):
                 return raw_results
@@ -212,21 +247,21 @@ class ContextRetrievalStrategy(AgentMiddleware):
             truncated = raw_results[: config.max_grep_results]
 
             if output_mode == "files_with_matches":
-                files = list(set(r.get("path", "") for r in truncated))
+                # 첫 등장 순서를 유지하며 중복 제거
+                files = dict.fromkeys(r.get("path", "") for r in truncated)
                 return "\n".join(files)
             elif output_mode == "count":
-                from collections import Counter
-
                 counts = Counter(r.get("path", "") for r in truncated)
                 return "\n".join(f"{path}: {count}" for path, count in counts.items())
             else:
-                lines = []
-                for r in truncated:
-                    path = r.get("path", "")
-                    line_num = r.get("line_number", 0)
-                    content = r.get("content", "")[: config.truncate_line_length]
-                    lines.append(f"{path}:{line_num}: {content}")
-                return "\n".join(lines)
+                line_limit = config.truncate_line_length
+                return "\n".join(
+                    [
+                        f"{r.get('path', '')}:{r.get('line_number', 0)}: "
+                        f"{r.get('content', '')[:line_limit]}"
+                        for r in truncated
+                    ]
+                )
 
         return StructuredTool.from_function(
             name="grep",
@@ -265,7 +300,12 @@ class ContextRetrievalStrategy(AgentMiddleware):
                 return "백엔드가 설정되지 않았습니다."
 
             backend = backend_factory(runtime)
-            infos = backend.glob_info(pattern, path=path)
+            limit_kwargs = (
+                {"limit": config.max_glob_results}
+                if _supports_limit(backend, "glob_info")
+                else {}
+            )
+            infos = backend.glob_info(pattern, path=path, **limit_kwargs)
 
             paths = [fi.get("path", "") for fi in infos[: config.max_glob_results]]
             return "\n".join(paths)
@@ -1,6 +1,6 @@
 """연구 에이전트 모듈."""
 
-from context_engineering_more_deep_research_agent.research.agent import (
+from context_engineering_research_agent.research.agent import (
     create_researcher_agent,
     get_researcher_subagent,
 )
@@ -1,19 +1,25 @@
 """자율적 연구 에이전트."""
 
+import threading
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 
 from deepagents import create_deep_agent
 from deepagents.backends.protocol import BackendFactory, BackendProtocol
+from langchain.agents.middleware.types import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+)
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph.state import CompiledStateGraph
 
 AUTONOMOUS_RESEARCHER_INSTRUCTIONS = """당신은 자율적 연구 에이전트입니다. 
 "넓게 탐색 → 깊게 파기" 방법론을 따라 주제를 철저히 연구합니다.
 
-오늘 날짜: {date}
-
 ## 연구 워크플로우
 
 ### Phase 1: 탐색적 검색 (1-2회)
@@ -63,23 +69,87 @@ AUTONOMOUS_RESEARCHER_INSTRUCTIONS = """당신은 자율적 연구 에이전트
 """
 
 
-def create_researcher_agent(
-    model: str | BaseChatModel | None = None,
-    backend: BackendProtocol | BackendFactory | None = None,
-) -> CompiledStateGraph:
-    if model is None:
-        model = ChatOpenAI(model="gpt-4.1", temperature=0.0)
+_COMPILED_CACHE_SIZE = 16
+
+# (모델 키, id(백엔드)) -> (모델, 백엔드, 그래프). 모델과 백엔드를 함께 붙잡아
+# 두므로 항목이 남아 있는 동안 같은 id가 다른 객체에 재사용되지 않습니다.
+_compiled_researchers: dict[
+    tuple[str | int | None, int], tuple[Any, Any, CompiledStateGraph]
+] = {}
+_compiled_lock = threading.Lock()
+
+
+class _CurrentDateMiddleware(AgentMiddleware):
+    """모델 호출마다 시스템 프롬프트 끝에 오늘 날짜를 붙입니다.
+
+    날짜를 컴파일된 그래프 밖에서 넣으므로 날짜가 바뀌어도 그래프를 재사용할 수
+    있고, 프롬프트 앞부분이 그대로라 Provider 프롬프트 캐시도 유지됩니다.
+    """
+
+    def _with_date(self, request: ModelRequest) -> ModelRequest:
+        date_line = f"오늘 날짜: {datetime.now().strftime('%Y-%m-%d')}"
+        if request.system_prompt:
+            system_prompt = request.system_prompt + "\n\n" + date_line
+        else:
+            system_prompt = date_line
+        return request.override(system_message=SystemMessage(system_prompt))
 
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    formatted_prompt = AUTONOMOUS_RESEARCHER_INSTRUCTIONS.format(date=current_date)
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        return handler(self._with_date(request))
 
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        return await handler(self._with_date(request))
+
+
+def _compile_researcher(
+    model: str | BaseChatModel | None,
+    backend: BackendProtocol | BackendFactory | None,
+) -> CompiledStateGraph:
     return create_deep_agent(
-        model=model,
-        system_prompt=formatted_prompt,
+        model=model or ChatOpenAI(model="gpt-4.1", temperature=0.0),
+        system_prompt=AUTONOMOUS_RESEARCHER_INSTRUCTIONS,
+        middleware=[_CurrentDateMiddleware()],
         backend=backend,
     )
 
 
+def create_researcher_agent(
+    model: str | BaseChatModel | None = None,
+    backend: BackendProtocol | BackendFactory | None = None,
+) -> CompiledStateGraph:
+    """연구 에이전트 그래프를 반환합니다.
+
+    같은 모델(문자열은 값, 객체는 동일 인스턴스)과 같은 백엔드 인스턴스로
+    다시 호출하면 이전에 컴파일한 그래프를 재사용합니다.
+    """
+    model_key = model if model is None or isinstance(model, str) else id(model)
+    key = (model_key, id(backend))
+    with _compiled_lock:
+        entry = _compiled_researchers.pop(key, None)
+        if (
+            entry is not None
+            and entry[1] is backend
+            and (isinstance(model, str) or entry[0] is model)
+        ):
+            _compiled_researchers[key] = entry
+            return entry[2]
+
+    graph = _compile_researcher(model, backend)
+    with _compiled_lock:
+        _compiled_researchers[key] = (model, backend, graph)
+        while len(_compiled_researchers) > _COMPILED_CACHE_SIZE:
+            del _compiled_researchers[next(iter(_compiled_researchers))]
+    return graph
+
+
 def get_researcher_subagent(
     model: str | BaseChatModel | None = None,
     backend: BackendProtocol | BackendFactory | None = None,
@@ -14,13 +14,14 @@
 
 스킬 시스템은 Context Engineering의 핵심 전략들을 활용합니다:
 
-1. **Context Retrieval**: read_file로 필요할 때만 스킬 내용 로드
+1. **Context Retrieval**: load_skill 도구로 필요할 때만 스킬 내용 로드
 2. **Context Offloading**: 전체 스킬 내용 대신 메타데이터만 시스템 프롬프트에 포함
 3. **Context Isolation**: 각 스킬은 독립적인 도메인 지식 캡슐화
 """
 
 from context_engineering_research_agent.skills.load import (
     SkillMetadata,
+    alist_skills,
     list_skills,
 )
 from context_engineering_research_agent.skills.middleware import (
@@ -31,6 +32,7 @@ from context_engineering_research_agent.skills.middleware import (
 __all__ = [
     "SkillMetadata",
     "list_skills",
+    "alist_skills",
     "SkillsMiddleware",
     "SkillsState",
 ]
@@ -5,19 +5,51 @@ YAML 프론트매터 파싱을 통해 Anthropic Agent Skills 패턴을 구현합
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import NotRequired, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # libyaml 없이 빌드된 PyYAML
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger(__name__)
 
 MAX_SKILL_FILE_SIZE = 10 * 1024 * 1024  # 10MB - DoS 방지
 MAX_SKILL_NAME_LENGTH = 64
 MAX_SKILL_DESCRIPTION_LENGTH = 1024
 
+# 프론트매터만 필요하므로 파일 앞부분만 청크 단위로 읽습니다.
+MAX_FRONTMATTER_SIZE = 64 * 1024
+_FRONTMATTER_READ_CHUNK = 8 * 1024
+
+_FRONTMATTER_RE = re.compile(rb"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+_SKILL_NAME_RE = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+# 대부분의 SKILL.md 프론트매터는 `key: value` 한 줄 필드뿐이라 YAML 파서 없이 읽습니다.
+_SIMPLE_FIELD_RE = re.compile(r"([A-Za-z_][\w-]*):[ ]+(\S(?:.*\S)?)[ ]*")
+# 값이 이 문자로 시작하거나 이 패턴을 포함하면 YAML 문법일 수 있으므로 파서에 넘깁니다.
+_YAML_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_YAML_SYNTAX_RE = re.compile(r":\s|\s#")
+_YAML_SPECIAL_CHARS_RE = re.compile(
+    "[^\x09\x0a\x0d\x20-\x7e\xa0-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+    "|[\u2028\u2029]"
+)
+_STR_TAG = "tag:yaml.org,2002:str"
+_RESOLVER = yaml.resolver.Resolver()
+
+# SKILL.md 파싱은 I/O 대기가 대부분이므로 스레드로 겹쳐 실행합니다.
+_MAX_PARSE_WORKERS = 32
+
 
 class SkillMetadata(TypedDict):
     """Agent Skills 명세를 따르는 스킬 메타데이터."""
@@ -32,12 +64,10 @@ class SkillMetadata(TypedDict):
     allowed_tools: NotRequired[str | None]
 
 
-def _is_safe_path(path: Path, base_dir: Path) -> bool:
-    """경로가 base_dir 내에 안전하게 포함되어 있는지 확인합니다."""
+def _is_safe_path(path: Path, resolved_base: Path) -> bool:
+    """경로가 이미 resolve()된 resolved_base 내에 안전하게 포함되어 있는지 확인합니다."""
     try:
-        resolved_path = path.resolve()
-        resolved_base = base_dir.resolve()
-        resolved_path.relative_to(resolved_base)
+        path.resolve().relative_to(resolved_base)
         return True
     except ValueError:
         return False
@@ -51,7 +81,7 @@ def _validate_skill_name(name: str, directory_name: str) -> tuple[bool, str]:
         return False, "이름은 필수입니다"
     if len(name) > MAX_SKILL_NAME_LENGTH:
         return False, "이름이 64자를 초과합니다"
-    if not re.match(r"^[a-z0-9]+(-[a-z0-9]+)*$", name):
+    if not _SKILL_NAME_RE.match(name):
         return False, "이름은 소문자 영숫자와 단일 하이픈만 사용해야 합니다"
     if name != directory_name:
         return (
@@ -61,6 +91,57 @@ def _validate_skill_name(name: str, directory_name: str) -> tuple[bool, str]:
     return True, ""
 
 
+def _is_plain_string(value: str) -> bool:
+    """YAML이 값을 그대로 문자열로 해석하는지 확인합니다 (숫자, 불리언, null 등 제외)."""
+    return _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+
+
+def _parse_simple_frontmatter(frontmatter_str: str) -> dict[str, str] | None:
+    """한 줄짜리 `key: value` 필드만 있는 프론트매터를 YAML 파서 없이 파싱합니다.
+
+    따옴표, 블록 스칼라, 중첩 매핑, 주석 등 YAML 문법이 보이거나 값이 문자열이
+    아닌 타입으로 해석될 수 있으면 None을 반환해 YAML 파서로 넘깁니다.
+    """
+    # YAML은 탭을 구분자나 값 안에서 허용하지 않는 경우가 있으므로 파서에 맡깁니다.
+    if "\t" in frontmatter_str or _YAML_SPECIAL_CHARS_RE.search(frontmatter_str):
+        return None
+    fields: dict[str, str] = {}
+    for line in frontmatter_str.split("\n"):
+        if not line.strip():
+            continue
+        match = _SIMPLE_FIELD_RE.fullmatch(line)
+        if match is None:
+            return None
+        key, value = match.groups()
+        if (
+            value[0] in _YAML_INDICATORS
+            or value[-1] == ":"
+            or _YAML_SYNTAX_RE.search(value)
+            or not _is_plain_string(key)
+            or not _is_plain_string(value)
+        ):
+            return None
+        fields[key] = value
+    return fields or None
+
+
+def _read_frontmatter(skill_md_path: Path) -> str | None:
+    """SKILL.md 앞부분만 읽어 프론트매터 본문을 반환합니다. 없으면 None."""
+    buffer = bytearray()
+    with skill_md_path.open("rb") as f:
+        while len(buffer) < MAX_FRONTMATTER_SIZE:
+            chunk = f.read(_FRONTMATTER_READ_CHUNK)
+            if not chunk:
+                break
+            buffer += chunk
+            if not buffer.startswith(b"---"):
+                return None
+            match = _FRONTMATTER_RE.match(buffer)
+            if match:
+                return match.group(1).decode("utf-8")
+    return None
+
+
 def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | None:
     """SKILL.md 파일에서 YAML 프론트매터를 파싱합니다."""
     try:
@@ -71,24 +152,20 @@ def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | N
             )
             return None
 
-        content = skill_md_path.read_text(encoding="utf-8")
-
-        frontmatter_pattern = r"^---\s*\n(.*?)\n---\s*\n"
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-        if not match:
+        frontmatter_str = _read_frontmatter(skill_md_path)
+        if frontmatter_str is None:
             logger.warning(
                 "%s 건너뜀: 유효한 YAML 프론트매터를 찾을 수 없음", skill_md_path
             )
             return None
 
-        frontmatter_str = match.group(1)
-
-        try:
-            frontmatter_data = yaml.safe_load(frontmatter_str)
-        except yaml.YAMLError as e:
-            logger.warning("%s의 YAML이 유효하지 않음: %s", skill_md_path, e)
-            return None
+        frontmatter_data: Any = _parse_simple_frontmatter(frontmatter_str)
+        if frontmatter_data is None:
+            try:
+                frontmatter_data = yaml.load(frontmatter_str, Loader=_SafeLoader)
+            except yaml.YAMLError as e:
+                logger.warning("%s의 YAML이 유효하지 않음: %s", skill_md_path, e)
+                return None
 
         if not isinstance(frontmatter_data, dict):
             logger.warning("%s 건너뜀: 프론트매터가 매핑이 아님", skill_md_path)
@@ -142,35 +219,60 @@ def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | N
 def _list_skills_from_dir(skills_dir: Path, source: str) -> list[SkillMetadata]:
     """단일 스킬 디렉토리에서 모든 스킬을 나열합니다."""
     skills_dir = skills_dir.expanduser()
-    if not skills_dir.exists():
-        return []
 
     try:
         resolved_base = skills_dir.resolve()
     except (OSError, RuntimeError):
         return []
 
-    skills: list[SkillMetadata] = []
+    candidates: list[Path] = []
 
-    for skill_dir in skills_dir.iterdir():
-        if not _is_safe_path(skill_dir, resolved_base):
-            continue
+    # 하위 디렉토리 순회. os.scandir는 디렉토리 항목의 종류를 함께 돌려주므로
+    # 항목마다 Path 객체를 만들고 stat하지 않아도 됩니다.
+    try:
+        with os.scandir(skills_dir) as entries:
+            skill_dirs = [entry for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
 
-        if not skill_dir.is_dir():
+    for entry in skill_dirs:
+        skill_md = os.path.join(entry.path, "SKILL.md")
+        try:
+            mode = os.lstat(skill_md).st_mode
+        except OSError:
             continue
 
-        skill_md_path = skill_dir / "SKILL.md"
-        if not skill_md_path.exists():
+        if entry.is_symlink() or stat.S_ISLNK(mode):
+            # 스킬 디렉토리나 SKILL.md가 외부를 가리키는
+            # 심볼릭 링크일 수 있으므로 이때만 경로를 resolve()해 확인합니다.
+            if not _is_safe_path(Path(skill_md), resolved_base):
+                continue
+            if not os.path.isfile(skill_md):
+                continue
+        elif not stat.S_ISREG(mode):
             continue
 
-        if not _is_safe_path(skill_md_path, resolved_base):
-            continue
+        candidates.append(Path(skill_md))
+
+    if len(candidates) <= 1:
+        parsed = [_parse_skill_metadata(path, source) for path in candidates]
+    else:
+        workers = min(_MAX_PARSE_WORKERS, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = list(
+                executor.map(_parse_skill_metadata, candidates, repeat(source))
+            )
+    return [metadata for metadata in parsed if metadata]
 
-        metadata = _parse_skill_metadata(skill_md_path, source=source)
-        if metadata:
-            skills.append(metadata)
 
-    return skills
+def _merge_skills(
+    user_skills: list[SkillMetadata], project_skills: list[SkillMetadata]
+) -> list[SkillMetadata]:
+    """프로젝트 스킬이 같은 이름의 사용자 스킬을 오버라이드하도록 병합합니다."""
+    all_skills: dict[str, SkillMetadata] = {}
+    for skill in (*user_skills, *project_skills):
+        all_skills[skill["name"]] = skill
+    return list(all_skills.values())
 
 
 def list_skills(
@@ -182,16 +284,32 @@ def list_skills(
 
     프로젝트 스킬이 같은 이름의 사용자 스킬을 오버라이드합니다.
     """
-    all_skills: dict[str, SkillMetadata] = {}
+    return _merge_skills(
+        _list_skills_from_dir(user_skills_dir, source="user")
+        if user_skills_dir
+        else [],
+        _list_skills_from_dir(project_skills_dir, source="project")
+        if project_skills_dir
+        else [],
+    )
+
+
+async def alist_skills(
+    *,
+    user_skills_dir: Path | None = None,
+    project_skills_dir: Path | None = None,
+) -> list[SkillMetadata]:
+    """list_skills의 비동기 버전.
 
-    if user_skills_dir:
-        user_skills = _list_skills_from_dir(user_skills_dir, source="user")
-        for skill in user_skills:
-            all_skills[skill["name"]] = skill
+    두 디렉토리의 스캔을 워커 스레드에서 동시에 실행해 이벤트 루프를 막지 않습니다.
+    """
 
-    if project_skills_dir:
-        project_skills = _list_skills_from_dir(project_skills_dir, source="project")
-        for skill in project_skills:
-            all_skills[skill["name"]] = skill
+    async def scan(skills_dir: Path | None, source: str) -> list[SkillMetadata]:
+        if not skills_dir:
+            return []
+        return await asyncio.to_thread(_list_skills_from_dir, skills_dir, source)
 
-    return list(all_skills.values())
+    user_skills, project_skills = await asyncio.gather(
+        scan(user_skills_dir, "user"), scan(project_skills_dir, "project")
+    )
+    return _merge_skills(user_skills, project_skills)
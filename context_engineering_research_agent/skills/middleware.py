@@ -1,11 +1,15 @@
 """스킬 시스템 미들웨어.
 
-Progressive Disclosure 패턴으로 Agent Skills 메타데이터를 시스템 프롬프트에 주입합니다.
+Progressive Disclosure 패턴으로 Agent Skills 메타데이터(이름 + 설명)를 시스템
+프롬프트에 주입하고, 전체 지침은 load_skill 도구로 필요할 때만 읽게 합니다.
 """
 
+import functools
+import string
+import sys
 from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import Any, NotRequired, TypedDict, cast
+from typing import Annotated, Any, NotRequired, TypedDict, cast
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -13,18 +17,70 @@ from langchain.agents.middleware.types import (
     ModelRequest,
     ModelResponse,
 )
-from langchain_core.messages import SystemMessage
+from langchain.tools import ToolRuntime
+from langchain_core.messages import AnyMessage, SystemMessage, ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
 from langgraph.runtime import Runtime
+from langgraph.types import Command
 
-from context_engineering_research_agent.skills.load import SkillMetadata, list_skills
+from context_engineering_research_agent.context_strategies.caching import (
+    ProviderType,
+    detect_openrouter_sub_provider,
+    detect_provider,
+    requires_cache_control_marker,
+)
+from context_engineering_research_agent.skills.load import (
+    SkillMetadata,
+    alist_skills,
+    list_skills,
+)
+
+# (사용자 스킬 디렉토리, 프로젝트 스킬 디렉토리) -> (변경 시각 서명, 스킬 목록)
+_SKILLS_CACHE: dict[
+    tuple[Path, Path | None], tuple[tuple[int, ...], list[SkillMetadata]]
+] = {}
+
+
+def _mtime_ns(path: Path | str | None) -> int:
+    if path is None:
+        return 0
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _skills_signature(
+    dirs: tuple[Path, Path | None], skills: list[SkillMetadata]
+) -> tuple[int, ...]:
+    """스킬 디렉토리와 각 SKILL.md의 변경 시각을 모은 서명을 만듭니다.
+
+    스킬 디렉토리 추가/삭제는 상위 디렉토리 시각으로, SKILL.md 수정/삭제는
+    파일 시각으로 감지합니다.
+    """
+    return (
+        *(_mtime_ns(directory) for directory in dirs),
+        *(_mtime_ns(skill["path"]) for skill in skills),
+    )
+
+
+def _loaded_skills_reducer(
+    left: list[str] | None, right: list[str] | None
+) -> list[str]:
+    """로드한 스킬 이름을 합칩니다. right가 None이면 목록을 비웁니다."""
+    if right is None:
+        return []
+    return list(dict.fromkeys([*(left or []), *right]))
 
 
 class SkillsState(AgentState):
     skills_metadata: NotRequired[list[SkillMetadata]]
+    loaded_skills: Annotated[NotRequired[list[str]], _loaded_skills_reducer]
 
 
 class SkillsStateUpdate(TypedDict):
     skills_metadata: list[SkillMetadata]
+    loaded_skills: list[str] | None
 
 
 SKILLS_SYSTEM_PROMPT = """
@@ -45,7 +101,7 @@ SKILLS_SYSTEM_PROMPT = """
 필요할 때만 전체 지침을 읽습니다:
 
 1. 스킬 적용 여부 판단: 사용자 요청이 스킬 설명과 일치하는지 확인
-2. 전체 지침 읽기: read_file로 SKILL.md 경로 읽기
+2. 전체 지침 읽기: load_skill 도구에 스킬 이름을 넘겨 SKILL.md 읽기
 3. 지침 따르기: SKILL.md에는 단계별 워크플로우와 예시 포함
 4. 지원 파일 활용: 스킬에 Python 스크립트나 설정 파일 포함 가능
 
@@ -56,6 +112,61 @@ SKILLS_SYSTEM_PROMPT = """
 """
 
 
+@functools.lru_cache(maxsize=8)
+def _split_prompt_template(template: str) -> tuple[str, str, str] | None:
+    """템플릿을 {skills_locations}, {skills_list} 자리표시자 기준으로 세 조각으로 나눕니다.
+
+    조각은 intern해 두고 렌더링은 문자열 결합만으로 합니다. 다른 필드나
+    변환/포맷 지정이 있는 템플릿이면 None을 반환해 str.format에 맡깁니다.
+    """
+    chunks = [""]
+    fields = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        chunks[-1] += literal
+        if field is not None:
+            fields.append((field, spec, conversion))
+            chunks.append("")
+    if fields != [("skills_locations", "", None), ("skills_list", "", None)]:
+        return None
+    head, mid, tail = (sys.intern(chunk) for chunk in chunks)
+    return head, mid, tail
+
+
+def _render_skills_prompt(
+    template: str, skills_locations: str, skills_list: str
+) -> str:
+    parts = _split_prompt_template(template)
+    if parts is None:
+        return template.format(
+            skills_locations=skills_locations, skills_list=skills_list
+        )
+    head, mid, tail = parts
+    return f"{head}{skills_locations}{mid}{skills_list}{tail}"
+
+
+def _render_skill(skill: SkillMetadata) -> str:
+    """스킬 목록에 들어갈 한 줄짜리 항목을 만듭니다.
+
+    SKILL.md 경로는 load_skill 결과에 담기므로 여기서는 이름과 설명만 넣습니다.
+    """
+    return f"- **{skill['name']}**: {skill['description']}"
+
+
+def _skill_header(skill_md_path: Path) -> str:
+    """load_skill 결과의 첫 줄. 결과가 아직 대화에 남아 있는지 찾을 때도 씁니다."""
+    return f"스킬 디렉토리: `{skill_md_path.parent}`"
+
+
+def _has_tool_message(messages: list[AnyMessage], header: str) -> bool:
+    """header로 시작하는 ToolMessage가 대화 기록에 남아 있는지 확인합니다."""
+    return any(
+        isinstance(message, ToolMessage)
+        and isinstance(message.content, str)
+        and message.content.startswith(header)
+        for message in reversed(messages)
+    )
+
+
 class SkillsMiddleware(AgentMiddleware):
     """Progressive Disclosure 패턴으로 스킬을 노출하는 미들웨어."""
 
@@ -75,6 +186,72 @@ class SkillsMiddleware(AgentMiddleware):
         )
         self.user_skills_display = f"~/.deepagents/{assistant_id}/skills"
         self.system_prompt_template = SKILLS_SYSTEM_PROMPT
+        self._skills_locations = self._format_skills_locations()
+        # (캐시 키, 렌더링된 스킬 섹션). skills_metadata는 before_agent에서만
+        # 바뀌므로 같은 세션의 모델 호출들은 직전 결과를 재사용합니다.
+        self._section_cache: tuple[tuple[Any, ...], str] | None = None
+        self.tools = [self._create_load_skill_tool()]
+        # (모델, cache_control 마커 필요 여부). 모델이 바뀔 때만 다시 판단합니다.
+        self._cache_marker_model: tuple[Any, bool] | None = None
+        # (입력 키, 완성된 시스템 메시지)
+        self._message_cache: tuple[tuple[Any, ...], SystemMessage] | None = None
+
+    def _create_load_skill_tool(self) -> BaseTool:
+        def load_skill(name: str, runtime: ToolRuntime) -> str | Command:
+            """스킬의 전체 지침(SKILL.md)을 읽습니다.
+
+            Args:
+                name: 스킬 이름.
+
+            Returns:
+                SKILL.md 내용.
+            """
+            state = cast("SkillsState", runtime.state)
+            skills = state.get("skills_metadata", [])
+            skill = next((s for s in skills if s["name"] == name), None)
+            if skill is None:
+                available = ", ".join(f"`{s['name']}`" for s in skills) or "없음"
+                return f"스킬 '{name}'이 존재하지 않습니다. 사용 가능: {available}"
+
+            skill_md_path = Path(skill["path"])
+            header = _skill_header(skill_md_path)
+            # 이전 결과가 compaction/요약으로 대화에서 빠졌다면 다시 읽어 줍니다.
+            if name in state.get("loaded_skills", []) and _has_tool_message(
+                state.get("messages", []), header
+            ):
+                return (
+                    f"'{name}' 스킬은 이미 로드되었습니다. "
+                    "이전 load_skill 결과의 지침을 따르세요."
+                )
+
+            try:
+                content = skill_md_path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                return f"스킬 '{name}' 읽기 오류: {e}"
+
+            return Command(
+                update={
+                    "loaded_skills": [name],
+                    "messages": [
+                        ToolMessage(
+                            f"{header}\n\n{content}",
+                            tool_call_id=runtime.tool_call_id,
+                        )
+                    ],
+                }
+            )
+
+        return StructuredTool.from_function(
+            name="load_skill",
+            func=load_skill,
+            description="""스킬의 전체 지침(SKILL.md)을 읽습니다.
+
+사용법:
+- name: 시스템 프롬프트의 스킬 목록에 있는 스킬 이름
+
+스킬 지침에 언급된 지원 파일은 결과에 표시된 스킬 디렉토리 아래에 있습니다.
+같은 실행에서 이미 로드한 스킬은 이전 결과가 대화에 남아 있으면 다시 읽지 않습니다.""",
+        )
 
     def _format_skills_locations(self) -> str:
         locations = [f"**사용자 스킬**: `{self.user_skills_display}`"]
@@ -91,82 +268,155 @@ class SkillsMiddleware(AgentMiddleware):
                 locations.append(f"{self.project_skills_dir}/")
             return f"(사용 가능한 스킬 없음. {' 또는 '.join(locations)}에서 스킬 생성 가능)"
 
-        user_skills = [s for s in skills if s["source"] == "user"]
-        project_skills = [s for s in skills if s["source"] == "project"]
-
-        lines = []
-
-        if user_skills:
-            lines.append("**사용자 스킬:**")
-            for skill in user_skills:
-                lines.append(f"- **{skill['name']}**: {skill['description']}")
-                lines.append(f"  → 전체 지침: `{skill['path']}`")
-            lines.append("")
-
-        if project_skills:
-            lines.append("**프로젝트 스킬:**")
-            for skill in project_skills:
-                lines.append(f"- **{skill['name']}**: {skill['description']}")
-                lines.append(f"  → 전체 지침: `{skill['path']}`")
-
-        return "\n".join(lines)
+        rendered: dict[str, list[str]] = {"user": [], "project": []}
+        for skill in skills:
+            blocks = rendered.get(skill["source"])
+            if blocks is not None:
+                blocks.append(_render_skill(skill))
+
+        sections = []
+        if rendered["user"]:
+            sections.append("\n".join(["**사용자 스킬:**", *rendered["user"], ""]))
+        if rendered["project"]:
+            sections.append("\n".join(["**프로젝트 스킬:**", *rendered["project"]]))
+        return "\n".join(sections)
+
+    def _cached_skills(self) -> list[SkillMetadata] | None:
+        """디렉토리가 마지막 스캔 이후 바뀌지 않았으면 캐시된 스킬 목록을 반환합니다."""
+        dirs = (self.skills_dir, self.project_skills_dir)
+        cached = _SKILLS_CACHE.get(dirs)
+        if cached is not None and cached[0] == _skills_signature(dirs, cached[1]):
+            return cached[1]
+        return None
+
+    def _store_skills(self, skills: list[SkillMetadata]) -> dict[str, Any]:
+        dirs = (self.skills_dir, self.project_skills_dir)
+        _SKILLS_CACHE[dirs] = (_skills_signature(dirs, skills), skills)
+        return self._skills_update(skills)
+
+    @staticmethod
+    def _skills_update(skills: list[SkillMetadata]) -> dict[str, Any]:
+        # 로드 기록은 실행마다 초기화합니다. 이전 실행의 load_skill 결과는
+        # 요약 등으로 대화에서 사라졌을 수 있기 때문입니다.
+        return cast(
+            "dict[str, Any]",
+            SkillsStateUpdate(skills_metadata=list(skills), loaded_skills=None),
+        )
 
     def before_agent(
         self,
         state: AgentState[Any],  # noqa: ARG002
         runtime: Runtime,  # noqa: ARG002
     ) -> dict[str, Any] | None:
-        skills = list_skills(
-            user_skills_dir=self.skills_dir,
-            project_skills_dir=self.project_skills_dir,
+        skills = self._cached_skills()
+        if skills is not None:
+            return self._skills_update(skills)
+        return self._store_skills(
+            list_skills(
+                user_skills_dir=self.skills_dir,
+                project_skills_dir=self.project_skills_dir,
+            )
         )
-        return cast("dict[str, Any]", SkillsStateUpdate(skills_metadata=skills))
 
-    def wrap_model_call(
+    async def abefore_agent(
         self,
-        request: ModelRequest,
-        handler: Callable[[ModelRequest], ModelResponse],
-    ) -> ModelResponse:
-        skills_metadata = cast(
-            "list[SkillMetadata]", request.state.get("skills_metadata", [])
+        state: AgentState[Any],  # noqa: ARG002
+        runtime: Runtime,  # noqa: ARG002
+    ) -> dict[str, Any] | None:
+        skills = self._cached_skills()
+        if skills is not None:
+            return self._skills_update(skills)
+        return self._store_skills(
+            await alist_skills(
+                user_skills_dir=self.skills_dir,
+                project_skills_dir=self.project_skills_dir,
+            )
         )
 
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
+    def _skills_section(self, skills: list[SkillMetadata]) -> str:
+        key = (
+            self.system_prompt_template,
+            *((s["name"], s["description"], s["path"], s["source"]) for s in skills),
         )
-
-        if request.system_prompt:
-            system_prompt = request.system_prompt + "\n\n" + skills_section
+        cached = self._section_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        section = _render_skills_prompt(
+            self.system_prompt_template,
+            self._skills_locations,
+            self._format_skills_list(skills),
+        )
+        self._section_cache = (key, section)
+        return section
+
+    def _needs_cache_marker(self, model: Any) -> bool:
+        """모델이 cache_control 마커를 요구하는 Provider(Anthropic 계열)인지 확인합니다."""
+        cached = self._cache_marker_model
+        if cached is not None and cached[0] is model:
+            return cached[1]
+        provider = detect_provider(model)
+        sub_provider = None
+        if provider is ProviderType.OPENROUTER:
+            model_name = getattr(model, "model_name", None) or ""
+            sub_provider = detect_openrouter_sub_provider(str(model_name))
+        needs_marker = requires_cache_control_marker(provider, sub_provider)
+        self._cache_marker_model = (model, needs_marker)
+        return needs_marker
+
+    def _build_system_message(self, request: ModelRequest) -> SystemMessage:
+        """스킬 섹션을 붙인 시스템 메시지를 만듭니다.
+
+        입력(기존 시스템 프롬프트, 스킬 섹션, 마커 여부)이 직전과 같으면 직전
+        메시지 객체를 그대로 반환합니다.
+        """
+        state = cast("SkillsState", request.state)
+        skills_section = self._skills_section(state.get("skills_metadata", []))
+        needs_marker = self._needs_cache_marker(request.model)
+        base = request.system_message.content if request.system_message else ""
+
+        key = (base, skills_section, needs_marker)
+        cached = self._message_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if needs_marker:
+            # 세션 동안 고정된 스킬 섹션을 별도 블록으로 두고 cache breakpoint를 답니다.
+            skills_block = {
+                "type": "text",
+                "text": skills_section,
+                "cache_control": {"type": "ephemeral"},
+            }
+            if isinstance(base, list):
+                blocks = [*base, skills_block]
+            elif base:
+                blocks = [{"type": "text", "text": base}, skills_block]
+            else:
+                blocks = [skills_block]
+            message = SystemMessage(content=blocks)  # type: ignore[arg-type]
         else:
-            system_prompt = skills_section
+            base_prompt = request.system_prompt
+            message = SystemMessage(
+                "\n\n".join((base_prompt, skills_section))
+                if base_prompt
+                else skills_section
+            )
 
-        return handler(request.override(system_message=SystemMessage(system_prompt)))
+        self._message_cache = (key, message)
+        return message
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        system_message = self._build_system_message(request)
+        return handler(request.override(system_message=system_message))
 
     async def awrap_model_call(
         self,
         request: ModelRequest,
         handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
     ) -> ModelResponse:
-        state = cast("SkillsState", request.state)
-        skills_metadata = state.get("skills_metadata", [])
-
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
-        )
-
-        if request.system_prompt:
-            system_prompt = request.system_prompt + "\n\n" + skills_section
-        else:
-            system_prompt = skills_section
-
-        return await handler(
-            request.override(system_message=SystemMessage(system_prompt))
-        )
+        system_message = self._build_system_message(request)
+        return await handler(request.override(system_message=system_message))
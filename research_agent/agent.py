@@ -13,13 +13,11 @@ Multi-SubAgent System (Claude Code 패턴 기반):
 SubAgent는 subagent_type 파라미터로 선택되며 각각 격리된 컨텍스트에서 실행됩니다.
 """
 
-from datetime import datetime
-from pathlib import Path
+from __future__ import annotations
 
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend
-from langchain.tools import ToolRuntime
-from langchain_openai import ChatOpenAI
+import functools
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from research_agent.prompts import (
     EXPLORER_INSTRUCTIONS,
@@ -27,30 +25,32 @@ from research_agent.prompts import (
     SUBAGENT_DELEGATION_INSTRUCTIONS,
     SYNTHESIZER_INSTRUCTIONS,
 )
-from research_agent.researcher import (
-    get_researcher_subagent,  # NEW: Autonomous researcher
-)
-from research_agent.skills import SkillsMiddleware
-from research_agent.tools import tavily_search, think_tool
+
+if TYPE_CHECKING:
+    from deepagents.backends import CompositeBackend, FilesystemBackend
+    from langchain.tools import ToolRuntime
+    from langchain_openai import ChatOpenAI
+    from langgraph.graph.state import CompiledStateGraph
+
+    from research_agent.skills import SkillsMiddleware
+
+# deepagents/langchain_openai/도구 모듈은 import 비용이 크므로 에이전트 구성
+# 요소를 처음 사용할 때 함수 안에서 import합니다. `agent`, `model`,
+# `ALL_SUBAGENTS` 등 기존 모듈 속성은 모듈 __getattr__로 그대로 제공됩니다.
 
 # 한도 설정
 max_concurrent_research_units = 3
 max_researcher_iterations = 3
 
-# 현재 날짜 계산
-current_date = datetime.now().strftime("%Y-%m-%d")
-
 # 오케스트레이터용 지침 결합
 # NOTE: Researcher는 이제 자율적 DeepAgent로 전환됨 (researcher/ 모듈)
+# 모듈 로드 시 한 번만 조립하므로 모든 호출이 같은 바이트열의 프롬프트를 씁니다.
+_SUBAGENT_DELEGATION = SUBAGENT_DELEGATION_INSTRUCTIONS.format(
+    max_concurrent_research_units=max_concurrent_research_units,
+    max_researcher_iterations=max_researcher_iterations,
+)
 INSTRUCTIONS = (
-    RESEARCH_WORKFLOW_INSTRUCTIONS
-    + "\n\n"
-    + "=" * 80
-    + "\n\n"
-    + SUBAGENT_DELEGATION_INSTRUCTIONS.format(
-        max_concurrent_research_units=max_concurrent_research_units,
-        max_researcher_iterations=max_researcher_iterations,
-    )
+    f"{RESEARCH_WORKFLOW_INSTRUCTIONS}\n\n{'=' * 80}\n\n{_SUBAGENT_DELEGATION}"
 )
 
 # =============================================================================
@@ -73,53 +73,80 @@ explorer_agent = {
     "tools": [],  # SubAgentMiddleware가 기본 filesystem 도구 제공
 }
 
+
 # 3. Synthesizer SubAgent: 연구 결과 통합
 # - 용도: 다중 연구 결과를 통합하여 보고서 작성
 # - 도구: read_file, write_file, think_tool
-synthesizer_agent = {
-    "name": "synthesizer",
-    "description": "Synthesize multiple research findings into coherent reports. Use for combining sub-agent results, creating summaries, and writing final reports.",
-    "system_prompt": SYNTHESIZER_INSTRUCTIONS,
-    "tools": [think_tool],  # think_tool
-}
+@functools.cache
+def get_synthesizer_agent() -> dict[str, Any]:
+    from research_agent.tools import think_tool
+
+    return {
+        "name": "synthesizer",
+        "description": "Synthesize multiple research findings into coherent reports. Use for combining sub-agent results, creating summaries, and writing final reports.",
+        "system_prompt": SYNTHESIZER_INSTRUCTIONS,
+        "tools": [think_tool],  # think_tool
+    }
+
 
 # Simple SubAgent 목록 (researcher는 동적으로 추가)
-SIMPLE_SUBAGENTS = [explorer_agent, synthesizer_agent]
+@functools.cache
+def get_simple_subagents() -> list[dict[str, Any]]:
+    return [explorer_agent, get_synthesizer_agent()]
+
+
+@functools.cache
+def get_model() -> ChatOpenAI:
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model="gpt-4.1", temperature=0.0)
 
-model = ChatOpenAI(model="gpt-4.1", temperature=0.0)
 
 # Backend 설정
 
-# 1. 로컬 파일 시스템 백엔드 생성 (현재의 부모 디렉터리를 루트로 설정)
+# 1. 로컬 파일 시스템 백엔드 (현재의 부모 디렉터리를 루트로 설정)
 BASE_DIR = Path(__file__).resolve().parent.parent
 RESEARCH_WORKSPACE_DIR = BASE_DIR / "research_workspace"
 
-fs_backend = FilesystemBackend(
-    root_dir=RESEARCH_WORKSPACE_DIR,
-    virtual_mode=True,
-    max_file_size_mb=20,
-)
+
+@functools.cache
+def get_fs_backend() -> FilesystemBackend:
+    from deepagents.backends import FilesystemBackend
+
+    return FilesystemBackend(
+        root_dir=RESEARCH_WORKSPACE_DIR,
+        virtual_mode=True,
+        max_file_size_mb=20,
+    )
+
 
 # 3. Skills 디렉토리 설정 (프로젝트 레벨 스킬만 사용)
 PROJECT_SKILLS_DIR = BASE_DIR / "skills"
 
+
 # SkillsMiddleware 인스턴스 생성
 # - Progressive Disclosure: 스킬 메타데이터만 시스템 프롬프트에 주입
 # - 에이전트가 필요할 때만 전체 SKILL.md 읽기
-skills_middleware = SkillsMiddleware(
-    skills_dir=PROJECT_SKILLS_DIR,  # 프로젝트 스킬을 기본으로 사용
-    assistant_id="research",
-    project_skills_dir=PROJECT_SKILLS_DIR,
-)
+@functools.cache
+def get_skills_middleware() -> SkillsMiddleware:
+    from research_agent.skills import SkillsMiddleware
+
+    return SkillsMiddleware(
+        skills_dir=PROJECT_SKILLS_DIR,  # 프로젝트 스킬을 기본으로 사용
+        assistant_id="research",
+        project_skills_dir=PROJECT_SKILLS_DIR,
+    )
 
 
 # 2. CompositeBackend를 factory 함수로 구성 (문서 권장 패턴)
-def backend_factory(rt: ToolRuntime):
+def backend_factory(rt: ToolRuntime) -> CompositeBackend:
     """런타임을 받아 CompositeBackend를 생성하는 factory 함수."""
+    from deepagents.backends import CompositeBackend, StateBackend
+
     return CompositeBackend(
         default=StateBackend(rt),  # 기본적으로는 인메모리 상태 사용
         routes={
-            "/": fs_backend  # '/'로 시작하는 경로는 로컬 파일 시스템으로 라우팅
+            "/": get_fs_backend()  # '/'로 시작하는 경로는 로컬 파일 시스템으로 라우팅
         },
     )
 
@@ -133,21 +160,57 @@ def backend_factory(rt: ToolRuntime):
 # 2. Multi-SubAgent: researcher (CompiledSubAgent), explorer, synthesizer
 # 3. FilesystemBackend: $PROJECT_ROOT/research_workspace/에 영구 저장
 
+
 # Researcher는 자율적 DeepAgent (CompiledSubAgent)로 생성
 # Backend를 공유하여 중간 결과 저장 가능
-researcher_subagent = get_researcher_subagent(
-    model=model,
-    backend=backend_factory,  # Backend 공유
-)
+@functools.cache
+def get_researcher_subagent() -> dict[str, Any]:
+    from research_agent.researcher import get_researcher_subagent as _researcher
+
+    return _researcher(
+        model=get_model(),
+        backend=backend_factory,  # Backend 공유
+    )
+
 
 # 전체 SubAgent 목록 구성 (CompiledSubAgent + Simple SubAgents)
-ALL_SUBAGENTS = [researcher_subagent, *SIMPLE_SUBAGENTS]
-
-agent = create_deep_agent(
-    model=model,
-    tools=[tavily_search, think_tool],
-    system_prompt=INSTRUCTIONS,
-    backend=backend_factory,
-    subagents=ALL_SUBAGENTS,  # 다중 전문화 SubAgent (researcher는 CompiledSubAgent)
-    middleware=[skills_middleware],
-)
+@functools.cache
+def get_all_subagents() -> list[dict[str, Any]]:
+    return [get_researcher_subagent(), *get_simple_subagents()]
+
+
+@functools.cache
+def get_agent() -> CompiledStateGraph:
+    """오케스트레이터 에이전트를 처음 호출할 때 만들어 반환합니다."""
+    from deepagents import create_deep_agent
+
+    from research_agent.tools import tavily_search, think_tool
+
+    return create_deep_agent(
+        model=get_model(),
+        tools=[tavily_search, think_tool],
+        system_prompt=INSTRUCTIONS,
+        backend=backend_factory,
+        subagents=get_all_subagents(),  # 다중 전문화 SubAgent (researcher는 CompiledSubAgent)
+        middleware=[get_skills_middleware()],
+    )
+
+
+# 기존 모듈 속성 이름 -> 지연 생성 함수 (langgraph.json의 `agent.py:agent` 포함)
+_LAZY_ATTRIBUTES = {
+    "agent": get_agent,
+    "model": get_model,
+    "fs_backend": get_fs_backend,
+    "skills_middleware": get_skills_middleware,
+    "synthesizer_agent": get_synthesizer_agent,
+    "SIMPLE_SUBAGENTS": get_simple_subagents,
+    "researcher_subagent": get_researcher_subagent,
+    "ALL_SUBAGENTS": get_all_subagents,
+}
+
+
+def __getattr__(name: str) -> Any:
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
@@ -43,6 +43,8 @@ v2 업데이트 (2026-01):
 
 from __future__ import annotations
 
+import functools
+import sys
 from datetime import datetime
 
 from deepagents import create_deep_agent
@@ -115,6 +117,27 @@ def _get_tools_for_depth(depth: ResearchDepth) -> list:
     return tools
 
 
+# ============================================================================
+# 프롬프트 헬퍼
+# ============================================================================
+
+
+@functools.lru_cache(maxsize=8)
+def _format_researcher_prompt(date: str) -> str:
+    """날짜를 채운 기본 자율 연구 프롬프트를 반환한다.
+
+    같은 날짜에는 같은 문자열 객체를 돌려주므로, 하루 동안 생성되는
+    에이전트들이 프롬프트를 다시 포맷하지 않고 동일한 접두사를 공유합니다.
+
+    Args:
+        date: "YYYY-MM-DD" 형식의 날짜 문자열.
+
+    Returns:
+        intern된 시스템 프롬프트 문자열.
+    """
+    return sys.intern(AUTONOMOUS_RESEARCHER_INSTRUCTIONS.format(date=date))
+
+
 # ============================================================================
 # 에이전트 팩토리
 # ============================================================================
@@ -175,9 +198,6 @@ def create_researcher_agent(
     # 깊이에 맞는 도구 선택
     tools = _get_tools_for_depth(depth)
 
-    # 현재 날짜 (프롬프트에 포함)
-    current_date = datetime.now().strftime("%Y-%m-%d")
-
     # 깊이에 따른 프롬프트 구성
     if depth in (ResearchDepth.DEEP, ResearchDepth.EXHAUSTIVE):
         # DEEP/EXHAUSTIVE: Ralph Loop 프롬프트 사용
@@ -188,7 +208,10 @@ def create_researcher_agent(
         )
     else:
         # QUICK/STANDARD: 기본 자율 연구 프롬프트 사용
-        formatted_prompt = AUTONOMOUS_RESEARCHER_INSTRUCTIONS.format(date=current_date)
+        # 날짜별로 캐시된 프롬프트를 재사용 (날짜가 바뀌면 새로 포맷)
+        formatted_prompt = _format_researcher_prompt(
+            datetime.now().strftime("%Y-%m-%d")
+        )
 
     # DeepAgent 생성 및 반환
     return create_deep_agent(
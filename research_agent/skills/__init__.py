@@ -8,14 +8,16 @@
 공개 API:
 - SkillsMiddleware: 에이전트 실행에 스킬을 통합하는 미들웨어
 - list_skills: 디렉토리에서 스킬 메타데이터 로드
+- alist_skills: list_skills의 비동기 버전
 - SkillMetadata: 스킬 메타데이터 구조용 TypedDict
 """
 
-from research_agent.skills.load import SkillMetadata, list_skills
+from research_agent.skills.load import SkillMetadata, alist_skills, list_skills
 from research_agent.skills.middleware import SkillsMiddleware
 
 __all__ = [
     "SkillsMiddleware",
     "list_skills",
+    "alist_skills",
     "SkillMetadata",
 ]
@@ -25,13 +25,23 @@ research_agent 프로젝트용으로 deepagents-cli에서 적응함.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import NotRequired, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # libyaml 없이 빌드된 PyYAML
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger(__name__)
 
 # SKILL.md 파일 최대 크기 (10MB) - DoS 방지
@@ -41,6 +51,28 @@ MAX_SKILL_FILE_SIZE = 10 * 1024 * 1024
 MAX_SKILL_NAME_LENGTH = 64
 MAX_SKILL_DESCRIPTION_LENGTH = 1024
 
+# 프론트매터만 필요하므로 파일 앞부분만 청크 단위로 읽습니다.
+MAX_FRONTMATTER_SIZE = 64 * 1024
+_FRONTMATTER_READ_CHUNK = 8 * 1024
+
+_FRONTMATTER_RE = re.compile(rb"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+_SKILL_NAME_RE = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+# 대부분의 SKILL.md 프론트매터는 `key: value` 한 줄 필드뿐이라 YAML 파서 없이 읽습니다.
+_SIMPLE_FIELD_RE = re.compile(r"([A-Za-z_][\w-]*):[ ]+(\S(?:.*\S)?)[ ]*")
+# 값이 이 문자로 시작하거나 이 패턴을 포함하면 YAML 문법일 수 있으므로 파서에 넘깁니다.
+_YAML_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_YAML_SYNTAX_RE = re.compile(r":\s|\s#")
+_YAML_SPECIAL_CHARS_RE = re.compile(
+    "[^\x09\x0a\x0d\x20-\x7e\xa0-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+    "|[\u2028\u2029]"
+)
+_STR_TAG = "tag:yaml.org,2002:str"
+_RESOLVER = yaml.resolver.Resolver()
+
+# SKILL.md 파싱은 I/O 대기가 대부분이므로 스레드로 겹쳐 실행합니다.
+_MAX_PARSE_WORKERS = 32
+
 
 class SkillMetadata(TypedDict):
     """Agent Skills 명세를 따르는 스킬 메타데이터."""
@@ -71,27 +103,25 @@ class SkillMetadata(TypedDict):
     """사전 승인된 도구의 공백 구분 목록."""
 
 
-def _is_safe_path(path: Path, base_dir: Path) -> bool:
-    """경로가 base_dir 내에 안전하게 포함되어 있는지 확인한다.
+def _is_safe_path(path: Path, resolved_base: Path) -> bool:
+    """경로가 resolved_base 내에 안전하게 포함되어 있는지 확인한다.
 
     심볼릭 링크나 경로 조작을 통한 디렉토리 탐색 공격을 방지한다.
-    두 경로 모두 정규 형식으로 변환(심볼릭 링크 따라감)하고
-    대상 경로가 기본 디렉토리 내에 있는지 확인한다.
+    대상 경로를 정규 형식으로 변환(심볼릭 링크 따라감)하고
+    기본 디렉토리 내에 있는지 확인한다.
 
     Args:
         path: 검증할 경로
-        base_dir: 경로가 포함되어야 하는 기본 디렉토리
+        resolved_base: 경로가 포함되어야 하는 기본 디렉토리 (resolve() 완료)
 
     Returns:
         경로가 base_dir 내에 안전하게 있으면 True, 그렇지 않으면 False
     """
     try:
-        resolved_path = path.resolve()
-        resolved_base = base_dir.resolve()
-        resolved_path.relative_to(resolved_base)
+        path.resolve().relative_to(resolved_base)
         return True
     except ValueError:
-        # 경로가 base_dir의 하위 디렉토리가 아님
+        # 경로가 resolved_base의 하위 디렉토리가 아님
         return False
     except (OSError, RuntimeError):
         # 경로 해석 오류 (예: 순환 심볼릭 링크)
@@ -120,7 +150,7 @@ def _validate_skill_name(name: str, directory_name: str) -> tuple[bool, str]:
     if len(name) > MAX_SKILL_NAME_LENGTH:
         return False, "이름이 64자를 초과합니다"
     # 패턴: 소문자 영숫자, 세그먼트 사이에 단일 하이픈
-    if not re.match(r"^[a-z0-9]+(-[a-z0-9]+)*$", name):
+    if not _SKILL_NAME_RE.match(name):
         return False, "이름은 소문자 영숫자와 단일 하이픈만 사용해야 합니다"
     if name != directory_name:
         return (
@@ -130,6 +160,65 @@ def _validate_skill_name(name: str, directory_name: str) -> tuple[bool, str]:
     return True, ""
 
 
+def _is_plain_string(value: str) -> bool:
+    """YAML이 값을 그대로 문자열로 해석하는지 확인한다 (숫자, 불리언, null 등 제외)."""
+    return _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+
+
+def _parse_simple_frontmatter(frontmatter_str: str) -> dict[str, str] | None:
+    """한 줄짜리 `key: value` 필드만 있는 프론트매터를 YAML 파서 없이 파싱한다.
+
+    name/description 같은 평범한 문자열 필드만 있는 일반적인 SKILL.md를
+    정규식 한 번으로 처리한다. 따옴표, 블록 스칼라, 중첩 매핑, 주석 등
+    YAML 문법이 보이거나 값이 문자열이 아닌 타입으로 해석될 수 있으면
+    YAML 파서와 결과가 달라질 수 있으므로 None을 반환한다.
+
+    Args:
+        frontmatter_str: --- 구분자 사이의 프론트매터 본문
+
+    Returns:
+        필드 딕셔너리, 간단한 형식이 아니면 None (YAML 파서로 대체)
+    """
+    # YAML은 탭을 구분자나 값 안에서 허용하지 않는 경우가 있으므로 파서에 맡깁니다.
+    if "\t" in frontmatter_str or _YAML_SPECIAL_CHARS_RE.search(frontmatter_str):
+        return None
+    fields: dict[str, str] = {}
+    for line in frontmatter_str.split("\n"):
+        if not line.strip():
+            continue
+        match = _SIMPLE_FIELD_RE.fullmatch(line)
+        if match is None:
+            return None
+        key, value = match.groups()
+        if (
+            value[0] in _YAML_INDICATORS
+            or value[-1] == ":"
+            or _YAML_SYNTAX_RE.search(value)
+            or not _is_plain_string(key)
+            or not _is_plain_string(value)
+        ):
+            return None
+        fields[key] = value
+    return fields or None
+
+
+def _read_frontmatter(skill_md_path: Path) -> str | None:
+    """SKILL.md 앞부분만 읽어 프론트매터 본문을 반환합니다. 없으면 None."""
+    buffer = bytearray()
+    with skill_md_path.open("rb") as f:
+        while len(buffer) < MAX_FRONTMATTER_SIZE:
+            chunk = f.read(_FRONTMATTER_READ_CHUNK)
+            if not chunk:
+                break
+            buffer += chunk
+            if not buffer.startswith(b"---"):
+                return None
+            match = _FRONTMATTER_RE.match(buffer)
+            if match:
+                return match.group(1).decode("utf-8")
+    return None
+
+
 def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | None:
     """Agent Skills 명세에 따라 SKILL.md 파일에서 YAML 프론트매터를 파싱한다.
 
@@ -149,26 +238,23 @@ def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | N
             )
             return None
 
-        content = skill_md_path.read_text(encoding="utf-8")
-
         # --- 구분자 사이의 YAML 프론트매터 매칭
-        frontmatter_pattern = r"^---\s*\n(.*?)\n---\s*\n"
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-        if not match:
+        frontmatter_str = _read_frontmatter(skill_md_path)
+        if frontmatter_str is None:
             logger.warning(
                 "%s 건너뜀: 유효한 YAML 프론트매터를 찾을 수 없음", skill_md_path
             )
             return None
 
-        frontmatter_str = match.group(1)
-
-        # 적절한 중첩 구조 지원을 위해 safe_load로 YAML 파싱
-        try:
-            frontmatter_data = yaml.safe_load(frontmatter_str)
-        except yaml.YAMLError as e:
-            logger.warning("%s의 YAML이 유효하지 않음: %s", skill_md_path, e)
-            return None
+        # 단순한 `key: value` 필드는 직접 파싱하고, 그 외에는 중첩 구조 지원을
+        # 위해 SafeLoader로 YAML 파싱
+        frontmatter_data: Any = _parse_simple_frontmatter(frontmatter_str)
+        if frontmatter_data is None:
+            try:
+                frontmatter_data = yaml.load(frontmatter_str, Loader=_SafeLoader)
+            except yaml.YAMLError as e:
+                logger.warning("%s의 YAML이 유효하지 않음: %s", skill_md_path, e)
+                return None
 
         if not isinstance(frontmatter_data, dict):
             logger.warning("%s 건너뜀: 프론트매터가 매핑이 아님", skill_md_path)
@@ -243,8 +329,6 @@ def _list_skills_from_dir(skills_dir: Path, source: str) -> list[SkillMetadata]:
         name, description, path, source가 있는 스킬 메타데이터 딕셔너리 목록
     """
     skills_dir = skills_dir.expanduser()
-    if not skills_dir.exists():
-        return []
 
     # 보안 검사를 위한 기본 디렉토리 해석
     try:
@@ -252,32 +336,58 @@ def _list_skills_from_dir(skills_dir: Path, source: str) -> list[SkillMetadata]:
     except (OSError, RuntimeError):
         return []
 
-    skills: list[SkillMetadata] = []
+    candidates: list[Path] = []
 
-    # 하위 디렉토리 순회
-    for skill_dir in skills_dir.iterdir():
-        # 보안: 스킬 디렉토리 외부를 가리키는 심볼릭 링크 포착
-        if not _is_safe_path(skill_dir, resolved_base):
-            continue
-
-        if not skill_dir.is_dir():
-            continue
+    # 하위 디렉토리 순회. os.scandir는 디렉토리 항목의 종류를 함께 돌려주므로
+    # 항목마다 Path 객체를 만들고 stat하지 않아도 됩니다.
+    try:
+        with os.scandir(skills_dir) as entries:
+            skill_dirs = [entry for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
 
+    for entry in skill_dirs:
         # SKILL.md 파일 찾기
-        skill_md_path = skill_dir / "SKILL.md"
-        if not skill_md_path.exists():
+        skill_md = os.path.join(entry.path, "SKILL.md")
+        try:
+            mode = os.lstat(skill_md).st_mode
+        except OSError:
             continue
 
-        # 보안: 읽기 전에 SKILL.md 경로 검증
-        if not _is_safe_path(skill_md_path, resolved_base):
+        if entry.is_symlink() or stat.S_ISLNK(mode):
+            # 보안: 읽기 전에 SKILL.md 경로 검증. 스킬 디렉토리나 SKILL.md가 외부를 가리키는
+            # 심볼릭 링크일 수 있으므로 이때만 경로를 resolve()해 확인합니다.
+            if not _is_safe_path(Path(skill_md), resolved_base):
+                continue
+            if not os.path.isfile(skill_md):
+                continue
+        elif not stat.S_ISREG(mode):
             continue
 
-        # 메타데이터 파싱
-        metadata = _parse_skill_metadata(skill_md_path, source=source)
-        if metadata:
-            skills.append(metadata)
+        candidates.append(Path(skill_md))
+
+    if len(candidates) <= 1:
+        parsed = [_parse_skill_metadata(path, source) for path in candidates]
+    else:
+        workers = min(_MAX_PARSE_WORKERS, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = list(
+                executor.map(_parse_skill_metadata, candidates, repeat(source))
+            )
+    return [metadata for metadata in parsed if metadata]
+
+
+def _merge_skills(
+    user_skills: list[SkillMetadata], project_skills: list[SkillMetadata]
+) -> list[SkillMetadata]:
+    """사용자 스킬과 프로젝트 스킬을 병합한다 (내부 헬퍼).
 
-    return skills
+    프로젝트 스킬을 나중에 넣어 같은 이름의 사용자 스킬을 오버라이드한다.
+    """
+    all_skills: dict[str, SkillMetadata] = {}
+    for skill in (*user_skills, *project_skills):
+        all_skills[skill["name"]] = skill
+    return list(all_skills.values())
 
 
 def list_skills(
@@ -298,19 +408,40 @@ def list_skills(
         두 출처의 스킬 메타데이터를 병합한 목록.
         이름이 충돌할 때 프로젝트 스킬이 우선됨
     """
-    all_skills: dict[str, SkillMetadata] = {}
+    return _merge_skills(
+        _list_skills_from_dir(user_skills_dir, source="user")
+        if user_skills_dir
+        else [],
+        _list_skills_from_dir(project_skills_dir, source="project")
+        if project_skills_dir
+        else [],
+    )
 
-    # 사용자 스킬을 먼저 로드 (기본)
-    if user_skills_dir:
-        user_skills = _list_skills_from_dir(user_skills_dir, source="user")
-        for skill in user_skills:
-            all_skills[skill["name"]] = skill
 
-    # 프로젝트 스킬을 두 번째로 로드 (오버라이드/확장)
-    if project_skills_dir:
-        project_skills = _list_skills_from_dir(project_skills_dir, source="project")
-        for skill in project_skills:
-            # 프로젝트 스킬이 같은 이름의 사용자 스킬을 오버라이드
-            all_skills[skill["name"]] = skill
+async def alist_skills(
+    *,
+    user_skills_dir: Path | None = None,
+    project_skills_dir: Path | None = None,
+) -> list[SkillMetadata]:
+    """list_skills의 비동기 버전.
 
-    return list(all_skills.values())
+    사용자/프로젝트 디렉토리 스캔을 워커 스레드에서 동시에 실행하므로
+    이벤트 루프를 막지 않는다. 병합 규칙은 list_skills와 같다.
+
+    Args:
+        user_skills_dir: 사용자 레벨 스킬 디렉토리 경로
+        project_skills_dir: 프로젝트 레벨 스킬 디렉토리 경로
+
+    Returns:
+        두 출처의 스킬 메타데이터를 병합한 목록.
+    """
+
+    async def scan(skills_dir: Path | None, source: str) -> list[SkillMetadata]:
+        if not skills_dir:
+            return []
+        return await asyncio.to_thread(_list_skills_from_dir, skills_dir, source)
+
+    user_skills, project_skills = await asyncio.gather(
+        scan(user_skills_dir, "user"), scan(project_skills_dir, "project")
+    )
+    return _merge_skills(user_skills, project_skills)
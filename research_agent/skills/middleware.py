@@ -19,6 +19,9 @@ research_agent 프로젝트용으로 deepagents-cli에서 적응함.
 
 from __future__ import annotations
 
+import functools
+import string
+import sys
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any, NotRequired, TypedDict, cast
@@ -32,7 +35,7 @@ from langchain.agents.middleware.types import (
 from langchain_core.messages import SystemMessage
 from langgraph.runtime import Runtime
 
-from research_agent.skills.load import SkillMetadata, list_skills
+from research_agent.skills.load import SkillMetadata, alist_skills, list_skills
 
 
 class SkillsState(AgentState):
@@ -96,6 +99,45 @@ Note: Skills are tools that make you more capable and consistent. When in doubt,
 """
 
 
+@functools.lru_cache(maxsize=8)
+def _split_prompt_template(template: str) -> tuple[str, str, str] | None:
+    """템플릿을 {skills_locations}, {skills_list} 자리표시자 기준으로 나눈다.
+
+    모델 호출마다 str.format으로 템플릿을 다시 해석하지 않도록 고정된 세 조각을
+    한 번만 계산해 intern해 둔다.
+
+    Args:
+        template: 스킬 시스템 프롬프트 템플릿.
+
+    Returns:
+        (head, mid, tail) 튜플. 다른 필드나 변환/포맷 지정이 있으면 None.
+    """
+    chunks = [""]
+    fields = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        chunks[-1] += literal
+        if field is not None:
+            fields.append((field, spec, conversion))
+            chunks.append("")
+    if fields != [("skills_locations", "", None), ("skills_list", "", None)]:
+        return None
+    head, mid, tail = (sys.intern(chunk) for chunk in chunks)
+    return head, mid, tail
+
+
+def _render_skills_prompt(
+    template: str, skills_locations: str, skills_list: str
+) -> str:
+    """스킬 위치와 목록으로 템플릿을 채운다. 결과는 template.format과 같다."""
+    parts = _split_prompt_template(template)
+    if parts is None:
+        return template.format(
+            skills_locations=skills_locations, skills_list=skills_list
+        )
+    head, mid, tail = parts
+    return f"{head}{skills_locations}{mid}{skills_list}{tail}"
+
+
 class SkillsMiddleware(AgentMiddleware):
     """에이전트 스킬을 로드하고 노출하기 위한 미들웨어.
 
@@ -139,8 +181,13 @@ class SkillsMiddleware(AgentMiddleware):
         self.user_skills_display = f"~/.deepagents/{assistant_id}/skills"
         self.system_prompt_template = SKILLS_SYSTEM_PROMPT
 
-    def _format_skills_locations(self) -> str:
-        """시스템 프롬프트 표시용 스킬 위치를 포맷팅한다."""
+    @functools.cached_property
+    def _skills_locations(self) -> str:
+        """시스템 프롬프트 표시용 스킬 위치를 포맷팅한다.
+
+        입력(user_skills_display, project_skills_dir)은 __init__ 이후 바뀌지
+        않으므로 첫 접근 때 한 번만 만든다.
+        """
         locations = [f"**User Skills**: `{self.user_skills_display}`"]
         if self.project_skills_dir:
             locations.append(
@@ -202,6 +249,27 @@ class SkillsMiddleware(AgentMiddleware):
         )
         return {"skills_metadata": skills}
 
+    async def abefore_agent(
+        self, state: AgentState[Any], runtime: Runtime[Any]
+    ) -> dict[str, Any] | None:
+        """before_agent의 비동기 버전.
+
+        스킬 디렉토리 스캔을 워커 스레드에서 실행하여 이벤트 루프를 막지 않는다.
+
+        Args:
+            state: 현재 에이전트 상태.
+            runtime: 런타임 컨텍스트.
+
+        Returns:
+            skills_metadata가 채워진 업데이트된 상태.
+        """
+        _ = runtime
+        skills = await alist_skills(
+            user_skills_dir=self.skills_dir,
+            project_skills_dir=self.project_skills_dir,
+        )
+        return {"skills_metadata": skills}
+
     def wrap_model_call(
         self,
         request: ModelRequest,
@@ -224,13 +292,12 @@ class SkillsMiddleware(AgentMiddleware):
         )
 
         # 스킬 위치와 목록 포맷팅
-        skills_locations = self._format_skills_locations()
+        skills_locations = self._skills_locations
         skills_list = self._format_skills_list(skills_metadata)
 
         # 스킬 문서 포맷팅
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
+        skills_section = _render_skills_prompt(
+            self.system_prompt_template, skills_locations, skills_list
         )
 
         existing = str(request.system_message.content) if request.system_message else ""
@@ -260,13 +327,12 @@ class SkillsMiddleware(AgentMiddleware):
         skills_metadata = cast(list[SkillMetadata], state.get("skills_metadata", []))
 
         # 스킬 위치와 목록 포맷팅
-        skills_locations = self._format_skills_locations()
+        skills_locations = self._skills_locations
         skills_list = self._format_skills_list(skills_metadata)
 
         # 스킬 문서 포맷팅
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
+        skills_section = _render_skills_prompt(
+            self.system_prompt_template, skills_locations, skills_list
         )
 
         existing = str(request.system_message.content) if request.system_message else ""
@@ -0,0 +1,71 @@
+"""docker_archive tar 유틸리티 단위 테스트 (Docker 데몬 불필요)."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+
+from context_engineering_research_agent.backends.docker_archive import (
+    build_tar_archive,
+    extract_first_file,
+    make_ustar_archive,
+)
+
+
+def _read_members(archive: bytes) -> list[tuple[tarfile.TarInfo, bytes | None]]:
+    with tarfile.open(fileobj=io.BytesIO(archive), mode="r:") as tar:
+        members = []
+        for member in tar.getmembers():
+            file_obj = tar.extractfile(member) if member.isfile() else None
+            members.append((member, file_obj.read() if file_obj else None))
+        return members
+
+
+class TestMakeUstarArchive:
+    def test_single_file_matches_tarfile(self):
+        content = b"hello\n" * 200
+        archive = make_ustar_archive([("report.md", content)], 1700000000)
+
+        assert archive is not None
+        assert len(archive) % 512 == 0
+        [(member, data)] = _read_members(archive)
+        assert member.name == "report.md"
+        assert member.isfile()
+        assert member.size == len(content)
+        assert member.mode == 0o644
+        assert member.mtime == 1700000000
+        assert data == content
+
+    def test_nested_files_have_no_directory_entries(self):
+        archive = make_ustar_archive(
+            [("notes/sub/a.txt", b"a"), ("b.txt", b"")], 1700000000
+        )
+
+        assert archive is not None
+        members = _read_members(archive)
+        assert [(m.name, m.isfile()) for m, _ in members] == [
+            ("notes/sub/a.txt", True),
+            ("b.txt", True),
+        ]
+        assert [data for _, data in members] == [b"a", b""]
+
+    def test_falls_back_for_long_or_non_ascii_names(self):
+        assert make_ustar_archive([("a" * 101, b"x")], 0) is None
+        assert make_ustar_archive([("보고서.md", b"x")], 0) is None
+
+
+class TestBuildTarArchive:
+    def test_long_names_fall_back_to_tarfile(self):
+        long_dir = "d" * 120
+        archive = build_tar_archive([(f"{long_dir}/f.txt", b"data")], 1700000000)
+
+        [(member, data)] = _read_members(archive)
+        assert member.name == f"{long_dir}/f.txt"
+        assert member.isfile()
+        assert data == b"data"
+
+    def test_extract_first_file_roundtrip(self):
+        archive = build_tar_archive([("a/b.txt", b"x" * 70000)], 0)
+        chunks = [archive[i : i + 1000] for i in range(0, len(archive), 1000)]
+
+        assert extract_first_file(iter(chunks)) == b"x" * 70000
@@ -0,0 +1,118 @@
+"""DockerContainerPool 단위 테스트 (Docker 데몬 불필요)."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock, patch
+
+from context_engineering_research_agent.backends import docker_pool
+from context_engineering_research_agent.backends.docker_pool import (
+    DockerContainerPool,
+    close_all_pools,
+)
+from context_engineering_research_agent.backends.docker_shared import (
+    DockerConfig,
+    SharedDockerBackend,
+)
+
+
+def _make_pool(
+    min_size: int = 0, idle_ttl_seconds: float = 1800
+) -> DockerContainerPool:
+    client = MagicMock()
+
+    def run(*args, **kwargs):
+        container = MagicMock()
+        container.status = "running"
+        container.exec_run.return_value = MagicMock(exit_code=0)
+        return container
+
+    client.containers.run.side_effect = run
+    return DockerContainerPool(
+        DockerConfig(),
+        min_size=min_size,
+        idle_ttl_seconds=idle_ttl_seconds,
+        client=client,
+    )
+
+
+class TestDockerContainerPool:
+    def test_release_wipes_workspace_and_reuses_container(self):
+        pool = _make_pool()
+        container = pool.acquire()
+
+        pool.release(container)
+
+        command = container.exec_run.call_args.args[0]
+        assert command[:2] == ["sh", "-c"]
+        assert command[2].startswith("rm -rf /workspace/*")
+        assert pool.acquire() is container
+        pool.close()
+
+    def test_failed_wipe_stops_container(self):
+        pool = _make_pool()
+        container = pool.acquire()
+        container.exec_run.return_value = MagicMock(exit_code=1)
+
+        pool.release(container)
+
+        container.stop.assert_called_once()
+        assert pool.acquire() is not container
+        pool.close()
+
+    def test_reap_keeps_min_size(self):
+        pool = _make_pool(min_size=1, idle_ttl_seconds=0)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        pool.reap()
+
+        assert first.stop.called
+        assert not second.stop.called
+        pool.close()
+        assert second.stop.called
+
+    def test_fill_failure_is_logged(self, caplog):
+        pool = _make_pool(min_size=1)
+        pool._client.containers.run.side_effect = RuntimeError("daemon down")
+
+        with caplog.at_level(logging.WARNING, logger=docker_pool.__name__):
+            pool._fill()
+
+        assert "컨테이너 풀 예열 실패" in caplog.text
+        assert pool._idle.qsize() == 0
+        assert not pool._warming
+
+    def test_close_all_pools_stops_shared_pools(self):
+        pool = _make_pool()
+        container = pool.acquire()
+        pool.release(container)
+
+        with patch.dict(docker_pool._pools, {("test",): pool}, clear=True):
+            close_all_pools()
+            assert docker_pool._pools == {}
+
+        container.stop.assert_called_once()
+
+
+class TestSharedDockerBackendPool:
+    def test_pool_is_opt_in(self):
+        with patch.object(docker_pool.DockerContainerPool, "warm") as warm:
+            backend = SharedDockerBackend()
+
+        assert backend._pool is None
+        warm.assert_not_called()
+
+    def test_cleanup_returns_container_to_pool(self):
+        pool = _make_pool()
+        backend = SharedDockerBackend(pool=pool)
+
+        container_id = backend._ensure_container()
+        container = backend._container
+        backend.cleanup()
+
+        assert container_id == container.id
+        container.stop.assert_not_called()
+        assert pool.acquire() is container
+        pool.close()
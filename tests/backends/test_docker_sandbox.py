@@ -0,0 +1,63 @@
+"""DockerSandboxBackend 단위 테스트 (Docker 데몬 불필요)."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+from unittest.mock import MagicMock
+
+from docker.errors import NotFound
+
+from context_engineering_research_agent.backends.docker_sandbox import (
+    DockerSandboxBackend,
+)
+
+
+def _make_backend() -> tuple[DockerSandboxBackend, MagicMock]:
+    backend = DockerSandboxBackend("test-container", workspace_root="/workspace")
+    container = MagicMock()
+    backend._container_obj = container
+    return backend, container
+
+
+class TestDockerSandboxUpload:
+    def test_upload_is_single_put_archive_without_directory_entries(self):
+        backend, container = _make_backend()
+
+        responses = backend.upload_files([("notes/a.md", b"a"), ("b.md", b"b")])
+
+        assert [r.error for r in responses] == [None, None]
+        container.put_archive.assert_called_once()
+        target, archive = container.put_archive.call_args.args
+        assert target == "/workspace"
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            assert [(m.name, m.isfile()) for m in tar.getmembers()] == [
+                ("notes/a.md", True),
+                ("b.md", True),
+            ]
+
+    def test_upload_creates_missing_workspace_and_retries(self):
+        backend, container = _make_backend()
+        container.put_archive.side_effect = [
+            NotFound("Could not find the file /workspace in container"),
+            True,
+        ]
+        container.exec_run.return_value = MagicMock(exit_code=0, output=b"")
+
+        responses = backend.upload_files([("notes/a.md", b"a")])
+
+        assert responses[0].error is None
+        container.exec_run.assert_called_once_with(["mkdir", "-p", "/workspace"])
+        assert container.put_archive.call_count == 2
+
+    def test_failed_mkdir_reports_upload_error(self):
+        backend, container = _make_backend()
+        container.put_archive.side_effect = NotFound("Could not find the file")
+        container.exec_run.return_value = MagicMock(
+            exit_code=1, output=b"mkdir: Permission denied"
+        )
+
+        responses = backend.upload_files([("a.md", b"a")])
+
+        assert responses[0].error == "permission_denied"
+        container.put_archive.assert_called_once()
@@ -0,0 +1,216 @@
+"""SharedDockerBackend 단위 테스트 (Docker 데몬 불필요)."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import subprocess
+import tarfile
+import threading
+from unittest.mock import MagicMock
+
+from context_engineering_research_agent.backends.docker_shared import (
+    DockerConfig,
+    ExecuteResponse,
+    SharedDockerBackend,
+)
+
+
+def _make_backend() -> tuple[SharedDockerBackend, MagicMock]:
+    backend = SharedDockerBackend(DockerConfig(), container_id="test-container")
+    container = MagicMock()
+    backend._container = container
+    return backend, container
+
+
+class TestSharedDockerWrite:
+    def test_write_is_single_put_archive(self):
+        backend, container = _make_backend()
+
+        result = backend.write("/research/notes/a.md", "it's\n")
+
+        assert result.error is None
+        container.exec_run.assert_not_called()
+        container.put_archive.assert_called_once()
+        target, archive = container.put_archive.call_args.args
+        assert target == "/workspace"
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            members = tar.getmembers()
+            # 부모 디렉토리 엔트리가 없어야 기존 디렉토리의 권한이 유지됩니다.
+            assert [(m.name, m.isfile()) for m in members] == [
+                ("research/notes/a.md", True),
+            ]
+            file_obj = tar.extractfile(members[0])
+            assert file_obj is not None
+            assert file_obj.read() == b"it's\n"
+
+    def test_write_rejects_path_outside_workspace(self):
+        backend, container = _make_backend()
+
+        result = backend.write("/../etc/passwd", "x")
+
+        assert result.error is not None
+        container.put_archive.assert_not_called()
+
+    def test_write_creates_missing_workspace_and_retries(self):
+        from docker.errors import NotFound
+
+        backend, container = _make_backend()
+        container.put_archive.side_effect = [
+            NotFound("Could not find the file /workspace in container"),
+            True,
+        ]
+        container.exec_run.return_value = MagicMock(exit_code=0, output=b"")
+
+        result = backend.write("/notes/a.md", "x")
+
+        assert result.error is None
+        container.exec_run.assert_called_once_with(["mkdir", "-p", "/workspace"])
+        assert container.put_archive.call_count == 2
+
+
+class TestSharedDockerAsync:
+    def test_aexecute_runs_concurrently(self):
+        backend, _ = _make_backend()
+        client = backend._docker_client = MagicMock()
+        backend._shell._disabled = True
+        lock = threading.Lock()
+        counts = {"in_flight": 0, "peak": 0}
+        # 4개 호출이 모두 exec_start 안에 들어와야 통과합니다. 순차 실행이면
+        # 첫 호출이 timeout 뒤 BrokenBarrierError로 풀려 peak가 1에 머뭅니다.
+        all_started = threading.Barrier(4, timeout=5)
+
+        def exec_start(exec_id, stream):
+            with lock:
+                counts["in_flight"] += 1
+                counts["peak"] = max(counts["peak"], counts["in_flight"])
+            try:
+                all_started.wait()
+            except threading.BrokenBarrierError:
+                pass
+            with lock:
+                counts["in_flight"] -= 1
+            return iter([b"ok"])
+
+        client.api.exec_create.return_value = {"Id": "exec"}
+        client.api.exec_start.side_effect = exec_start
+        client.api.exec_inspect.return_value = {"ExitCode": 0}
+
+        async def run_all():
+            return await asyncio.gather(*(backend.aexecute("sleep") for _ in range(4)))
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run_all())
+        finally:
+            loop.close()
+
+        assert [result.output for result in results] == ["ok"] * 4
+        assert counts["peak"] == 4
+
+
+class TestSharedDockerExecute:
+    def test_output_stream_stops_at_cap(self):
+        backend, _ = _make_backend()
+        client = backend._docker_client = MagicMock()
+        backend._shell._disabled = True
+        chunks = (b"a" * 65536 for _ in range(160))  # 10MB
+        client.api.exec_create.return_value = {"Id": "exec"}
+        client.api.exec_start.return_value = chunks
+        client.api.exec_inspect.return_value = {"ExitCode": None}
+
+        result = backend.execute("yes a")
+
+        assert result.truncated
+        assert len(result.output) == 100000 + len("\n[출력이 잘렸습니다...]")
+        # 상한에 도달한 뒤에는 스트림을 더 읽지 않고 닫습니다.
+        assert next(chunks, None) is None
+
+
+class TestSharedDockerLsInfo:
+    def test_parses_find_output_with_spaces(self):
+        backend, _ = _make_backend()
+        backend.execute = MagicMock(
+            return_value=ExecuteResponse(output="d\tsub dir\0f\ta b.txt\0", exit_code=0)
+        )
+
+        entries = backend.ls_info("/research/")
+
+        command = backend.execute.call_args.args[0]
+        assert command.startswith("find /workspace/research/ -mindepth 1")
+        assert entries == [
+            {"path": "/research/sub dir", "is_dir": True},
+            {"path": "/research/a b.txt", "is_dir": False},
+        ]
+
+    def test_missing_directory_returns_empty(self):
+        backend, _ = _make_backend()
+        backend.execute = MagicMock(
+            return_value=ExecuteResponse(output="find: no such file", exit_code=1)
+        )
+
+        assert backend.ls_info("/missing") == []
+
+
+class TestSharedDockerStaleContainer:
+    def test_recreates_owned_container_after_it_disappears(self):
+        from docker.errors import NotFound
+
+        client = MagicMock()
+        dead, fresh = MagicMock(id="dead"), MagicMock(id="fresh")
+        dead.put_archive.side_effect = NotFound("No such container: dead")
+        client.containers.run.return_value = fresh
+        backend = SharedDockerBackend(use_pool=False)
+        backend._docker_client = client
+        backend._container_id = "dead"
+        backend._container = dead
+
+        result = backend.write("/a.txt", "x")
+
+        assert result.error is None
+        fresh.put_archive.assert_called_once()
+        assert backend._container_id == "fresh"
+
+    def test_path_not_found_is_not_retried(self):
+        from docker.errors import NotFound
+
+        backend, container = _make_backend()
+        container.get_archive.side_effect = NotFound("Could not find the file")
+
+        assert backend.read("/missing.txt").startswith("파일 읽기 오류")
+        container.get_archive.assert_called_once()
+
+
+class TestSharedDockerExecuteBatch:
+    def test_splits_output_and_exit_codes_per_command(self, tmp_path):
+        backend, _ = _make_backend()
+        scripts = []
+
+        def run_locally(script, max_output_bytes):
+            scripts.append(script)
+            completed = subprocess.run(
+                ["sh", "-c", script],
+                cwd=tmp_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            return completed.stdout, completed.returncode
+
+        backend._run = run_locally
+
+        results = backend.execute_batch(
+            ["mkdir -p a && echo made", "printf 'x'", "echo err >&2; exit 3"]
+        )
+
+        assert len(scripts) == 1
+        assert [(r.output, r.exit_code) for r in results] == [
+            ("made\n", 0),
+            ("x", 0),
+            ("err\n", 3),
+        ]
+        assert (tmp_path / "a").is_dir()
+
+    def test_empty_batch(self):
+        backend, _ = _make_backend()
+
+        assert backend.execute_batch([]) == []
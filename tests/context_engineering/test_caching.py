@@ -1,6 +1,10 @@
+import logging
+import sys
+import types
 from unittest.mock import MagicMock
 
 import pytest
+from langchain.agents.middleware.types import ModelRequest
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from context_engineering_research_agent.context_strategies.caching import (
@@ -9,6 +13,7 @@ from context_engineering_research_agent.context_strategies.caching import (
     ContextCachingStrategy,
     OpenRouterSubProvider,
     ProviderType,
+    compute_prefix_cache_key,
     detect_openrouter_sub_provider,
     detect_provider,
     requires_cache_control_marker,
@@ -109,6 +114,16 @@ class TestContextCachingStrategy:
 
         assert estimated == 100
 
+    def test_estimate_tokens_nested_blocks(self, strategy: ContextCachingStrategy):
+        content = [
+            "a" * 2,
+            [{"type": "text", "text": "b" * 3}, {"type": "image_url"}],
+            {"type": "text", "text": ["c" * 3]},
+        ]
+
+        # 블록별로 버림하지 않고 전체 길이(8자)를 한 번에 나눕니다.
+        assert strategy._estimate_tokens(content) == 2
+
     def test_should_cache_small_content(self, strategy: ContextCachingStrategy):
         small_content = "short text"
 
@@ -330,6 +345,42 @@ class TestContextCachingStrategyMultiProvider:
         assert result.was_cached is False
         assert result.cached_content_type == "auto_cached_by_openai"
 
+    def test_openai_passthrough_reuses_result(self):
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatOpenAI"
+        mock_model.__class__.__module__ = "langchain_openai"
+        mock_model.openai_api_base = None
+
+        strategy = ContextCachingStrategy(model=mock_model)
+        messages = [SystemMessage(content="System prompt " * 100)]
+
+        cached, first = strategy.apply_caching(messages, model=mock_model)
+        _, second = strategy.apply_caching(messages, model=mock_model)
+
+        assert cached is messages
+        assert first is second
+
+    def test_set_model_switches_specialized_path(self):
+        openai_model = MagicMock()
+        openai_model.__class__.__name__ = "ChatOpenAI"
+        openai_model.__class__.__module__ = "langchain_openai"
+        openai_model.openai_api_base = None
+        anthropic_model = MagicMock()
+        anthropic_model.__class__.__name__ = "ChatAnthropic"
+        anthropic_model.__class__.__module__ = "langchain_anthropic"
+
+        strategy = ContextCachingStrategy(
+            config=CachingConfig(min_cacheable_tokens=10), model=openai_model
+        )
+        messages = [SystemMessage(content="System prompt " * 100)]
+        _, before = strategy.apply_caching(messages)
+
+        strategy.set_model(anthropic_model)
+        _, after = strategy.apply_caching(messages)
+
+        assert before.was_cached is False
+        assert after.was_cached is True
+
     def test_gemini_skips_cache_markers(self):
         mock_model = MagicMock()
         mock_model.__class__.__name__ = "ChatGoogleGenerativeAI"
@@ -366,6 +417,136 @@ class TestContextCachingStrategyMultiProvider:
         assert strategy.provider == ProviderType.OPENAI
 
 
+class TestPrefixCache:
+    def _make_request(self, system_prompt: str) -> ModelRequest:
+        return ModelRequest(
+            model=MagicMock(),
+            messages=[HumanMessage(content="Hello")],
+            system_message=SystemMessage(content=system_prompt),
+        )
+
+    def test_compute_prefix_cache_key_is_stable(self):
+        assert compute_prefix_cache_key("prompt") == compute_prefix_cache_key("prompt")
+        assert compute_prefix_cache_key("prompt") != compute_prefix_cache_key("other")
+
+    def test_anthropic_reuses_cached_system_message(self):
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatAnthropic"
+        mock_model.__class__.__module__ = "langchain_anthropic"
+        strategy = ContextCachingStrategy(
+            config=CachingConfig(min_cacheable_tokens=10),
+            model=mock_model,
+        )
+        seen: list[ModelRequest] = []
+
+        def handler(request):
+            seen.append(request)
+            return MagicMock()
+
+        large_prompt = "System prompt " * 100
+        strategy.wrap_model_call(self._make_request(large_prompt), handler)
+        strategy.wrap_model_call(self._make_request(large_prompt), handler)
+
+        first, second = seen
+        assert first.system_message is second.system_message
+        assert first.system_message.content[-1]["cache_control"]["type"] == "ephemeral"
+
+    def test_cached_system_message_lookup_skips_hashing(self, monkeypatch):
+        from context_engineering_research_agent.context_strategies import caching
+
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatAnthropic"
+        mock_model.__class__.__module__ = "langchain_anthropic"
+        strategy = ContextCachingStrategy(
+            config=CachingConfig(min_cacheable_tokens=10),
+            model=mock_model,
+        )
+        hash_prompt = MagicMock(side_effect=compute_prefix_cache_key)
+        monkeypatch.setattr(caching, "compute_prefix_cache_key", hash_prompt)
+        seen: list[ModelRequest] = []
+
+        def handler(request):
+            seen.append(request)
+            return MagicMock()
+
+        for prompt in ("System prompt " * 100, "Other prompt " * 100):
+            strategy.wrap_model_call(self._make_request(prompt), handler)
+            strategy.wrap_model_call(self._make_request(prompt), handler)
+
+        assert seen[0].system_message is seen[1].system_message
+        assert seen[2].system_message is seen[3].system_message
+        assert seen[0].system_message is not seen[2].system_message
+        hash_prompt.assert_not_called()
+
+    def test_openai_sets_prompt_cache_key(self):
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatOpenAI"
+        mock_model.__class__.__module__ = "langchain_openai"
+        mock_model.openai_api_base = None
+        strategy = ContextCachingStrategy(model=mock_model, prefix_cache_key="key-1")
+        seen: list[ModelRequest] = []
+
+        def handler(request):
+            seen.append(request)
+            return MagicMock()
+
+        request = self._make_request("System prompt")
+        strategy.wrap_model_call(request, handler)
+
+        assert seen[0].model_settings["prompt_cache_key"] == "key-1"
+        assert seen[0].system_message is request.system_message
+
+    @pytest.mark.parametrize(
+        ("base_url", "expected"),
+        [
+            ("https://api.openai.com/v1", True),
+            ("http://localhost:8000/v1", False),
+            ("https://llm.internal.example.com/v1", False),
+        ],
+    )
+    def test_prompt_cache_key_only_for_openai_api(self, base_url, expected):
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatOpenAI"
+        mock_model.__class__.__module__ = "langchain_openai"
+        mock_model.openai_api_base = base_url
+        strategy = ContextCachingStrategy(model=mock_model, prefix_cache_key="key-1")
+        seen: list[ModelRequest] = []
+
+        def handler(request):
+            seen.append(request)
+            return MagicMock()
+
+        strategy.wrap_model_call(self._make_request("System prompt"), handler)
+
+        assert ("prompt_cache_key" in seen[0].model_settings) is expected
+
+    def test_anthropic_places_breakpoint_after_static_prefix(self):
+        mock_model = MagicMock()
+        mock_model.__class__.__name__ = "ChatAnthropic"
+        mock_model.__class__.__module__ = "langchain_anthropic"
+        static_prefix = "Static strategies " * 100
+        strategy = ContextCachingStrategy(
+            config=CachingConfig(min_cacheable_tokens=10),
+            model=mock_model,
+            static_prefix=static_prefix,
+        )
+        seen: list[ModelRequest] = []
+
+        def handler(request):
+            seen.append(request)
+            return MagicMock()
+
+        strategy.wrap_model_call(
+            self._make_request(static_prefix + "## Principles"), handler
+        )
+
+        static_block, tail_block = seen[0].system_message.content
+        assert static_block["text"] == static_prefix
+        assert static_block["cache_control"]["type"] == "ephemeral"
+        assert tail_block["text"] == "## Principles"
+        assert tail_block["cache_control"]["type"] == "ephemeral"
+
+
 class TestCacheTelemetry:
     def test_default_values(self):
         telemetry = CacheTelemetry(provider=ProviderType.OPENAI)
@@ -437,6 +618,32 @@ class TestCacheMetricsExtraction:
         assert telemetry.cache_read_tokens == 750
         assert telemetry.cache_hit_ratio == 0.75
 
+    def test_extract_cache_telemetry_gemini_3(self):
+        mock_response = MagicMock()
+        mock_response.usage_metadata = {"input_tokens": 1000}
+        mock_response.response_metadata = {"cached_content_token_count": 250}
+
+        telemetry = extract_cache_telemetry(mock_response, ProviderType.GEMINI_3)
+
+        assert telemetry.provider == ProviderType.GEMINI_3
+        assert telemetry.cache_read_tokens == 250
+
+    def test_raw_metadata_kept_only_when_requested(self):
+        mock_response = MagicMock()
+        mock_response.usage_metadata = {"input_tokens": 10}
+        mock_response.response_metadata = {}
+
+        lean = extract_cache_telemetry(mock_response, ProviderType.ANTHROPIC)
+        verbose = extract_cache_telemetry(
+            mock_response, ProviderType.ANTHROPIC, include_raw_metadata=True
+        )
+
+        assert lean.raw_metadata is None
+        assert verbose.raw_metadata == {
+            "usage": {"input_tokens": 10},
+            "response_metadata": {},
+        }
+
     def test_extract_cache_telemetry_unknown_provider(self):
         mock_response = MagicMock()
         mock_response.usage_metadata = {}
@@ -452,7 +659,7 @@ class TestPromptCachingTelemetryMiddleware:
     def test_initialization(self):
         middleware = PromptCachingTelemetryMiddleware()
 
-        assert middleware.telemetry_history == []
+        assert list(middleware.telemetry_history) == []
 
     def test_get_aggregate_stats_empty(self):
         middleware = PromptCachingTelemetryMiddleware()
@@ -463,7 +670,7 @@ class TestPromptCachingTelemetryMiddleware:
 
     def test_get_aggregate_stats_with_data(self):
         middleware = PromptCachingTelemetryMiddleware()
-        middleware._telemetry_history = [
+        for telemetry in [
             CacheTelemetry(
                 provider=ProviderType.ANTHROPIC,
                 cache_read_tokens=800,
@@ -476,7 +683,8 @@ class TestPromptCachingTelemetryMiddleware:
                 cache_write_tokens=100,
                 total_input_tokens=1000,
             ),
-        ]
+        ]:
+            middleware._record(telemetry)
 
         stats = middleware.get_aggregate_stats()
 
@@ -486,6 +694,140 @@ class TestPromptCachingTelemetryMiddleware:
         assert stats["total_input_tokens"] == 2000
         assert stats["overall_cache_hit_ratio"] == 0.85
 
+    def test_history_is_bounded_but_totals_are_not(self):
+        middleware = PromptCachingTelemetryMiddleware()
+        for _ in range(1500):
+            middleware._record(
+                CacheTelemetry(
+                    provider=ProviderType.OPENAI,
+                    cache_read_tokens=1,
+                    total_input_tokens=2,
+                )
+            )
+
+        stats = middleware.get_aggregate_stats()
+
+        assert len(middleware.telemetry_history) == 1024
+        assert stats["total_calls"] == 1500
+        assert stats["total_cache_read_tokens"] == 1500
+        assert stats["overall_cache_hit_ratio"] == 0.5
+
+    def test_telemetry_columns(self):
+        middleware = PromptCachingTelemetryMiddleware()
+        middleware._record(
+            CacheTelemetry(
+                provider=ProviderType.OPENAI,
+                cache_read_tokens=5,
+                total_input_tokens=10,
+                cache_hit_ratio=0.5,
+            )
+        )
+
+        assert middleware.telemetry_columns() == {
+            "provider": ["openai"],
+            "cache_read_tokens": [5],
+            "cache_write_tokens": [0],
+            "total_input_tokens": [10],
+            "cache_hit_ratio": [0.5],
+        }
+
+    def test_telemetry_snapshot_is_detached(self):
+        middleware = PromptCachingTelemetryMiddleware()
+        first = CacheTelemetry(provider=ProviderType.OPENAI)
+        middleware._record(first)
+
+        snapshot = middleware.telemetry_snapshot()
+        middleware._record(CacheTelemetry(provider=ProviderType.GROK))
+
+        assert snapshot == (first,)
+        assert len(middleware.telemetry_history) == 2
+
+    def test_flush_to_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        middleware = PromptCachingTelemetryMiddleware()
+        middleware._record(
+            CacheTelemetry(provider=ProviderType.ANTHROPIC, cache_read_tokens=7)
+        )
+        path = tmp_path / "telemetry.parquet"
+
+        assert middleware.flush_to_parquet(str(path)) == 1
+
+        assert pq.read_table(path).to_pydict()["cache_read_tokens"] == [7]
+        assert len(middleware.telemetry_history) == 0
+        assert middleware.get_aggregate_stats()["total_calls"] == 1
+
+    def test_failed_flush_keeps_old_and_new_entries(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path
+    ):
+        middleware = PromptCachingTelemetryMiddleware()
+        capacity = middleware.telemetry_history.maxlen or 0
+        old = [
+            CacheTelemetry(provider=ProviderType.ANTHROPIC, cache_read_tokens=i)
+            for i in range(capacity)
+        ]
+        for telemetry in old:
+            middleware._record(telemetry)
+        new = CacheTelemetry(provider=ProviderType.ANTHROPIC, cache_read_tokens=-1)
+
+        def failing_write(*args, **kwargs):
+            # 쓰는 도중 다른 스레드가 새 항목을 기록한 상황을 흉내 냅니다.
+            middleware._record(new)
+            raise OSError("disk full")
+
+        pyarrow = types.ModuleType("pyarrow")
+        pyarrow.Table = MagicMock()  # type: ignore[attr-defined]
+        parquet = types.ModuleType("pyarrow.parquet")
+        parquet.write_table = failing_write  # type: ignore[attr-defined]
+        pyarrow.parquet = parquet  # type: ignore[attr-defined]
+        monkeypatch.setitem(sys.modules, "pyarrow", pyarrow)
+        monkeypatch.setitem(sys.modules, "pyarrow.parquet", parquet)
+
+        with pytest.raises(OSError):
+            middleware.flush_to_parquet(str(tmp_path / "telemetry.parquet"))
+
+        # 가득 찬 상태에서는 가장 오래된 항목이 밀려나고 새 항목은 남아야 합니다.
+        assert list(middleware.telemetry_history) == [*old[1:], new]
+
+    def test_log_telemetry_message(self, caplog: pytest.LogCaptureFixture):
+        middleware = PromptCachingTelemetryMiddleware(log_level=logging.INFO)
+        telemetry = CacheTelemetry(
+            provider=ProviderType.ANTHROPIC,
+            cache_read_tokens=850,
+            cache_write_tokens=10,
+            cache_hit_ratio=0.85,
+        )
+
+        with caplog.at_level(logging.INFO):
+            middleware._log_telemetry(telemetry)
+
+        assert caplog.messages == [
+            "[CacheTelemetry] anthropic: read=850, write=10, hit_ratio=85.00%"
+        ]
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("claude-3-sonnet", ProviderType.ANTHROPIC),
+            ("gpt-4o", ProviderType.OPENAI),
+            ("gemini-3-pro", ProviderType.GEMINI_3),
+            ("gemini-2.5-flash", ProviderType.GEMINI),
+            ("deepseek-chat", ProviderType.DEEPSEEK),
+            ("grok-4", ProviderType.GROK),
+            # 겹치는 키워드는 우선순위가 높은 쪽이 이깁니다 ("kimi" > "grok").
+            ("grokimi", ProviderType.GROQ),
+            ("llama-3", ProviderType.UNKNOWN),
+        ],
+    )
+    def test_detect_provider_from_model_name(self, model, expected):
+        middleware = PromptCachingTelemetryMiddleware()
+        response = MagicMock()
+        response.response_metadata = {"model": model}
+        response.usage_metadata = {}
+
+        middleware._process_response(response)
+
+        assert middleware.telemetry_history[-1].provider == expected
+
     def test_wrap_model_call_collects_telemetry(self):
         middleware = PromptCachingTelemetryMiddleware()
 
@@ -505,6 +847,40 @@ class TestPromptCachingTelemetryMiddleware:
         assert result == mock_response
         assert len(middleware.telemetry_history) == 1
 
+    def test_disabled_telemetry_skips_extraction(self, monkeypatch):
+        from context_engineering_research_agent.context_strategies import (
+            caching_telemetry,
+        )
+
+        middleware = PromptCachingTelemetryMiddleware(
+            log_level=logging.DEBUG, retain_history=False
+        )
+        extract = MagicMock()
+        monkeypatch.setattr(caching_telemetry, "extract_cache_telemetry", extract)
+        monkeypatch.setattr(caching_telemetry.logger, "isEnabledFor", lambda _: False)
+        response = MagicMock()
+
+        assert middleware.wrap_model_call(MagicMock(), lambda _: response) is response
+
+        extract.assert_not_called()
+        assert middleware.get_aggregate_stats()["total_calls"] == 0
+
+    def test_history_does_not_retain_response_metadata_by_default(self):
+        response = MagicMock()
+        response.response_metadata = {"model": "gpt-4o", "token_usage": {}}
+        response.usage_metadata = {"input_tokens": 10}
+        lean = PromptCachingTelemetryMiddleware()
+        verbose = PromptCachingTelemetryMiddleware(include_raw_metadata=True)
+
+        lean._process_response(response)
+        verbose._process_response(response)
+
+        assert lean.telemetry_history[0].raw_metadata is None
+        assert verbose.telemetry_history[0].raw_metadata == {
+            "usage": {"input_tokens": 10},
+            "token_usage": {},
+        }
+
 
 class TestOpenRouterSubProvider:
     def test_detect_anthropic_via_openrouter(self):
@@ -565,6 +941,18 @@ class TestOpenRouterSubProvider:
             == OpenRouterSubProvider.MISTRAL
         )
 
+    @pytest.mark.parametrize(
+        ("model_name", "expected"),
+        [
+            ("llamanthropic", OpenRouterSubProvider.ANTHROPIC),
+            ("grokimi", OpenRouterSubProvider.GROQ),
+            ("xaideepseek", OpenRouterSubProvider.DEEPSEEK),
+        ],
+    )
+    def test_overlapping_keywords_keep_priority(self, model_name, expected):
+        # 우선순위가 낮은 키워드가 높은 키워드와 겹쳐도 가려지지 않아야 합니다.
+        assert detect_openrouter_sub_provider(model_name) == expected
+
     def test_detect_unknown_via_openrouter(self):
         assert (
             detect_openrouter_sub_provider("some-provider/some-model")
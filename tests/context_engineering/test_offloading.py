@@ -1,10 +1,16 @@
+import asyncio
+import json
+
 import pytest
+from deepagents.backends.protocol import WriteResult
 from langchain_core.messages import ToolMessage
+from langgraph.types import Command
 
 from context_engineering_research_agent.context_strategies.offloading import (
     ContextOffloadingStrategy,
     OffloadingConfig,
     OffloadingResult,
+    compress_tool_output,
 )
 
 
@@ -133,6 +139,14 @@ class TestContextOffloadingStrategy:
 
         assert len(preview.split("\t")[1]) == 1000
 
+    def test_create_preview_matches_splitlines_boundaries(self):
+        strategy = ContextOffloadingStrategy(config=OffloadingConfig(preview_lines=4))
+        content = "a\r\nb\rc\n\nd\ne"
+
+        preview = strategy._create_preview(content)
+
+        assert preview == "    1\ta\n    2\tb\n    3\tc\n    4\t"
+
     def test_create_offload_message(self, strategy: ContextOffloadingStrategy):
         message = strategy._create_offload_message(
             tool_call_id="call_123",
@@ -151,6 +165,9 @@ class TestContextOffloadingStrategy:
         assert strategy._sanitize_tool_call_id(normal_id) == "call_abc123"
         assert strategy._sanitize_tool_call_id(special_id) == "call_with_special_chars_"
 
+    def test_sanitize_tool_call_id_unicode(self, strategy: ContextOffloadingStrategy):
+        assert strategy._sanitize_tool_call_id("호출/1…") == "호출_1_"
+
     def test_process_tool_result_small_content(
         self, strategy: ContextOffloadingStrategy
     ):
@@ -182,3 +199,128 @@ class TestContextOffloadingStrategy:
 
         assert result.was_offloaded is False
         assert processed.content == large_content
+
+
+class TestCompressToolOutput:
+    def test_strips_ansi_and_trailing_whitespace(self):
+        assert compress_tool_output("\x1b[31mERROR\x1b[0m   \nok") == "ERROR\nok"
+
+    def test_collapses_repeated_lines(self):
+        content = "start\n" + "same line\n" * 5 + "end"
+
+        assert (
+            compress_tool_output(content) == "start\nsame line\n[이전 줄 4회 반복]\nend"
+        )
+
+    def test_collapses_blank_line_runs_and_keeps_indentation(self):
+        assert compress_tool_output("a\n\n\n\n    b") == "a\n\n    b"
+
+    def test_minifies_json(self):
+        content = json.dumps({"key": [1, 2, 3], "name": "값"}, indent=2)
+
+        assert compress_tool_output(content) == '{"key":[1,2,3],"name":"값"}'
+
+
+class TestOffloadingCompression:
+    class _RecordingBackend:
+        def __init__(self):
+            self.files: dict[str, str] = {}
+
+        def write(self, file_path: str, content: str) -> WriteResult:
+            self.files[file_path] = content
+            return WriteResult(path=file_path, files_update={file_path: content})
+
+        async def awrite(self, file_path: str, content: str) -> WriteResult:
+            return self.write(file_path, content)
+
+    def test_offload_writes_compressed_content_and_metadata(self):
+        backend = self._RecordingBackend()
+        strategy = ContextOffloadingStrategy(
+            config=OffloadingConfig(
+                token_limit_before_evict=10, compressor=compress_tool_output
+            ),
+            backend_factory=lambda runtime: backend,
+        )
+        content = "log line\n" * 100
+        tool_result = ToolMessage(content=content, tool_call_id="call_1")
+
+        processed, result = strategy.process_tool_result(tool_result, None)  # type: ignore
+
+        stored = backend.files["/large_tool_results/call_1"]
+        metadata = json.loads(backend.files["/large_tool_results/call_1.meta.json"])
+        assert stored == "log line\n[이전 줄 99회 반복]"
+        assert metadata["original_size"] == len(content)
+        assert metadata["stored_size"] == len(stored)
+        assert result.stored_size == len(stored)
+        assert isinstance(processed, Command)
+        assert set(processed.update["files"]) == set(backend.files)
+
+    def test_offload_stores_original_by_default(self):
+        backend = self._RecordingBackend()
+        strategy = ContextOffloadingStrategy(
+            config=OffloadingConfig(token_limit_before_evict=10),
+            backend_factory=lambda runtime: backend,
+        )
+        content = "log line\n" * 100
+        tool_result = ToolMessage(content=content, tool_call_id="call_1")
+
+        strategy.process_tool_result(tool_result, None)  # type: ignore
+
+        assert backend.files == {"/large_tool_results/call_1": content}
+
+    def test_list_content_is_stored_as_joined_text(self):
+        backend = self._RecordingBackend()
+        strategy = ContextOffloadingStrategy(
+            config=OffloadingConfig(token_limit_before_evict=10, compressor=None),
+            backend_factory=lambda runtime: backend,
+        )
+        parts = [{"type": "text", "text": "a" * 30}, {"type": "image_url"}, "b" * 20]
+        tool_result = ToolMessage(content=parts, tool_call_id="call_1")
+
+        _, result = strategy.process_tool_result(tool_result, None)  # type: ignore
+
+        stored = backend.files["/large_tool_results/call_1"]
+        assert stored == "a" * 30 + "\n\n" + "b" * 20
+        assert result.original_size == len(stored)
+
+    def test_small_list_content_is_not_offloaded(self):
+        backend = self._RecordingBackend()
+        strategy = ContextOffloadingStrategy(
+            config=OffloadingConfig(token_limit_before_evict=10),
+            backend_factory=lambda runtime: backend,
+        )
+        # repr로 재면 임계값을 넘지만 실제 텍스트는 짧습니다.
+        parts = [{"type": "text", "text": "short", "id": "x" * 100}]
+        tool_result = ToolMessage(content=parts, tool_call_id="call_1")
+
+        processed, result = strategy.process_tool_result(tool_result, None)  # type: ignore
+
+        assert processed is tool_result
+        assert result.was_offloaded is False
+        assert backend.files == {}
+
+    def test_async_offload_writes_content_and_metadata(self):
+        backend = self._RecordingBackend()
+        strategy = ContextOffloadingStrategy(
+            config=OffloadingConfig(
+                token_limit_before_evict=10, compressor=compress_tool_output
+            ),
+            backend_factory=lambda runtime: backend,
+        )
+        tool_result = ToolMessage(content="log line\n" * 100, tool_call_id="call_1")
+
+        loop = asyncio.new_event_loop()
+        try:
+            processed, result = loop.run_until_complete(
+                strategy.aprocess_tool_result(tool_result, None)  # type: ignore
+            )
+        finally:
+            loop.close()
+
+        assert result.was_offloaded is True
+        assert set(backend.files) == {
+            "/large_tool_results/call_1",
+            "/large_tool_results/call_1.meta.json",
+        }
+        assert isinstance(processed, Command)
+        assert set(processed.update["files"]) == set(backend.files)
@@ -1,4 +1,7 @@
+import asyncio
+
 import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 
 from context_engineering_research_agent.context_strategies.reduction import (
@@ -81,6 +84,50 @@ class TestContextReductionStrategy:
 
         assert estimated == 200
 
+    def test_estimate_tokens_reuses_cached_lengths(
+        self, strategy: ContextReductionStrategy
+    ):
+        first = HumanMessage(content="a" * 400)
+        strategy._estimate_tokens([first])
+        second = AIMessage(content="b" * 400)
+
+        estimated = strategy._estimate_tokens([first, second])
+
+        assert estimated == 200
+        assert set(strategy._message_size_cache) == {id(first), id(second)}
+
+    def test_reduce_context_prunes_stale_cache_entries(
+        self, strategy: ContextReductionStrategy
+    ):
+        old = [HumanMessage(content=f"old {i}") for i in range(100)]
+        strategy._estimate_tokens(old)
+        current = [HumanMessage(content="current")]
+
+        strategy.reduce_context(current)
+
+        assert set(strategy._message_size_cache) == {id(current[0])}
+
+    def test_estimate_tokens_counts_text_blocks_only(
+        self, strategy: ContextReductionStrategy
+    ):
+        message = HumanMessage(
+            content=[
+                {"type": "text", "text": "a" * 400},
+                {"type": "image_url", "image_url": {"url": "data:" + "x" * 4000}},
+                "b" * 400,
+            ]
+        )
+
+        assert strategy._estimate_tokens([message]) == 200
+
+    def test_estimate_tokens_with_token_counter(self):
+        strategy = ContextReductionStrategy(
+            token_counter=lambda text: len(text.split())
+        )
+        messages = [HumanMessage(content="one two three"), AIMessage(content="four")]
+
+        assert strategy._estimate_tokens(messages) == 4
+
     def test_get_context_usage_ratio(self, strategy: ContextReductionStrategy):
         messages = [
             HumanMessage(content="x" * 40000),
@@ -101,6 +148,30 @@ class TestContextReductionStrategy:
 
         assert strategy_low_threshold._should_reduce(messages) is True
 
+    def test_should_reduce_stops_at_threshold(self):
+        counted: list[str] = []
+
+        def counter(text: str) -> int:
+            counted.append(text)
+            return len(text)
+
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(context_threshold=0.5, model_context_window=100),
+            token_counter=counter,
+        )
+        messages = [HumanMessage(content="x" * 60), HumanMessage(content="y" * 10)]
+
+        assert strategy._should_reduce(messages) is True
+        assert counted == ["x" * 60]
+
+    def test_should_reduce_matches_ratio_at_boundary(self):
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(context_threshold=0.5, model_context_window=100)
+        )
+
+        assert strategy._should_reduce([HumanMessage(content="x" * 203)]) is False
+        assert strategy._should_reduce([HumanMessage(content="x" * 204)]) is True
+
     def test_apply_compaction_removes_old_tool_calls(
         self, strategy: ContextReductionStrategy
     ):
@@ -139,6 +210,23 @@ class TestContextReductionStrategy:
 
         assert len(compacted) == len(messages)
 
+    def test_short_history_is_returned_unchanged(self):
+        model = FakeListChatModel(responses=["요약"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(compaction_age_threshold=5, min_messages_to_keep=5),
+            summarization_model=model,
+        )
+        messages = [HumanMessage(content="q"), AIMessage(content="a")]
+
+        compacted, compaction_result = strategy.apply_compaction(messages)
+        summarized, summary_result = strategy.apply_summarization(messages)
+
+        assert compacted is messages
+        assert compaction_result.was_reduced is False
+        assert summarized is messages
+        assert summary_result.was_reduced is False
+        assert model.i == 0
+
     def test_apply_compaction_preserves_text_content(self):
         strategy = ContextReductionStrategy(
             config=ReductionConfig(compaction_age_threshold=2)
@@ -182,6 +270,41 @@ class TestContextReductionStrategy:
 
         assert tool_message_count == 0
 
+    def test_reduce_context_measures_each_message_once(self):
+        counted: list[str] = []
+
+        def counter(text: str) -> int:
+            counted.append(text)
+            return len(text)
+
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(
+                context_threshold=0.15,
+                model_context_window=1000,
+                compaction_age_threshold=2,
+            ),
+            token_counter=counter,
+        )
+        messages = [
+            HumanMessage(content="question " * 10),
+            AIMessage(
+                content="thinking",
+                tool_calls=[{"id": "call", "name": "search", "args": {}}],
+            ),
+            ToolMessage(content="result " * 10, tool_call_id="call"),
+            HumanMessage(content="follow-up"),
+            AIMessage(content="answer"),
+        ]
+
+        compacted, result = strategy.reduce_context(messages)
+
+        assert result.technique_used == "compaction"
+        # 원본 5개 + 도구 호출을 뺀 AIMessage 1개
+        assert len(counted) == 6
+        assert result.estimated_tokens_saved == strategy._estimate_tokens(
+            messages
+        ) - strategy._estimate_tokens(compacted)
+
     def test_reduce_context_no_reduction_needed(
         self, strategy: ContextReductionStrategy
     ):
@@ -228,6 +351,21 @@ class TestContextReductionStrategy:
         assert "Human" in prompt
         assert "AI" in prompt
 
+    def test_create_summary_prompt_role_lines(self, strategy: ContextReductionStrategy):
+        from langchain_core.messages import ChatMessage
+
+        messages = [
+            SystemMessage(content="sys"),
+            ToolMessage(content="x" * 600, tool_call_id="call"),
+            ChatMessage(role="user", content="chat"),
+        ]
+
+        prompt = strategy._create_summary_prompt(messages)
+
+        assert "[System]: sys\n" in prompt
+        assert f"[Tool]: {'x' * 500}\n" in prompt
+        assert "[Chat]: chat\n" in prompt
+
     def test_apply_summarization_no_model(self, strategy: ContextReductionStrategy):
         messages = [HumanMessage(content="test")]
 
@@ -236,6 +374,123 @@ class TestContextReductionStrategy:
         assert result.was_reduced is False
         assert summarized == messages
 
+    def test_apply_summarization_batches_then_merges(self):
+        model = FakeListChatModel(responses=["p1", "p2", "final"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(batch_size=50), summarization_model=model
+        )
+        messages = [HumanMessage(content=f"m{i}") for i in range(105)]
+
+        summarized, result = strategy.apply_summarization(messages)
+
+        # 100개를 50개씩 2번 요약한 뒤 부분 요약을 한 번 더 합칩니다.
+        assert summarized[0].content == "[이전 대화 요약]\nfinal"
+        assert summarized[1:] == messages[-5:]
+        assert result.technique_used == "summarization"
+
+    def test_apply_summarization_without_hierarchy_uses_one_call(self):
+        model = FakeListChatModel(responses=["only"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(batch_size=50, hierarchical=False),
+            summarization_model=model,
+        )
+        messages = [HumanMessage(content=f"m{i}") for i in range(105)]
+
+        summarized, _ = strategy.apply_summarization(messages)
+
+        assert summarized[0].content == "[이전 대화 요약]\nonly"
+
+    def test_aapply_summarization_runs_batches_concurrently(self):
+        class OverlapTrackingModel:
+            def __init__(self):
+                self.in_flight = 0
+                self.peak_in_flight = 0
+                self.calls = 0
+
+            async def ainvoke(self, messages):
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                # 다른 요약 호출이 시작될 수 있도록 이벤트 루프에 양보합니다.
+                await asyncio.sleep(0)
+                self.in_flight -= 1
+                self.calls += 1
+                return AIMessage(content=f"p{self.calls}")
+
+        model = OverlapTrackingModel()
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(batch_size=50),
+            summarization_model=model,  # type: ignore[arg-type]
+        )
+        messages = [HumanMessage(content=f"m{i}") for i in range(155)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            summarized, _ = loop.run_until_complete(
+                strategy.aapply_summarization(messages)
+            )
+        finally:
+            loop.close()
+
+        # 150개를 50개씩 나눈 3개 묶음이 동시에 요약되고, 병합 호출이 뒤따릅니다.
+        assert model.peak_in_flight == 3
+        assert model.calls == 4
+        assert summarized[0].content == "[이전 대화 요약]\np4"
+
+    def test_summary_boundary_and_message_are_stable_across_turns(self):
+        model = FakeListChatModel(responses=["s1", "s2"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(summary_checkpoint_stride=20),
+            summarization_model=model,
+        )
+        history = [HumanMessage(content=f"m{i}") for i in range(30)]
+
+        first, _ = strategy.apply_summarization(history)
+        # 경계(20)가 바뀌지 않는 범위에서 대화가 늘어나면 LLM을 다시 부르지 않습니다.
+        history.append(HumanMessage(content="m30"))
+        second, _ = strategy.apply_summarization(history)
+
+        assert first[0] is second[0]
+        assert first[0].content == "[이전 대화 요약]\ns1"
+        assert second[1:] == history[20:]
+        assert model.i == 1
+
+    @pytest.mark.parametrize("count", [20, 30])
+    def test_summarizes_when_stride_boundary_is_not_enough(self, count: int):
+        model = FakeListChatModel(responses=["summary"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(
+                model_context_window=10_000,
+                context_threshold=0.5,
+                summary_checkpoint_stride=20,
+            ),
+            summarization_model=model,
+        )
+        messages = [HumanMessage(content=f"{i}" + "x" * 3000) for i in range(count)]
+
+        summarized, result = strategy.apply_summarization(messages)
+
+        # 20개면 내림한 경계에 요약할 것이 없고, 30개면 내림한 경계로 남는
+        # 10개가 여전히 임계값을 넘으므로 최근 5개만 남기고 요약합니다.
+        assert result.was_reduced is True
+        assert summarized[0].content == "[이전 대화 요약]\nsummary"
+        assert summarized[1:] == messages[-5:]
+        assert not strategy._should_reduce(summarized)
+
+    def test_apply_summarization_keeps_leading_system_message(self):
+        model = FakeListChatModel(responses=["summary"])
+        strategy = ContextReductionStrategy(
+            config=ReductionConfig(summary_checkpoint_stride=1),
+            summarization_model=model,
+        )
+        system = SystemMessage(content="You are a research agent.")
+        messages = [system] + [HumanMessage(content=f"m{i}") for i in range(10)]
+
+        summarized, _ = strategy.apply_summarization(messages)
+
+        assert summarized[0] is system
+        assert summarized[1].content == "[이전 대화 요약]\nsummary"
+        assert summarized[2:] == messages[-5:]
+
     def test_compaction_preserves_system_messages(self):
         strategy = ContextReductionStrategy(
             config=ReductionConfig(compaction_age_threshold=2)
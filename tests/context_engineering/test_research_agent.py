@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import SystemMessage
+
+from context_engineering_research_agent.research import agent as research_agent
+
+
+@pytest.fixture
+def compile_calls(monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+    calls: list[dict] = []
+
+    def fake_create_deep_agent(**kwargs):
+        calls.append(kwargs)
+        return MagicMock()
+
+    monkeypatch.setattr(research_agent, "create_deep_agent", fake_create_deep_agent)
+    monkeypatch.setattr(research_agent, "_compiled_researchers", {})
+    return calls
+
+
+class TestCreateResearcherAgent:
+    def test_reuses_graph_for_same_model_and_backend(self, compile_calls):
+        model = FakeListChatModel(responses=["ok"])
+        backend = object()
+
+        first = research_agent.create_researcher_agent(model=model, backend=backend)
+        second = research_agent.create_researcher_agent(model=model, backend=backend)
+        other = research_agent.create_researcher_agent(model=model, backend=object())
+
+        assert first is second
+        assert other is not first
+        assert len(compile_calls) == 2
+
+    def test_string_models_share_cache_by_value(self, compile_calls):
+        first = research_agent.create_researcher_agent(model="openai:gpt-4.1")
+        second = research_agent.create_researcher_agent(model="openai:" + "gpt-4.1")
+
+        assert first is second
+        assert len(compile_calls) == 1
+
+    def test_system_prompt_has_no_date(self, compile_calls):
+        research_agent.create_researcher_agent(model="openai:gpt-4.1")
+
+        prompt = compile_calls[0]["system_prompt"]
+        assert "오늘 날짜" not in prompt
+        assert "{date}" not in prompt
+
+
+class TestCurrentDateMiddleware:
+    def test_appends_date_to_system_prompt(self):
+        middleware = research_agent._CurrentDateMiddleware()
+        request = MagicMock()
+        request.system_prompt = "지침"
+
+        middleware.wrap_model_call(request, lambda r: r)
+
+        system_message = request.override.call_args.kwargs["system_message"]
+        assert isinstance(system_message, SystemMessage)
+        assert system_message.content.startswith("지침\n\n오늘 날짜: ")
@@ -73,6 +73,12 @@ class TestContextRetrievalStrategy:
         assert strategy.config is not None
         assert len(strategy.tools) == 3
 
+    def test_tools_are_created_on_first_access(self):
+        strategy = ContextRetrievalStrategy()
+
+        assert "tools" not in vars(strategy)
+        assert strategy.tools is strategy.tools
+
     def test_creates_read_file_tool(self, strategy: ContextRetrievalStrategy):
         tool_names = [t.name for t in strategy.tools]
 
@@ -161,3 +167,59 @@ class TestContextRetrievalStrategy:
         )
 
         assert "백엔드가 설정되지 않았습니다" in result
+
+    def test_grep_output_modes(self):
+        class MockBackend:
+            def grep_raw(self, pattern, path=None, glob=None):
+                return [
+                    {"path": "/b.py", "line_number": 3, "content": "TODO b"},
+                    {"path": "/a.py", "line_number": 1, "content": "TODO a1"},
+                    {"path": "/b.py", "line_number": 9, "content": "TODO " + "x" * 50},
+                    {"path": "/a.py", "line_number": 2, "content": "TODO a2"},
+                ]
+
+        strategy = ContextRetrievalStrategy(
+            config=RetrievalConfig(truncate_line_length=10),
+            backend_factory=lambda runtime: MockBackend(),
+        )
+        grep_tool = next(t for t in strategy.tools if t.name == "grep")
+
+        def run(mode: str) -> str:
+            return grep_tool.func(  # type: ignore
+                pattern="TODO", runtime=None, output_mode=mode
+            )
+
+        assert run("files_with_matches") == "/b.py\n/a.py"
+        assert run("count") == "/b.py: 2\n/a.py: 2"
+        assert run("content").splitlines() == [
+            "/b.py:3: TODO b",
+            "/a.py:1: TODO a1",
+            "/b.py:9: TODO xxxxx",
+            "/a.py:2: TODO a2",
+        ]
+
+    def test_passes_limit_to_backends_that_accept_it(self):
+        calls: list[dict] = []
+
+        class LimitedBackend:
+            def grep_raw(self, pattern, path=None, glob=None, limit=None):
+                calls.append({"tool": "grep", "limit": limit})
+                return [{"path": "/a.py", "line_number": 1, "content": "TODO"}]
+
+            def glob_info(self, pattern, path="/", limit=None):
+                calls.append({"tool": "glob", "limit": limit})
+                return [{"path": "/a.py"}]
+
+        strategy = ContextRetrievalStrategy(
+            config=RetrievalConfig(max_grep_results=7, max_glob_results=3),
+            backend_factory=lambda runtime: LimitedBackend(),
+        )
+        tools = {t.name: t for t in strategy.tools}
+
+        tools["grep"].func(pattern="TODO", runtime=None)  # type: ignore
+        tools["glob"].func(pattern="*.py", runtime=None)  # type: ignore
+
+        assert calls == [
+            {"tool": "grep", "limit": 7},
+            {"tool": "glob", "limit": 3},
+        ]
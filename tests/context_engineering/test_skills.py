@@ -0,0 +1,362 @@
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from context_engineering_research_agent.skills import load
+from context_engineering_research_agent.skills import middleware as skills_middleware
+from context_engineering_research_agent.skills.load import (
+    _parse_simple_frontmatter,
+    _parse_skill_metadata,
+    alist_skills,
+    list_skills,
+)
+from context_engineering_research_agent.skills.middleware import (
+    SKILLS_SYSTEM_PROMPT,
+    SkillsMiddleware,
+    _loaded_skills_reducer,
+    _render_skills_prompt,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _write_skill(skills_dir: Path, name: str, content: str) -> Path:
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestSkillLoader:
+    def test_reads_frontmatter_only(self, tmp_path: Path):
+        body = "본문\n" * 100_000
+        _write_skill(
+            tmp_path,
+            "web-research",
+            "---\nname: web-research\ndescription: 웹 리서치\n---\n" + body,
+        )
+
+        skills = list_skills(user_skills_dir=tmp_path)
+
+        assert [(s["name"], s["description"]) for s in skills] == [
+            ("web-research", "웹 리서치")
+        ]
+
+    def test_frontmatter_spanning_chunks(self, tmp_path: Path):
+        description = "가" * 5000
+        path = _write_skill(
+            tmp_path,
+            "long",
+            f"---\nname: long\ndescription: {description}\n---\n본문\n",
+        )
+
+        metadata = _parse_skill_metadata(path, source="project")
+
+        assert metadata is not None
+        limit = load.MAX_SKILL_DESCRIPTION_LENGTH
+        assert metadata["description"] == description[:limit]
+
+    def test_rejects_missing_or_oversized_frontmatter(self, tmp_path: Path):
+        missing = _write_skill(tmp_path, "missing", "# 제목\n---\nname: x\n---\n")
+        unclosed = _write_skill(
+            tmp_path,
+            "unclosed",
+            "---\nname: unclosed\n" + "x: y\n" * (load.MAX_FRONTMATTER_SIZE // 4),
+        )
+
+        assert _parse_skill_metadata(missing, source="user") is None
+        assert _parse_skill_metadata(unclosed, source="user") is None
+
+    def test_simple_frontmatter_skips_yaml(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        yaml_load = MagicMock(wraps=load.yaml.load)
+        monkeypatch.setattr(load.yaml, "load", yaml_load)
+        simple = _write_skill(
+            tmp_path,
+            "web-research",
+            "---\nname: web-research\ndescription: 웹 리서치 (검색, 요약)\n---\n",
+        )
+        nested = _write_skill(
+            tmp_path,
+            "nested",
+            "---\nname: nested\ndescription: d\nmetadata:\n  author: me\n---\n",
+        )
+
+        metadata = _parse_skill_metadata(simple, source="user")
+        assert metadata is not None
+        assert metadata["description"] == "웹 리서치 (검색, 요약)"
+        yaml_load.assert_not_called()
+
+        metadata = _parse_skill_metadata(nested, source="user")
+        assert metadata is not None
+        assert metadata["metadata"] == {"author": "me"}
+        yaml_load.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "frontmatter",
+        [
+            "name: a\ndescription: 'quoted'",
+            "name: a\ndescription: d # comment",
+            "name: a\ndescription: key: value",
+            "name: a\ndescription: |",
+            "name: a\ndescription: 2026-01-15",
+            "name: a\nlicense: null",
+            "name: a\nyes: d",
+            "name:\ta\ndescription: d",
+            "name: a\ndescription: foo\tbar",
+        ],
+    )
+    def test_simple_frontmatter_defers_yaml_syntax(self, frontmatter: str):
+        assert _parse_simple_frontmatter(frontmatter) is None
+
+    def test_lists_many_skills(self, tmp_path: Path):
+        names = [f"skill-{i}" for i in range(10)]
+        for name in names:
+            _write_skill(tmp_path, name, f"---\nname: {name}\ndescription: d\n---\n")
+        _write_skill(tmp_path, "broken", "본문만 있음\n")
+
+        skills = list_skills(project_skills_dir=tmp_path)
+
+        assert sorted(s["name"] for s in skills) == names
+        assert {s["source"] for s in skills} == {"project"}
+
+    def test_skips_symlink_outside_skills_dir(self, tmp_path: Path):
+        skills_dir = tmp_path / "skills"
+        _write_skill(
+            tmp_path / "outside", "escape", "---\nname: escape\ndescription: d\n---\n"
+        )
+        skills_dir.mkdir()
+        (skills_dir / "escape").symlink_to(tmp_path / "outside" / "escape")
+
+        assert list_skills(user_skills_dir=skills_dir) == []
+
+    def test_alist_skills_matches_list_skills(self, tmp_path: Path):
+        user_dir, project_dir = tmp_path / "user", tmp_path / "project"
+        for skills_dir, description in (
+            (user_dir, "사용자"),
+            (project_dir, "프로젝트"),
+        ):
+            _write_skill(
+                skills_dir,
+                "shared",
+                f"---\nname: shared\ndescription: {description}\n---\n",
+            )
+        _write_skill(
+            user_dir, "only-user", "---\nname: only-user\ndescription: u\n---\n"
+        )
+
+        skills = _run(
+            alist_skills(user_skills_dir=user_dir, project_skills_dir=project_dir)
+        )
+
+        assert skills == list_skills(
+            user_skills_dir=user_dir, project_skills_dir=project_dir
+        )
+        assert {s["name"]: s["source"] for s in skills} == {
+            "shared": "project",
+            "only-user": "user",
+        }
+
+    def test_skips_symlinked_skill_md_outside_skills_dir(self, tmp_path: Path):
+        skills_dir = tmp_path / "skills"
+        outside = _write_skill(
+            tmp_path / "outside", "escape", "---\nname: escape\ndescription: d\n---\n"
+        )
+        (skills_dir / "escape").mkdir(parents=True)
+        (skills_dir / "escape" / "SKILL.md").symlink_to(outside)
+        (skills_dir / "not-a-file" / "SKILL.md").mkdir(parents=True)
+        (skills_dir / "README.md").write_text("x", encoding="utf-8")
+
+        assert list_skills(user_skills_dir=skills_dir) == []
+        assert list_skills(user_skills_dir=tmp_path / "missing") == []
+
+
+class TestSkillsMiddleware:
+    def _request(self, skills: list) -> MagicMock:
+        request = MagicMock()
+        request.state = {"skills_metadata": skills}
+        request.system_message = SystemMessage(content="기본 지침")
+        request.system_prompt = "기본 지침"
+        return request
+
+    def test_reuses_rendered_section_until_skills_change(self, tmp_path: Path):
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        skill = {
+            "name": "web-research",
+            "description": "웹 리서치",
+            "path": "/skills/web-research/SKILL.md",
+            "source": "user",
+        }
+        format_list = MagicMock(wraps=middleware._format_skills_list)
+        middleware._format_skills_list = format_list
+        request = self._request([skill])
+
+        first = middleware._build_system_message(request)
+        second = middleware._build_system_message(self._request([dict(skill)]))
+        middleware._build_system_message(
+            self._request([{**skill, "description": "변경됨"}])
+        )
+
+        assert format_list.call_count == 2
+        assert second is first
+        assert first.content.startswith("기본 지침\n\n")
+        assert "- **web-research**: 웹 리서치" in first.content
+
+    def test_before_agent_rescans_only_after_changes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(skills_middleware, "_SKILLS_CACHE", {})
+        scans = MagicMock(wraps=list_skills)
+        monkeypatch.setattr(skills_middleware, "list_skills", scans)
+        path = _write_skill(
+            tmp_path,
+            "web-research",
+            "---\nname: web-research\ndescription: 웹\n---\n",
+        )
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+
+        def descriptions() -> list[str]:
+            update = middleware.before_agent({}, MagicMock())
+            return [s["description"] for s in update["skills_metadata"]]
+
+        assert descriptions() == ["웹"]
+        assert descriptions() == ["웹"]
+        assert scans.call_count == 1
+
+        path.write_text(
+            "---\nname: web-research\ndescription: 수정됨\n---\n", encoding="utf-8"
+        )
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert descriptions() == ["수정됨"]
+        assert scans.call_count == 2
+
+    def test_abefore_agent_shares_scan_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(skills_middleware, "_SKILLS_CACHE", {})
+        scans = MagicMock(wraps=alist_skills)
+        monkeypatch.setattr(skills_middleware, "alist_skills", scans)
+        _write_skill(
+            tmp_path, "web-research", "---\nname: web-research\ndescription: 웹\n---\n"
+        )
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+
+        first = _run(middleware.abefore_agent({}, MagicMock()))
+        second = middleware.before_agent({}, MagicMock())
+
+        assert [s["name"] for s in first["skills_metadata"]] == ["web-research"]
+        assert first["loaded_skills"] is None
+        assert second == first
+        assert scans.call_count == 1
+
+    def test_skills_list_omits_paths(self, tmp_path: Path):
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        skill = {
+            "name": "web-research",
+            "description": "웹 리서치",
+            "path": "/skills/web-research/SKILL.md",
+            "source": "user",
+        }
+
+        skills_list = middleware._format_skills_list([skill])
+
+        assert skills_list == "**사용자 스킬:**\n- **web-research**: 웹 리서치\n"
+
+    def test_load_skill_reads_skill_once(self, tmp_path: Path):
+        path = _write_skill(
+            tmp_path,
+            "web-research",
+            "---\nname: web-research\ndescription: 웹\n---\n# 지침\n",
+        )
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        (load_skill,) = middleware.tools
+        skills = list_skills(user_skills_dir=tmp_path)
+        runtime = MagicMock(tool_call_id="call")
+        runtime.state = {"skills_metadata": skills}
+
+        command = load_skill.func(name="web-research", runtime=runtime)  # type: ignore
+
+        assert command.update["loaded_skills"] == ["web-research"]
+        (message,) = command.update["messages"]
+        assert message.tool_call_id == "call"
+        assert f"`{path.parent}`" in message.content
+        assert message.content.endswith("# 지침\n")
+
+        runtime.state = {
+            "skills_metadata": skills,
+            "loaded_skills": ["web-research"],
+            "messages": [message],
+        }
+        again = load_skill.func(name="web-research", runtime=runtime)  # type: ignore
+        missing = load_skill.func(name="unknown", runtime=runtime)  # type: ignore
+
+        assert "이미 로드되었습니다" in again
+        assert "`web-research`" in missing
+
+    def test_load_skill_reloads_after_result_leaves_context(self, tmp_path: Path):
+        _write_skill(
+            tmp_path,
+            "web-research",
+            "---\nname: web-research\ndescription: 웹\n---\n# 지침\n",
+        )
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        (load_skill,) = middleware.tools
+        runtime = MagicMock(tool_call_id="call-2")
+        # compaction으로 이전 load_skill 결과가 대화에서 제거된 상태입니다.
+        runtime.state = {
+            "skills_metadata": list_skills(user_skills_dir=tmp_path),
+            "loaded_skills": ["web-research"],
+            "messages": [HumanMessage(content="계속")],
+        }
+
+        command = load_skill.func(name="web-research", runtime=runtime)  # type: ignore
+
+        (message,) = command.update["messages"]
+        assert message.content.endswith("# 지침\n")
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            SKILLS_SYSTEM_PROMPT,
+            "{{literal}} {skills_locations}|{skills_list}",
+            "{skills_list} {skills_locations}",
+            "{skills_locations!r}{skills_list}",
+        ],
+    )
+    def test_render_matches_str_format(self, template: str):
+        rendered = _render_skills_prompt(template, "위치", "목록")
+
+        assert rendered == template.format(skills_locations="위치", skills_list="목록")
+
+    def test_loaded_skills_reducer(self):
+        assert _loaded_skills_reducer(["a"], ["b", "a"]) == ["a", "b"]
+        assert _loaded_skills_reducer(None, ["a"]) == ["a"]
+        assert _loaded_skills_reducer(["a"], None) == []
+
+    def test_marks_skills_block_for_anthropic(self, tmp_path: Path):
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        request = self._request([])
+        request.model = MagicMock()
+        request.model.__class__.__name__ = "ChatAnthropic"
+        request.model.__class__.__module__ = "langchain_anthropic"
+
+        system_message = middleware._build_system_message(request)
+
+        base, skills_block = system_message.content
+        assert base == {"type": "text", "text": "기본 지침"}
+        assert "## 스킬 시스템" in skills_block["text"]
+        assert skills_block["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from research_agent.researcher.agent import _format_researcher_prompt
+from research_agent.researcher.prompts import AUTONOMOUS_RESEARCHER_INSTRUCTIONS
+
+
+class TestFormatResearcherPrompt:
+    def test_fills_date(self):
+        prompt = _format_researcher_prompt("2026-01-15")
+
+        assert prompt == AUTONOMOUS_RESEARCHER_INSTRUCTIONS.format(date="2026-01-15")
+
+    def test_same_date_returns_same_object(self):
+        first = _format_researcher_prompt("2026-01-15")
+        second = _format_researcher_prompt("2026-01-" + "15")
+
+        assert first is second
+        assert _format_researcher_prompt("2026-01-16") is not first
@@ -0,0 +1,160 @@
+"""research_agent.skills 로더/미들웨어 테스트.
+
+context_engineering_research_agent.skills와 같은 최적화가 적용되어 있으므로
+로더 결과가 두 구현에서 같은지도 확인한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import SystemMessage
+
+from context_engineering_research_agent.skills import load as ce_load
+from research_agent.skills import middleware as skills_middleware
+from research_agent.skills.load import (
+    _parse_simple_frontmatter,
+    alist_skills,
+    list_skills,
+)
+from research_agent.skills.middleware import SkillsMiddleware
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _write_skill(skills_dir: Path, name: str, content: str) -> Path:
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _make_skills(tmp_path: Path) -> tuple[Path, Path]:
+    user_dir, project_dir = tmp_path / "user", tmp_path / "project"
+    _write_skill(
+        user_dir, "shared", "---\nname: shared\ndescription: 사용자\n---\n본문\n"
+    )
+    _write_skill(
+        project_dir, "shared", "---\nname: shared\ndescription: 프로젝트\n---\n"
+    )
+    _write_skill(
+        user_dir,
+        "with-yaml",
+        "---\nname: with-yaml\ndescription: 'quoted: value'\n"
+        "license: MIT\nmetadata:\n  author: me\n---\n",
+    )
+    _write_skill(user_dir, "broken", "본문만 있음\n")
+    return user_dir, project_dir
+
+
+class TestSkillLoaderParity:
+    def test_list_skills_matches_context_engineering_loader(self, tmp_path: Path):
+        user_dir, project_dir = _make_skills(tmp_path)
+
+        skills = list_skills(user_skills_dir=user_dir, project_skills_dir=project_dir)
+
+        assert skills == ce_load.list_skills(
+            user_skills_dir=user_dir, project_skills_dir=project_dir
+        )
+        assert {s["name"]: s["source"] for s in skills} == {
+            "shared": "project",
+            "with-yaml": "user",
+        }
+
+    def test_alist_skills_matches_list_skills(self, tmp_path: Path):
+        user_dir, project_dir = _make_skills(tmp_path)
+
+        skills = _run(
+            alist_skills(user_skills_dir=user_dir, project_skills_dir=project_dir)
+        )
+
+        assert skills == list_skills(
+            user_skills_dir=user_dir, project_skills_dir=project_dir
+        )
+
+    @pytest.mark.parametrize(
+        "frontmatter",
+        [
+            "name: a\ndescription: d",
+            "name: a\ndescription: 'quoted'",
+            "name: a\ndescription: d # comment",
+            "name: a\ndescription: 2026-01-15",
+            "name:\ta\ndescription: d",
+            "name: a\ndescription: foo\tbar",
+        ],
+    )
+    def test_simple_frontmatter_matches_context_engineering(self, frontmatter: str):
+        assert _parse_simple_frontmatter(
+            frontmatter
+        ) == ce_load._parse_simple_frontmatter(frontmatter)
+
+
+class TestSkillsMiddleware:
+    def test_abefore_agent_matches_before_agent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        user_dir, project_dir = _make_skills(tmp_path)
+        scans = MagicMock(wraps=alist_skills)
+        monkeypatch.setattr(skills_middleware, "alist_skills", scans)
+        middleware = SkillsMiddleware(
+            skills_dir=user_dir, assistant_id="agent", project_skills_dir=project_dir
+        )
+
+        update = _run(middleware.abefore_agent({}, MagicMock()))
+
+        assert update == middleware.before_agent({}, MagicMock())
+        assert [s["name"] for s in update["skills_metadata"]] == [
+            "shared",
+            "with-yaml",
+        ]
+        scans.assert_called_once_with(
+            user_skills_dir=user_dir, project_skills_dir=project_dir
+        )
+
+    def test_skills_locations_is_computed_once(self, tmp_path: Path):
+        middleware = SkillsMiddleware(
+            skills_dir=tmp_path, assistant_id="agent", project_skills_dir=tmp_path
+        )
+
+        first = middleware._skills_locations
+
+        assert middleware._skills_locations is first
+        assert first == (
+            "**User Skills**: `~/.deepagents/agent/skills`\n"
+            f"**Project Skills**: `{tmp_path}` (overrides user skills)"
+        )
+
+    def test_awrap_model_call_appends_skills_section(self, tmp_path: Path):
+        middleware = SkillsMiddleware(skills_dir=tmp_path, assistant_id="agent")
+        request = MagicMock()
+        request.state = {
+            "skills_metadata": [
+                {
+                    "name": "web-research",
+                    "description": "웹 리서치",
+                    "path": "/skills/web-research/SKILL.md",
+                    "source": "user",
+                }
+            ]
+        }
+        request.system_message = SystemMessage(content="기본 지침")
+        request.override.side_effect = lambda **kwargs: kwargs
+
+        async def handler(overridden):
+            return overridden["system_message"].content
+
+        content = _run(middleware.awrap_model_call(request, handler))
+
+        assert content.startswith("기본 지침\n\n")
+        assert middleware._skills_locations in content
+        assert "- **web-research**: 웹 리서치" in content